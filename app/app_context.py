@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from pathlib import Path
+from typing import Iterable
 import json
+import logging
 
 from PySide6 import QtCore
 
-from app.model.print_job import DuplexMode
+from app.model.json_writer import JsonFileWriter
+from app.model.print_job import DuplexMode, JOB_SETTING_FIELDS
 from app.i18n import resolve_language
 
 
@@ -21,6 +24,13 @@ DEFAULT_RULES = {
     ".pptx": {"printer": ""},
 }
 
+PRINTER_SETTING_KEYS = frozenset({"use_default_printer", "selected_printer"})
+JOB_SETTING_KEYS = frozenset(JOB_SETTING_FIELDS)
+TIMEOUT_SETTING_KEYS = frozenset({"timeout_safety_factor", "timeout_floor_seconds", "timeout_ceiling_seconds"})
+AUTOTUNE_SETTING_KEYS = frozenset({"autotune_min_dpi", "autotune_max_queue_depth", "max_spooler_queue_depth"})
+
+DEFAULT_FOLDER_EXCLUDES = ["~$*", ".git", ".svn", "thumbs.db", "desktop.ini"]
+
 
 @dataclass
 class UserSettings:
@@ -36,6 +46,31 @@ class UserSettings:
     auto_update_enabled: bool = False
     update_snooze_until: str = ""
     last_update_check: str = ""
+    job_store_mode: str = "memory"
+    folder_exclude_patterns: list[str] = field(default_factory=lambda: list(DEFAULT_FOLDER_EXCLUDES))
+    folder_max_depth: int = 0
+    folder_skip_hidden: bool = True
+    folder_min_size_kb: int = 0
+    folder_max_size_mb: int = 0
+    max_spooler_queue_depth: int = 4
+    retry_max_attempts: int = 3
+    retry_backoff_seconds: float = 2.0
+    breaker_failure_threshold: int = 3
+    breaker_cooldown_seconds: float = 60.0
+    fallback_printers: dict[str, str] = field(default_factory=dict)
+    schedule_policy: str = "fifo"
+    schedule_keep_folder_order: bool = False
+    journal_enabled: bool = True
+    office_process_isolation: bool = True
+    adaptive_timeouts_enabled: bool = True
+    timeout_safety_factor: float = 2.0
+    timeout_floor_seconds: float = 30.0
+    timeout_ceiling_seconds: float = 1800.0
+    spool_wait_notifications: bool = True
+    memory_budget_mb: int = 0
+    autotune_enabled: bool = False
+    autotune_min_dpi: int = 300
+    autotune_max_queue_depth: int = 8
 
     def to_dict(self) -> dict:
         return {
@@ -51,6 +86,31 @@ class UserSettings:
             "auto_update_enabled": self.auto_update_enabled,
             "update_snooze_until": self.update_snooze_until,
             "last_update_check": self.last_update_check,
+            "job_store_mode": self.job_store_mode,
+            "folder_exclude_patterns": list(self.folder_exclude_patterns),
+            "folder_max_depth": self.folder_max_depth,
+            "folder_skip_hidden": self.folder_skip_hidden,
+            "folder_min_size_kb": self.folder_min_size_kb,
+            "folder_max_size_mb": self.folder_max_size_mb,
+            "max_spooler_queue_depth": self.max_spooler_queue_depth,
+            "retry_max_attempts": self.retry_max_attempts,
+            "retry_backoff_seconds": self.retry_backoff_seconds,
+            "breaker_failure_threshold": self.breaker_failure_threshold,
+            "breaker_cooldown_seconds": self.breaker_cooldown_seconds,
+            "fallback_printers": dict(self.fallback_printers),
+            "schedule_policy": self.schedule_policy,
+            "schedule_keep_folder_order": self.schedule_keep_folder_order,
+            "journal_enabled": self.journal_enabled,
+            "office_process_isolation": self.office_process_isolation,
+            "adaptive_timeouts_enabled": self.adaptive_timeouts_enabled,
+            "timeout_safety_factor": self.timeout_safety_factor,
+            "timeout_floor_seconds": self.timeout_floor_seconds,
+            "timeout_ceiling_seconds": self.timeout_ceiling_seconds,
+            "spool_wait_notifications": self.spool_wait_notifications,
+            "memory_budget_mb": self.memory_budget_mb,
+            "autotune_enabled": self.autotune_enabled,
+            "autotune_min_dpi": self.autotune_min_dpi,
+            "autotune_max_queue_depth": self.autotune_max_queue_depth,
         }
 
     @classmethod
@@ -85,6 +145,35 @@ class UserSettings:
             auto_update_enabled=bool(data.get("auto_update_enabled", False)),
             update_snooze_until=str(data.get("update_snooze_until", "")),
             last_update_check=str(data.get("last_update_check", "")),
+            job_store_mode=str(data.get("job_store_mode", "memory")),
+            folder_exclude_patterns=[
+                str(pattern) for pattern in data.get("folder_exclude_patterns", DEFAULT_FOLDER_EXCLUDES)
+            ],
+            folder_max_depth=int(data.get("folder_max_depth", 0)),
+            folder_skip_hidden=bool(data.get("folder_skip_hidden", True)),
+            folder_min_size_kb=int(data.get("folder_min_size_kb", 0)),
+            folder_max_size_mb=int(data.get("folder_max_size_mb", 0)),
+            max_spooler_queue_depth=int(data.get("max_spooler_queue_depth", 4)),
+            retry_max_attempts=int(data.get("retry_max_attempts", 3)),
+            retry_backoff_seconds=float(data.get("retry_backoff_seconds", 2.0)),
+            breaker_failure_threshold=int(data.get("breaker_failure_threshold", 3)),
+            breaker_cooldown_seconds=float(data.get("breaker_cooldown_seconds", 60.0)),
+            fallback_printers={
+                str(key): str(value) for key, value in dict(data.get("fallback_printers", {}) or {}).items() if value
+            },
+            schedule_policy=str(data.get("schedule_policy", "fifo")),
+            schedule_keep_folder_order=bool(data.get("schedule_keep_folder_order", False)),
+            journal_enabled=bool(data.get("journal_enabled", True)),
+            office_process_isolation=bool(data.get("office_process_isolation", True)),
+            adaptive_timeouts_enabled=bool(data.get("adaptive_timeouts_enabled", True)),
+            timeout_safety_factor=float(data.get("timeout_safety_factor", 2.0)),
+            timeout_floor_seconds=float(data.get("timeout_floor_seconds", 30.0)),
+            timeout_ceiling_seconds=float(data.get("timeout_ceiling_seconds", 1800.0)),
+            spool_wait_notifications=bool(data.get("spool_wait_notifications", True)),
+            memory_budget_mb=int(data.get("memory_budget_mb", 0)),
+            autotune_enabled=bool(data.get("autotune_enabled", False)),
+            autotune_min_dpi=int(data.get("autotune_min_dpi", 300)),
+            autotune_max_queue_depth=int(data.get("autotune_max_queue_depth", 8)),
         )
 
 
@@ -103,7 +192,7 @@ def _get_app_data_dir() -> Path:
 
 
 class AppContext(QtCore.QObject):
-    settings_changed = QtCore.Signal()
+    settings_changed = QtCore.Signal(set)
     rules_changed = QtCore.Signal()
 
     def __init__(self) -> None:
@@ -111,15 +200,27 @@ class AppContext(QtCore.QObject):
         base_dir = _get_app_data_dir()
         self._config_dir = base_dir / "config"
         self._log_dir = base_dir / "logging"
+        self._cache_dir = base_dir / "cache"
         self._config_dir.mkdir(parents=True, exist_ok=True)
         self._log_dir.mkdir(parents=True, exist_ok=True)
 
         self.settings_path = self._config_dir / "user_settings.json"
         self.rules_path = self._config_dir / "rules.json"
+        self.routing_rules_path = self._config_dir / "routing_rules.json"
+        self.printer_pools_path = self._config_dir / "printer_pools.json"
         self.log_path = self._log_dir / "app.log"
+        self.job_store_path = self._cache_dir / "jobs.sqlite3"
+        self.job_journal_path = self._cache_dir / "jobs.journal"
+        self.printer_snapshot_path = self._cache_dir / "printer_snapshot.json"
+        self.print_history_path = self._cache_dir / "print_history.json"
+        self.autotune_path = self._cache_dir / "autotune.json"
 
+        self._writer = JsonFileWriter()
         self.settings = self._load_settings()
         self.rules = self._load_rules()
+        self.routing_rules = self._load_routing_rules()
+        self.printer_pools = self._load_printer_pools()
+        self.rules_version = 0
 
     def _load_settings(self) -> UserSettings:
         if self.settings_path.exists():
@@ -130,12 +231,11 @@ class AppContext(QtCore.QObject):
                 return UserSettings()
         return UserSettings()
 
-    def save_settings(self) -> None:
-        self.settings_path.write_text(
-            json.dumps(self.settings.to_dict(), indent=2),
-            encoding="utf-8",
-        )
-        self.settings_changed.emit()
+    def save_settings(self, changed: Iterable[str] | None = None) -> None:
+        self._writer.schedule(self.settings_path, self.settings.to_dict())
+        keys = set(changed) if changed is not None else {item.name for item in fields(UserSettings)}
+        if keys:
+            self.settings_changed.emit(keys)
 
     def _load_rules(self) -> dict:
         if self.rules_path.exists():
@@ -146,30 +246,81 @@ class AppContext(QtCore.QObject):
             except Exception:
                 pass
         rules = dict(DEFAULT_RULES)
-        try:
-            self.rules_path.write_text(
-                json.dumps(rules, indent=2),
-                encoding="utf-8",
-            )
-        except Exception:
-            pass
+        self._writer.schedule(self.rules_path, rules)
         return rules
 
     def save_rules(self) -> None:
-        self.rules_path.write_text(
-            json.dumps(self.rules, indent=2),
-            encoding="utf-8",
-        )
+        self._writer.schedule(self.rules_path, self.rules)
+        self.rules_version += 1
+        self.rules_changed.emit()
+
+    def _load_routing_rules(self) -> list[dict]:
+        if self.routing_rules_path.exists():
+            try:
+                data = json.loads(self.routing_rules_path.read_text(encoding="utf-8"))
+                if isinstance(data, list):
+                    return [rule for rule in data if isinstance(rule, dict)]
+            except Exception:
+                pass
+        return []
+
+    def _load_printer_pools(self) -> dict[str, list[str]]:
+        if self.printer_pools_path.exists():
+            try:
+                data = json.loads(self.printer_pools_path.read_text(encoding="utf-8"))
+                if isinstance(data, dict):
+                    return {
+                        str(name): [str(member) for member in members if member]
+                        for name, members in data.items()
+                        if isinstance(members, list)
+                    }
+            except Exception:
+                pass
+        return {}
+
+    def load_print_history(self) -> dict:
+        return _read_json_dict(self.print_history_path)
+
+    def save_print_history(self, history: dict) -> None:
+        self._writer.schedule(self.print_history_path, history)
+
+    def load_autotune_state(self) -> dict:
+        return _read_json_dict(self.autotune_path)
+
+    def save_autotune_state(self, state: dict) -> None:
+        self._writer.schedule(self.autotune_path, state)
+
+    def save_printer_pools(self) -> None:
+        self._writer.schedule(self.printer_pools_path, self.printer_pools)
+        self.rules_version += 1
+        self.rules_changed.emit()
+
+    def save_routing_rules(self) -> None:
+        self._writer.schedule(self.routing_rules_path, self.routing_rules)
+        self.rules_version += 1
         self.rules_changed.emit()
 
+    def flush(self) -> None:
+        self._writer.flush()
+
+    def close(self) -> None:
+        self._writer.close()
+        logging.getLogger(__name__).info("Settings writer stats: %s", self._writer.stats())
+
     def update_setting(self, **kwargs) -> None:
+        changed = set()
         for key, value in kwargs.items():
-            if hasattr(self.settings, key):
+            if hasattr(self.settings, key) and getattr(self.settings, key) != value:
                 setattr(self.settings, key, value)
-        self.save_settings()
+                changed.add(key)
+        if changed:
+            self.save_settings(changed)
 
     def update_rule(self, extension: str, printer: str) -> None:
-        self.rules[extension.lower()] = {"printer": printer}
+        key = extension.lower()
+        rule = dict(self.rules.get(key) or {})
+        rule["printer"] = printer
+        self.rules[key] = rule
         self.save_rules()
 
     def remove_rule(self, extension: str) -> None:
@@ -177,3 +328,14 @@ class AppContext(QtCore.QObject):
         if key in self.rules:
             self.rules.pop(key, None)
             self.save_rules()
+
+
+def _read_json_dict(path: Path) -> dict:
+    if path.exists():
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                return data
+        except Exception:
+            pass
+    return {}
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from app.backend.errors import PrintCancelledError
+
+
+class CancelToken:
+    """Cancellation flag shared between the executor and the backend printing a job.
+
+    Backends call check() between steps and wait() instead of time.sleep() so that a
+    cancel from the GUI interrupts them within one poll interval.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._cancelled_at: float | None = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def cancelled_at(self) -> float | None:
+        return self._cancelled_at
+
+    def cancel(self) -> None:
+        if not self._event.is_set():
+            self._cancelled_at = time.monotonic()
+            self._event.set()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise PrintCancelledError()
+
+    def wait(self, seconds: float) -> None:
+        """Sleeps for up to seconds; raises PrintCancelledError as soon as the token is cancelled."""
+        if self._event.wait(seconds):
+            raise PrintCancelledError()
+
+    def latency(self) -> float:
+        if self._cancelled_at is None:
+            return 0.0
+        return time.monotonic() - self._cancelled_at
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+
+class PrintError(RuntimeError):
+    """Base class for failures raised by the print backends.
+
+    transient errors are worth retrying; printer_fault errors count against the
+    target printer's circuit breaker. summary is the short text shown in the UI.
+    """
+
+    transient = False
+    printer_fault = False
+    summary = "印刷に失敗しました。"
+
+    def __init__(self, message: str = "", summary: str | None = None) -> None:
+        super().__init__(message or self.summary)
+        if summary is not None:
+            self.summary = summary
+
+
+OFFICE_DEPENDENCY_SUMMARY = "Office 印刷に必要な部品が見つかりません。"
+
+
+class MissingDependencyError(PrintError):
+    summary = "印刷に必要な部品が見つかりません。"
+
+
+class FileMissingError(PrintError):
+    summary = "ファイルが見つかりません。"
+
+
+class AccessDeniedError(PrintError):
+    summary = "権限が足りません。"
+
+
+class DocumentError(PrintError):
+    summary = "文書を開けません。"
+
+
+class UnsupportedSettingError(PrintError):
+    summary = "プリンターが印刷設定に対応していません。"
+
+
+class PrinterConfigError(PrintError):
+    printer_fault = True
+    summary = "プリンターを指定できません。"
+
+
+class PrinterUnavailableError(PrintError):
+    transient = True
+    printer_fault = True
+    summary = "プリンターに接続できません。"
+
+
+class PrintTimeoutError(PrintError):
+    transient = True
+    summary = "印刷がタイムアウトしました。"
+
+
+class SpoolTimeoutError(PrintTimeoutError):
+    """The application accepted the print but did not finish handing it to the spooler.
+
+    The document may still come out, so the job is failed rather than retried: a
+    retry could print it twice.
+    """
+
+    transient = False
+    summary = "印刷がスプーラーへ渡ったか確認できません。"
+
+
+class AutomationError(PrintError):
+    transient = True
+    summary = "Office の自動操作に失敗しました。"
+
+
+class PrintCancelledError(PrintError):
+    summary = "キャンセルしました。"
+
+
+# HRESULTs of COM calls that fail because the Office server is busy or went away.
+_RETRYABLE_HRESULTS = {
+    -2147418111,  # RPC_E_CALL_REJECTED
+    -2147417846,  # RPC_E_SERVERCALL_RETRYLATER
+    -2147417848,  # RPC_E_DISCONNECTED
+    -2147023174,  # RPC_S_SERVER_UNAVAILABLE
+    -2147023170,  # RPC_S_CALL_FAILED
+}
+_ACCESS_DENIED_HRESULT = -2147024891  # E_ACCESSDENIED
+
+
+def classify(exc: BaseException) -> PrintError:
+    if isinstance(exc, PrintError):
+        return exc
+    if isinstance(exc, FileNotFoundError):
+        return FileMissingError(str(exc))
+    if isinstance(exc, PermissionError):
+        return AccessDeniedError(str(exc))
+    hresult = _com_hresult(exc)
+    if hresult in _RETRYABLE_HRESULTS:
+        return AutomationError(str(exc))
+    if hresult == _ACCESS_DENIED_HRESULT:
+        return AccessDeniedError(str(exc))
+    if isinstance(exc, TimeoutError):
+        return PrintTimeoutError(str(exc))
+    if isinstance(exc, ConnectionError):
+        return PrinterUnavailableError(str(exc))
+    return PrintError(str(exc) or "予期しないエラーが発生しました。")
+
+
+def _com_hresult(exc: BaseException) -> int | None:
+    if type(exc).__name__ != "com_error":
+        return None
+    args = getattr(exc, "args", ())
+    if args and isinstance(args[0], int):
+        hresult = args[0]
+        # Errors raised inside the Office server carry the real code in excepinfo.
+        if len(args) > 2 and args[2] and len(args[2]) > 5 and isinstance(args[2][5], int) and args[2][5]:
+            hresult = args[2][5]
+        return hresult
+    return None
@@ -1,23 +1,37 @@
 from __future__ import annotations
 
 import gc
-import time
+from pathlib import Path
+from typing import Callable
 
 from app.app_context import AppContext
 from app.model.print_job import PrintJob
-from app.backend.printer_utils import resolve_excel_printer_name, get_default_printer_name, set_default_printer
+from app.backend.errors import (
+    OFFICE_DEPENDENCY_SUMMARY,
+    DocumentError,
+    FileMissingError,
+    MissingDependencyError,
+    PrinterConfigError,
+)
+from app.backend.cancel_token import CancelToken
+from app.backend.printer_utils import printer_cache, set_default_printer
+from app.backend.printer_capabilities import ResolvedPrintSettings
+from app.backend.print_wait import wait_for_print_queue
 
 
 class ExcelBackend:
-    def __init__(self, context: AppContext) -> None:
+    SPOOL_TIMEOUT_SECONDS = 30.0
+
+    def __init__(self, context: AppContext, timeouts: dict[str, float] | None = None) -> None:
         self._context = context
+        self._spool_timeout = (timeouts or {}).get("spool", self.SPOOL_TIMEOUT_SECONDS)
 
     def list_sheets(self, file_path: str) -> list[str]:
         try:
             import pythoncom  # type: ignore
             import win32com.client  # type: ignore
         except Exception as exc:
-            raise RuntimeError("Excel 印刷には pywin32 が必要です。") from exc
+            raise MissingDependencyError("Excel 印刷には pywin32 が必要です。", OFFICE_DEPENDENCY_SUMMARY) from exc
 
         pythoncom.CoInitialize()
         app = None
@@ -42,12 +56,24 @@ class ExcelBackend:
             gc.collect()
             pythoncom.CoUninitialize()
 
-    def print(self, job: PrintJob) -> None:
+    def print(
+        self,
+        job: PrintJob,
+        settings: ResolvedPrintSettings,
+        cancel: CancelToken | None = None,
+        stage: Callable[..., None] | None = None,
+    ) -> None:
+        cancel = cancel or CancelToken()
+        stage = stage or (lambda _name, server=None: None)
+        if not Path(job.file_path).exists():
+            raise FileMissingError("ファイルが見つかりません。")
+        key = settings.paper_key
+        paper_id = settings.paper_id
         try:
             import pythoncom  # type: ignore
             import win32com.client  # type: ignore
         except Exception as exc:
-            raise RuntimeError("Excel 印刷には pywin32 が必要です。") from exc
+            raise MissingDependencyError("Excel 印刷には pywin32 が必要です。", OFFICE_DEPENDENCY_SUMMARY) from exc
 
         pythoncom.CoInitialize()
         app = None
@@ -55,22 +81,27 @@ class ExcelBackend:
         default_before = ""
         default_changed = False
         try:
+            stage("launch")
             app = win32com.client.DispatchEx("Excel.Application")
             app.Visible = False
             if hasattr(app, "DisplayAlerts"):
                 app.DisplayAlerts = False
+            stage("open", server=app)
             workbook = app.Workbooks.Open(job.file_path, ReadOnly=True)
-            if job.printer_name:
-                default_printer = get_default_printer_name()
-                if self._context.settings.use_default_printer and job.printer_name == default_printer:
+            cancel.check()
+            cache = printer_cache()
+            printer_name = settings.printer_name
+            if printer_name:
+                default_printer = cache.default_printer()
+                if self._context.settings.use_default_printer and printer_name == default_printer:
                     job_printer = ""
                 else:
-                    job_printer = job.printer_name
+                    job_printer = printer_name
             else:
                 job_printer = ""
 
             if job_printer:
-                resolved_name = resolve_excel_printer_name(job.printer_name)
+                resolved_name = cache.excel_printer_name(printer_name)
                 try:
                     app.ActivePrinter = resolved_name
                 except Exception:
@@ -78,42 +109,59 @@ class ExcelBackend:
                         app.ActivePrinter = job_printer
                     except Exception:
                         resolved_name = ""
-                        default_before = get_default_printer_name()
+                        default_before = cache.default_printer()
                         if set_default_printer(job_printer):
                             default_changed = True
                         else:
-                            raise RuntimeError(
+                            raise PrinterConfigError(
                                 "Excel がプリンターを指定できません。Excel の既定プリンターに切り替えると印刷できます。"
                             )
             if job_printer and not resolved_name and not default_changed:
-                raise RuntimeError(
+                raise PrinterConfigError(
                     "Excel がプリンターを指定できません。Excel の既定プリンターに切り替えると印刷できます。"
                 )
-            paper_const = _excel_paper_constant(job.paper_size, win32com.client.constants)
+            paper_const = _excel_paper_constant(key, win32com.client.constants)
+            if paper_const is None and paper_id is not None and paper_id <= _DMPAPER_LAST:
+                # XlPaperSize values are the Windows DMPAPER ids.
+                paper_const = paper_id
+            stage("print")
             auto_mode = self._context.settings.excel_orientation_mode
             auto_orientation = auto_mode == "auto" or (auto_mode == "ask" and job.excel_auto_orientation)
             if job.excel_sheets:
                 for name in job.excel_sheets:
+                    cancel.check()
                     try:
                         sheet = workbook.Worksheets(name)
                     except Exception as exc:
-                        raise RuntimeError(f"シートが見つかりません: {name}") from exc
+                        raise DocumentError(f"シートが見つかりません: {name}", "シートが見つかりません。") from exc
                     if paper_const is not None:
                         sheet.PageSetup.PaperSize = paper_const
                     if auto_orientation:
                         sheet.PageSetup.Orientation = _suggest_sheet_orientation(sheet, win32com.client.constants)
-                    sheet.PrintOut(Copies=job.copies)
+                    sheet.PrintOut(Copies=settings.copies)
             else:
                 if paper_const is not None:
                     for sheet in workbook.Worksheets:
+                        cancel.check()
                         sheet.PageSetup.PaperSize = paper_const
                         if auto_orientation:
                             sheet.PageSetup.Orientation = _suggest_sheet_orientation(sheet, win32com.client.constants)
-                workbook.PrintOut(Copies=job.copies)
-            _wait_for_print_queue(app)
+                cancel.check()
+                workbook.PrintOut(Copies=settings.copies)
+            stage("spool")
+            wait_for_print_queue(
+                f"Excel {job.file_name}",
+                lambda: _printing(app),
+                cancel,
+                self._spool_timeout,
+                job_printer,
+                self._context.settings.spool_wait_notifications,
+            )
         finally:
+            stage("close")
             if default_changed and default_before:
                 set_default_printer(default_before)
+                printer_cache().invalidate(settings.printer_name)
             if workbook is not None:
                 workbook.Close(False)
             if app is not None:
@@ -126,33 +174,28 @@ class ExcelBackend:
             pythoncom.CoUninitialize()
 
 
-def _wait_for_print_queue(app) -> None:
-    if hasattr(app, "BackgroundPrintingStatus"):
-        for _ in range(300):
-            if app.BackgroundPrintingStatus == 0:
-                break
-            time.sleep(0.1)
-
-
-def _excel_paper_constant(name: str, constants) -> int | None:
-    if not name:
-        return None
-    normalized = name.replace(" ", "").replace("-", "").upper()
-    mapping = {
-        "A3": ["xlPaperA3"],
-        "A4": ["xlPaperA4"],
-        "A5": ["xlPaperA5"],
-        "B4": ["xlPaperB4"],
-        "B5": ["xlPaperB5", "xlPaperB5JIS"],
-        "LETTER": ["xlPaperLetter"],
-        "LEGAL": ["xlPaperLegal"],
-    }
-    for key, candidates in mapping.items():
-        if key in normalized:
-            for candidate in candidates:
-                value = getattr(constants, candidate, None)
-                if value is not None:
-                    return value
+def _printing(app) -> bool:
+    return bool(getattr(app, "BackgroundPrintingStatus", 0))
+
+
+_DMPAPER_LAST = 118
+
+_EXCEL_PAPER_CONSTANTS = {
+    "A3": ["xlPaperA3"],
+    "A4": ["xlPaperA4"],
+    "A5": ["xlPaperA5"],
+    "B4": ["xlPaperB4"],
+    "B5": ["xlPaperB5", "xlPaperB5JIS"],
+    "LETTER": ["xlPaperLetter"],
+    "LEGAL": ["xlPaperLegal"],
+}
+
+
+def _excel_paper_constant(key: str, constants) -> int | None:
+    for candidate in _EXCEL_PAPER_CONSTANTS.get(key, []):
+        value = getattr(constants, candidate, None)
+        if value is not None:
+            return value
     return None
 
 
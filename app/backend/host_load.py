@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import sys
+
+
+def cpu_times() -> tuple[float, float] | None:
+    """(busy, total) CPU time of the whole machine so far, or None when it cannot be read."""
+    if sys.platform == "win32":
+        return _windows_cpu_times()
+    try:
+        with open("/proc/stat", encoding="ascii") as handle:
+            values = [float(value) for value in handle.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+    if len(values) < 4:
+        return None
+    # idle and iowait
+    idle = values[3] + (values[4] if len(values) > 4 else 0.0)
+    total = sum(values)
+    return total - idle, total
+
+
+def cpu_busy_since(start: tuple[float, float] | None) -> float:
+    """Share of CPU time spent busy since start; 0.0 when unknown."""
+    end = cpu_times()
+    if start is None or end is None or end[1] <= start[1]:
+        return 0.0
+    return (end[0] - start[0]) / (end[1] - start[1])
+
+
+def _windows_cpu_times() -> tuple[float, float] | None:
+    import ctypes
+    from ctypes import wintypes
+
+    idle, kernel, user = wintypes.FILETIME(), wintypes.FILETIME(), wintypes.FILETIME()
+    if not ctypes.windll.kernel32.GetSystemTimes(ctypes.byref(idle), ctypes.byref(kernel), ctypes.byref(user)):
+        return None
+
+    def ticks(value: wintypes.FILETIME) -> float:
+        return float((value.dwHighDateTime << 32) | value.dwLowDateTime)
+
+    # Kernel time includes idle time.
+    total = ticks(kernel) + ticks(user)
+    return total - ticks(idle), total
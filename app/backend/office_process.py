@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import os
+import queue
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from app.app_context import AppContext
+from app.model.job_store import job_to_record
+from app.model.print_job import PrintJob
+from app.backend.cancel_token import CancelToken
+from app.backend.errors import (
+    AutomationError,
+    FileMissingError,
+    PrintCancelledError,
+    PrintError,
+    PrintTimeoutError,
+    SpoolTimeoutError,
+)
+from app.backend.printer_capabilities import ResolvedPrintSettings
+from app.backend.process_memory import PeakMemorySampler
+
+_APP_LABELS = {"word": "Word", "excel": "Excel", "ppt": "PowerPoint"}
+
+_STAGE_LABELS = {
+    "start": "起動準備",
+    "launch": "起動",
+    "open": "ファイルを開く処理",
+    "print": "印刷処理",
+    "spool": "スプール待ち",
+    "close": "終了処理",
+}
+
+# Stages that run after PrintOut: a timeout there must not lead to a retry.
+_PRINTED_STAGES = ("spool", "close")
+
+
+def _error_types(base: type[PrintError]) -> dict[str, type[PrintError]]:
+    types = {}
+    for error_type in base.__subclasses__():
+        types[error_type.__name__] = error_type
+        types.update(_error_types(error_type))
+    return types
+
+
+_ERROR_TYPES = _error_types(PrintError)
+
+_NO_EVENT = object()
+
+
+class OfficeProcessBackend:
+    """Runs an Office backend in a supervised child process (app.backend.office_worker).
+
+    The child reports each stage and sends a heartbeat every second. A stage that
+    overruns its timeout, a missing heartbeat or a cancel that is not honoured gets
+    the child killed together with the Word/Excel/PowerPoint server it started; the
+    child dumps its thread stacks to stderr before that, and the dump is logged.
+    """
+
+    STAGE_TIMEOUTS = {
+        "start": 60.0,
+        "launch": 60.0,
+        "open": 120.0,
+        "print": 300.0,
+        "spool": 60.0,
+        "close": 30.0,
+    }
+    HEARTBEAT_TIMEOUT = 15.0
+    POLL_SECONDS = 0.1
+    CANCEL_GRACE_SECONDS = 3.0
+    # Time the child gets to write its own stack dump after a stage overran.
+    DUMP_GRACE_SECONDS = 1.0
+
+    def __init__(self, context: AppContext, kind: str, timeouts: dict[str, float] | None = None) -> None:
+        self._context = context
+        self._kind = kind
+        self._timeouts = {**self.STAGE_TIMEOUTS, **(timeouts or {})}
+        self._memory = PeakMemorySampler()
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def peak_memory(self) -> int:
+        # The worker plus the Office server it drives.
+        return self._memory.peak
+
+    def print(
+        self,
+        job: PrintJob,
+        settings: ResolvedPrintSettings,
+        cancel: CancelToken | None = None,
+        stage: Callable[[str], None] | None = None,
+    ) -> None:
+        cancel = cancel or CancelToken()
+        stage = stage or (lambda _name: None)
+        if not Path(job.file_path).exists():
+            raise FileMissingError("ファイルが見つかりません。")
+        cancel.check()
+        payload = {
+            "kind": self._kind,
+            "job": job_to_record(job),
+            "print_settings": {
+                **dataclasses.asdict(settings),
+                "duplex": settings.duplex.value,
+            },
+            "settings": self._context.settings.to_dict(),
+            "timeouts": self._timeouts,
+        }
+        stage("start")
+        with tempfile.TemporaryFile() as diagnostics:
+            process = subprocess.Popen(
+                self._command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=diagnostics,
+                text=True,
+            )
+            events: queue.Queue = queue.Queue()
+            threading.Thread(target=_read_events, args=(process.stdout, events), daemon=True).start()
+            supervisor = _Supervisor(self, process, events, cancel, stage)
+            try:
+                process.stdin.write(json.dumps(payload) + "\n")
+                process.stdin.flush()
+                result = supervisor.run()
+            except PrintError:
+                supervisor.kill()
+                self._log_diagnostics(job, diagnostics)
+                raise
+            finally:
+                if process.poll() is None:
+                    supervisor.kill()
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+            if result is None:
+                # The child died without reporting; its Office server would be left behind.
+                supervisor.kill()
+                self._log_diagnostics(job, diagnostics)
+                raise AutomationError(
+                    f"{self._label()} の印刷プロセスが異常終了しました（終了コード {process.returncode}）。"
+                )
+        if result.get("event") == "error":
+            error_type = _ERROR_TYPES.get(result.get("error", ""), PrintError)
+            raise error_type(result.get("message", ""), result.get("summary"))
+
+    def _command(self) -> list[str]:
+        if getattr(sys, "frozen", False):
+            return [sys.executable, "--office-worker"]
+        return [sys.executable, "-m", "app.backend.office_worker"]
+
+    def _label(self) -> str:
+        return _APP_LABELS.get(self._kind, "Office")
+
+    def _log_diagnostics(self, job: PrintJob, diagnostics) -> None:
+        diagnostics.seek(0)
+        text = diagnostics.read().decode("utf-8", errors="replace").strip()
+        if text:
+            self._logger.warning("Office worker output for %s:\n%s", job.file_path, text)
+
+
+class _Supervisor:
+    def __init__(
+        self,
+        backend: OfficeProcessBackend,
+        process: subprocess.Popen,
+        events: queue.Queue,
+        cancel: CancelToken,
+        stage: Callable[[str], None],
+    ) -> None:
+        self._backend = backend
+        self._process = process
+        self._events = events
+        self._cancel = cancel
+        self._on_stage = stage
+        self._stage = "start"
+        self._server_pid: int | None = None
+        self._logger = backend._logger
+
+    def run(self) -> dict | None:
+        now = time.monotonic()
+        stage_started = last_seen = now
+        cancel_sent_at = None
+        result = None
+        timeouts = self._backend._timeouts
+        while True:
+            try:
+                event = self._events.get(timeout=self._backend.POLL_SECONDS)
+            except queue.Empty:
+                event = _NO_EVENT
+            now = time.monotonic()
+            self._backend._memory.sample(self._process.pid, self._server_pid)
+            if event is None:
+                self._process.wait()
+                return result
+            if event is not _NO_EVENT:
+                last_seen = now
+                kind = event.get("event")
+                if kind == "stage":
+                    self._logger.debug("%s worker: %s after %.1fs", self._backend._label(), event.get("stage"), now - stage_started)
+                    self._stage = str(event.get("stage", ""))
+                    stage_started = now
+                    self._on_stage(self._stage)
+                elif kind == "log":
+                    logging.getLogger(str(event.get("logger", __name__))).log(
+                        int(event.get("level", logging.INFO)), "%s", event.get("message", "")
+                    )
+                elif kind == "server":
+                    self._server_pid = int(event.get("pid", 0)) or None
+                elif kind in ("done", "error"):
+                    result = event
+                continue
+            if self._cancel.cancelled and cancel_sent_at is None:
+                cancel_sent_at = now
+                self._send("cancel")
+            if cancel_sent_at is not None and now - cancel_sent_at >= self._backend.CANCEL_GRACE_SECONDS:
+                self._logger.warning("%s worker ignored cancel during %s; killing it", self._backend._label(), self._stage)
+                raise PrintCancelledError(f"{self._backend._label()} の印刷を中止しました。")
+            timeout = timeouts.get(self._stage)
+            if timeout and now - stage_started >= timeout + self._backend.DUMP_GRACE_SECONDS:
+                self._logger.warning(
+                    "%s worker stuck in %s for %.0fs; killing it", self._backend._label(), self._stage, now - stage_started
+                )
+                error_type = SpoolTimeoutError if self._stage in _PRINTED_STAGES else PrintTimeoutError
+                raise error_type(
+                    f"{self._backend._label()} の{_STAGE_LABELS.get(self._stage, self._stage)}が "
+                    f"{timeout:.0f} 秒以内に終わりませんでした。"
+                )
+            if now - last_seen >= self._backend.HEARTBEAT_TIMEOUT:
+                self._send("dump")
+                time.sleep(self._backend.DUMP_GRACE_SECONDS)
+                self._logger.warning("%s worker stopped responding during %s", self._backend._label(), self._stage)
+                error_type = SpoolTimeoutError if self._stage in _PRINTED_STAGES else AutomationError
+                raise error_type(f"{self._backend._label()} の印刷プロセスが応答しません。")
+
+    def kill(self) -> None:
+        if self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+        if self._server_pid:
+            try:
+                os.kill(self._server_pid, signal.SIGTERM)
+                self._logger.warning("Terminated %s server process %s", self._backend._label(), self._server_pid)
+            except OSError:
+                pass
+            self._server_pid = None
+
+    def _send(self, command: str) -> None:
+        try:
+            self._process.stdin.write(command + "\n")
+            self._process.stdin.flush()
+        except (OSError, ValueError):
+            pass
+
+
+def _read_events(stream, events: queue.Queue) -> None:
+    try:
+        for line in stream:
+            try:
+                events.put(json.loads(line))
+            except ValueError:
+                continue
+    finally:
+        events.put(None)
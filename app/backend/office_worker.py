@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import faulthandler
+import json
+import logging
+import sys
+import threading
+import uuid
+
+from app.backend.cancel_token import CancelToken
+from app.backend.errors import classify
+
+HEARTBEAT_SECONDS = 1.0
+
+_output_lock = threading.Lock()
+
+
+class _WorkerContext:
+    # The backends only read settings; a full AppContext would touch the config files.
+    def __init__(self, settings) -> None:
+        self.settings = settings
+
+
+def _emit(event: dict) -> None:
+    with _output_lock:
+        sys.stdout.write(json.dumps(event) + "\n")
+        sys.stdout.flush()
+
+
+class _EventLogHandler(logging.Handler):
+    # Forwards the backends' log records to the parent, which writes them to its own log.
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            _emit({"event": "log", "logger": record.name, "level": record.levelno, "message": record.getMessage()})
+        except Exception:
+            self.handleError(record)
+
+
+def _heartbeat(stop: threading.Event) -> None:
+    while not stop.wait(HEARTBEAT_SECONDS):
+        _emit({"event": "heartbeat"})
+
+
+def _watch_stdin(cancel: CancelToken) -> None:
+    for line in sys.stdin:
+        command = line.strip()
+        if command == "cancel":
+            cancel.cancel()
+        elif command == "dump":
+            faulthandler.dump_traceback(file=sys.stderr, all_threads=True)
+    # A closed stdin means the parent went away; stop printing either way.
+    cancel.cancel()
+
+
+def automation_server_pid(app, kind: str) -> int | None:
+    """Process id of the Office server behind an automation object, from its main window.
+
+    Only the process that owns this object's window qualifies, so a Word or Excel window
+    the user opens meanwhile is never taken for ours.
+    """
+    try:
+        import win32gui  # type: ignore
+        import win32process  # type: ignore
+    except Exception:
+        return None
+    try:
+        if kind == "word":
+            # Word has no Application.Hwnd; find its hidden main window by a caption of our own.
+            caption = f"RakuPrints {uuid.uuid4()}"
+            app.Caption = caption
+            hwnd = win32gui.FindWindow("OpusApp", caption)
+        elif kind == "excel":
+            hwnd = app.Hwnd
+        else:
+            hwnd = app.HWND
+        _thread_id, pid = win32process.GetWindowThreadProcessId(int(hwnd))
+    except Exception:
+        return None
+    return pid or None
+
+
+class _StageReporter:
+    """Reports stages to the parent and arms a stack dump if a stage overruns its timeout."""
+
+    def __init__(self, kind: str, timeouts: dict[str, float]) -> None:
+        self._kind = kind
+        self._timeouts = timeouts
+        self._server_reported = False
+
+    def __call__(self, name: str, server=None) -> None:
+        if server is not None and not self._server_reported:
+            # Tell the parent which process to kill if we hang.
+            self._server_reported = True
+            pid = automation_server_pid(server, self._kind)
+            if pid:
+                _emit({"event": "server", "pid": pid})
+        faulthandler.cancel_dump_traceback_later()
+        timeout = self._timeouts.get(name)
+        if timeout:
+            faulthandler.dump_traceback_later(timeout, file=sys.stderr)
+        _emit({"event": "stage", "stage": name})
+
+
+def _backend_type(kind: str):
+    if kind == "word":
+        from app.backend.word_backend import WordBackend
+
+        return WordBackend
+    if kind == "excel":
+        from app.backend.excel_backend import ExcelBackend
+
+        return ExcelBackend
+    if kind == "ppt":
+        from app.backend.ppt_backend import PptBackend
+
+        return PptBackend
+    raise RuntimeError(f"Unsupported Office backend: {kind}")
+
+
+def main() -> int:
+    faulthandler.enable(file=sys.stderr)
+    root = logging.getLogger()
+    root.addHandler(_EventLogHandler())
+    root.setLevel(logging.INFO)
+    payload = json.loads(sys.stdin.readline() or "{}")
+    kind = payload.get("kind", "")
+    cancel = CancelToken()
+    threading.Thread(target=_watch_stdin, args=(cancel,), daemon=True).start()
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat, args=(stop,), daemon=True).start()
+    try:
+        from app.app_context import UserSettings
+        from app.backend.printer_capabilities import ResolvedPrintSettings
+        from app.model.job_store import job_from_record
+        from app.model.print_job import DuplexMode
+
+        context = _WorkerContext(UserSettings.from_dict(payload.get("settings", {})))
+        job = job_from_record(payload["job"])
+        values = dict(payload["print_settings"])
+        values["duplex"] = DuplexMode(values["duplex"])
+        settings = ResolvedPrintSettings(**values)
+        timeouts = payload.get("timeouts", {})
+        reporter = _StageReporter(kind, timeouts)
+        _backend_type(kind)(context, timeouts).print(job, settings, cancel, reporter)
+    except BaseException as exc:
+        error = classify(exc)
+        _emit({"event": "error", "error": type(error).__name__, "message": str(error), "summary": error.summary})
+        return 1
+    finally:
+        faulthandler.cancel_dump_traceback_later()
+        stop.set()
+    _emit({"event": "done"})
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,46 +5,139 @@ from pathlib import Path
 import json
 import subprocess
 import sys
+import tempfile
+import time
+from typing import Callable
 
 from app.app_context import AppContext
 from app.model.print_job import PrintJob
+from app.backend.errors import (
+    DocumentError,
+    FileMissingError,
+    MissingDependencyError,
+    PrintCancelledError,
+    PrintError,
+    PrinterUnavailableError,
+    PrintTimeoutError,
+)
+from app.backend.cancel_token import CancelToken
+from app.backend.printer_capabilities import ResolvedPrintSettings
+from app.backend.process_memory import PeakMemorySampler
 
 
 class PdfBackend:
-    def __init__(self, context: AppContext) -> None:
+    TIMEOUT_SECONDS = 300
+    POLL_SECONDS = 0.1
+    # How long a cancelled worker gets to abort its spooler job before it is killed.
+    CANCEL_GRACE_SECONDS = 2.0
+
+    def __init__(self, context: AppContext, timeouts: dict[str, float] | None = None) -> None:
         self._context = context
+        self._timeout = (timeouts or {}).get("print", self.TIMEOUT_SECONDS)
+        self._memory = PeakMemorySampler()
+
+    @property
+    def peak_memory(self) -> int:
+        return self._memory.peak
 
-    def print(self, job: PrintJob) -> None:
+    def print(
+        self,
+        job: PrintJob,
+        settings: ResolvedPrintSettings,
+        cancel: CancelToken | None = None,
+        stage: Callable[[str], None] | None = None,
+    ) -> None:
+        cancel = cancel or CancelToken()
+        stage = stage or (lambda _name: None)
         if not Path(job.file_path).exists():
-            raise RuntimeError("ファイルが見つかりません。")
+            raise FileMissingError("ファイルが見つかりません。")
 
         try:
             import fitz  # type: ignore
         except Exception as exc:
-            raise RuntimeError("PDF 印刷には PyMuPDF が必要です。") from exc
+            raise MissingDependencyError("PDF 印刷には PyMuPDF が必要です。", "PDF 印刷に必要な部品が見つかりません。") from exc
         payload = {
             "file_path": job.file_path,
-            "printer_name": job.printer_name,
-            "copies": job.copies,
-            "duplex": job.duplex.value,
-            "paper_size": job.paper_size,
-            "dpi": 600,
+            "printer_name": settings.printer_name,
+            "copies": settings.copies,
+            "max_copies": settings.max_copies,
+            "duplex": settings.duplex.value,
+            "paper_size": settings.paper_size,
+            "paper_key": settings.paper_key,
+            "dpi": render_dpi(settings),
         }
+        if getattr(sys, "frozen", False):
+            cmd = [sys.executable, "--pdf-worker"]
+        else:
+            cmd = [sys.executable, "-m", "app.backend.pdf_worker"]
+        cancel.check()
+        # The worker renders and spools in one go, so the whole run counts as the print stage.
+        stage("print")
+        # Output goes to a temporary file so that a chatty worker cannot block on a full pipe.
+        with tempfile.TemporaryFile() as output:
+            process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=output, stderr=output, text=True)
+            try:
+                returncode = self._wait_for_worker(process, json.dumps(payload), cancel)
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+            output.seek(0)
+            message = output.read().decode("utf-8", errors="replace").strip()
+
+        if returncode != 0:
+            raise _WORKER_ERRORS.get(returncode, PrintError)(message or "PDF の印刷に失敗しました。")
+
+    def _wait_for_worker(self, process: subprocess.Popen, payload: str, cancel: CancelToken) -> int:
+        process.stdin.write(payload + "\n")
+        process.stdin.flush()
+        deadline = time.monotonic() + self._timeout
+        try:
+            while True:
+                try:
+                    return process.wait(self.POLL_SECONDS)
+                except subprocess.TimeoutExpired:
+                    pass
+                self._memory.sample(process.pid)
+                if cancel.cancelled:
+                    self._stop_worker(process)
+                    raise PrintCancelledError("PDF 印刷をキャンセルしました。")
+                if time.monotonic() >= deadline:
+                    process.kill()
+                    raise PrintTimeoutError(f"PDF 印刷が {self._timeout:.0f} 秒以内に終わりませんでした。")
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    def _stop_worker(self, process: subprocess.Popen) -> None:
+        try:
+            process.stdin.write("cancel\n")
+            process.stdin.flush()
+        except OSError:
+            pass
         try:
-            if getattr(sys, "frozen", False):
-                cmd = [sys.executable, "--pdf-worker"]
-            else:
-                cmd = [sys.executable, "-m", "app.backend.pdf_worker"]
-            result = subprocess.run(
-                cmd,
-                input=json.dumps(payload),
-                text=True,
-                capture_output=True,
-                timeout=300,
-            )
-        except subprocess.TimeoutExpired as exc:
-            raise RuntimeError("PDF 印刷がタイムアウトしました。") from exc
-
-        if result.returncode != 0:
-            message = result.stderr.strip() or result.stdout.strip() or "PDF の印刷に失敗しました。"
-            raise RuntimeError(message)
+            process.wait(self.CANCEL_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+# Exit codes of app.backend.pdf_worker.
+_WORKER_ERRORS: dict[int, type[PrintError]] = {
+    2: FileMissingError,
+    3: MissingDependencyError,
+    4: DocumentError,
+    5: PrinterUnavailableError,
+    6: PrintCancelledError,
+}
+
+
+_QUALITY_DPI = {"draft": 150, "normal": 300, "high": 600}
+
+
+def render_dpi(settings: ResolvedPrintSettings) -> int:
+    dpi = _QUALITY_DPI.get(settings.quality, 600)
+    if settings.max_dpi:
+        dpi = min(dpi, settings.max_dpi)
+    return dpi
@@ -2,44 +2,53 @@ from __future__ import annotations
 
 import json
 import sys
+import threading
 from pathlib import Path
 
 from PySide6 import QtCore, QtGui, QtPrintSupport, QtWidgets
 
 
-def _apply_paper_size(printer: QtPrintSupport.QPrinter, name: str) -> None:
-    if not name:
-        return
-    normalized = name.replace(" ", "").replace("-", "").upper()
-    mapping = {
-        "A3": QtGui.QPageSize.A3,
-        "A4": QtGui.QPageSize.A4,
-        "A5": QtGui.QPageSize.A5,
-        "B4": QtGui.QPageSize.B4,
-        "B5": QtGui.QPageSize.B5,
-        "LETTER": QtGui.QPageSize.Letter,
-        "LEGAL": QtGui.QPageSize.Legal,
-    }
-    for key, page_id in mapping.items():
-        if key in normalized:
-            printer.setPageSize(QtGui.QPageSize(page_id))
-            break
+_PAGE_SIZES = {
+    "A3": QtGui.QPageSize.A3,
+    "A4": QtGui.QPageSize.A4,
+    "A5": QtGui.QPageSize.A5,
+    "B4": QtGui.QPageSize.B4,
+    "B5": QtGui.QPageSize.B5,
+    "LETTER": QtGui.QPageSize.Letter,
+    "LEGAL": QtGui.QPageSize.Legal,
+}
+
+
+def _apply_paper_size(printer: QtPrintSupport.QPrinter, key: str) -> None:
+    page_id = _PAGE_SIZES.get(key)
+    if page_id is not None:
+        printer.setPageSize(QtGui.QPageSize(page_id))
 
 
 def _read_payload() -> dict:
-    raw = sys.stdin.read()
-    if not raw:
+    # The payload is the first line; the parent keeps stdin open to send "cancel" later.
+    raw = sys.stdin.readline()
+    if not raw.strip():
         return {}
     return json.loads(raw)
 
 
+def _watch_for_cancel(cancelled: threading.Event) -> None:
+    for line in sys.stdin:
+        if line.strip() == "cancel":
+            break
+    # A closed stdin means the parent went away; stop printing either way.
+    cancelled.set()
+
+
 def main() -> int:
     payload = _read_payload()
     file_path = payload.get("file_path", "")
     printer_name = payload.get("printer_name", "")
     copies = int(payload.get("copies", 1))
+    max_copies = int(payload.get("max_copies", 0))
     duplex = payload.get("duplex", "")
-    paper_size = payload.get("paper_size", "")
+    page_key = payload.get("paper_key", "")
 
     if not file_path:
         print("File path is required", file=sys.stderr)
@@ -54,6 +63,9 @@ def main() -> int:
         print("PyMuPDF is required", file=sys.stderr)
         return 3
 
+    cancelled = threading.Event()
+    threading.Thread(target=_watch_for_cancel, args=(cancelled,), daemon=True).start()
+
     app = QtWidgets.QApplication([])
     doc = None
     painter = QtGui.QPainter()
@@ -66,7 +78,13 @@ def main() -> int:
         printer = QtPrintSupport.QPrinter(QtPrintSupport.QPrinter.HighResolution)
         if printer_name:
             printer.setPrinterName(printer_name)
-        if copies > 0:
+        printer.setDocName(Path(file_path).name)
+        passes = 1
+        if max_copies and copies > max_copies:
+            # The driver cannot make this many copies; print the document once per copy instead.
+            passes = copies
+            printer.setCopyCount(1)
+        elif copies > 0:
             printer.setCopyCount(copies)
         if duplex == "長辺とじ":
             printer.setDuplex(QtPrintSupport.QPrinter.DuplexLongSide)
@@ -74,8 +92,8 @@ def main() -> int:
             printer.setDuplex(QtPrintSupport.QPrinter.DuplexShortSide)
         else:
             printer.setDuplex(QtPrintSupport.QPrinter.DuplexNone)
-        if paper_size:
-            _apply_paper_size(printer, paper_size)
+        if page_key:
+            _apply_paper_size(printer, page_key)
 
         if not painter.begin(printer):
             print("Failed to initialize printer", file=sys.stderr)
@@ -83,9 +101,23 @@ def main() -> int:
 
         target_dpi = int(payload.get("dpi", 600))
         scale = target_dpi / 72.0
-        for page_index in range(doc.page_count):
-            if page_index > 0:
+        # With duplex, a copy with an odd page count would otherwise start on the back of the last sheet.
+        blank_between = duplex in ("長辺とじ", "短辺とじ") and doc.page_count % 2 == 1
+        pages = []
+        for copy_index in range(passes):
+            if copy_index > 0 and blank_between:
+                pages.append(None)
+            pages.extend(range(doc.page_count))
+        for position, page_index in enumerate(pages):
+            if cancelled.is_set():
+                # Discards the spooler job instead of leaving a partial document.
+                printer.abort()
+                print("Cancelled", file=sys.stderr)
+                return 6
+            if position > 0:
                 printer.newPage()
+            if page_index is None:
+                continue
             page = doc.load_page(page_index)
             pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
             image = QtGui.QImage(
@@ -1,37 +1,77 @@
 from __future__ import annotations
 
 import gc
-import time
+from pathlib import Path
+from typing import Callable
 
 from app.app_context import AppContext
 from app.model.print_job import PrintJob
+from app.backend.errors import (
+    OFFICE_DEPENDENCY_SUMMARY,
+    FileMissingError,
+    MissingDependencyError,
+    PrinterUnavailableError,
+)
+from app.backend.cancel_token import CancelToken
+from app.backend.printer_capabilities import ResolvedPrintSettings
+from app.backend.print_wait import wait_for_print_queue
 
 
 class PptBackend:
-    def __init__(self, context: AppContext) -> None:
+    SPOOL_TIMEOUT_SECONDS = 30.0
+
+    def __init__(self, context: AppContext, timeouts: dict[str, float] | None = None) -> None:
         self._context = context
+        self._spool_timeout = (timeouts or {}).get("spool", self.SPOOL_TIMEOUT_SECONDS)
 
-    def print(self, job: PrintJob) -> None:
+    def print(
+        self,
+        job: PrintJob,
+        settings: ResolvedPrintSettings,
+        cancel: CancelToken | None = None,
+        stage: Callable[..., None] | None = None,
+    ) -> None:
+        cancel = cancel or CancelToken()
+        stage = stage or (lambda _name, server=None: None)
+        if not Path(job.file_path).exists():
+            raise FileMissingError("ファイルが見つかりません。")
         try:
             import pythoncom  # type: ignore
             import win32com.client  # type: ignore
         except Exception as exc:
-            raise RuntimeError("PowerPoint 印刷には pywin32 が必要です。") from exc
+            raise MissingDependencyError("PowerPoint 印刷には pywin32 が必要です。", OFFICE_DEPENDENCY_SUMMARY) from exc
 
         pythoncom.CoInitialize()
         app = None
         presentation = None
         try:
+            stage("launch")
             app = win32com.client.DispatchEx("PowerPoint.Application")
             app.Visible = False
             if hasattr(app, "DisplayAlerts"):
                 app.DisplayAlerts = False
+            stage("open", server=app)
             presentation = app.Presentations.Open(job.file_path, WithWindow=False)
-            if job.printer_name:
-                app.ActivePrinter = job.printer_name
-            presentation.PrintOut(Copies=job.copies)
-            _wait_for_print_queue(app)
+            cancel.check()
+            if settings.printer_name:
+                try:
+                    app.ActivePrinter = settings.printer_name
+                except Exception as exc:
+                    raise PrinterUnavailableError(f"プリンターを指定できません: {settings.printer_name}") from exc
+            cancel.check()
+            stage("print")
+            presentation.PrintOut(Copies=settings.copies)
+            stage("spool")
+            wait_for_print_queue(
+                f"PowerPoint {job.file_name}",
+                lambda: _printing(app),
+                cancel,
+                self._spool_timeout,
+                settings.printer_name,
+                self._context.settings.spool_wait_notifications,
+            )
         finally:
+            stage("close")
             if presentation is not None:
                 presentation.Close()
             if app is not None:
@@ -44,9 +84,5 @@ class PptBackend:
             pythoncom.CoUninitialize()
 
 
-def _wait_for_print_queue(app) -> None:
-    if hasattr(app, "PrintStatus"):
-        for _ in range(300):
-            if app.PrintStatus == 0:
-                break
-            time.sleep(0.1)
+def _printing(app) -> bool:
+    return bool(getattr(app, "PrintStatus", 0))
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from app.backend.cancel_token import CancelToken
+from app.backend.errors import SpoolTimeoutError
+
+# PRINTER_CHANGE_JOB from winspool.h: a job was added, changed or deleted.
+PRINTER_CHANGE_JOB = 0x0000FF00
+# Longest single wait on a notification handle, so that a cancel is noticed promptly.
+NOTIFY_SLICE_SECONDS = 0.1
+
+
+@dataclass
+class WaitResult:
+    completed: bool
+    seconds: float
+    polls: int
+    notifications: int = 0
+
+
+class SpoolerNotifier:
+    """Wakes a waiter when a job on the printer's spooler queue changes.
+
+    Wraps FindFirstPrinterChangeNotification; when pywin32 or the printer is not
+    available, wait() simply sleeps and the caller falls back to plain polling.
+    """
+
+    def __init__(self, printer_name: str) -> None:
+        self._printer_name = printer_name
+        self._printer = None
+        self._handle = None
+        self.notifications = 0
+
+    def __enter__(self) -> "SpoolerNotifier":
+        try:
+            import win32print  # type: ignore
+
+            name = self._printer_name or win32print.GetDefaultPrinter()
+            self._printer = win32print.OpenPrinter(name)
+            self._handle = win32print.FindFirstPrinterChangeNotification(self._printer, PRINTER_CHANGE_JOB, 0, None)
+        except Exception:
+            logging.getLogger(__name__).debug("Spooler notifications unavailable for %s", self._printer_name, exc_info=True)
+            self._close()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._close()
+
+    @property
+    def active(self) -> bool:
+        return self._handle is not None
+
+    def wait(self, seconds: float, cancel: CancelToken) -> bool:
+        """Waits up to seconds for a queue change; returns True if one arrived."""
+        if self._handle is None:
+            cancel.wait(seconds)
+            return False
+        import win32event  # type: ignore
+        import win32print  # type: ignore
+
+        deadline = time.monotonic() + seconds
+        while True:
+            cancel.check()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            slice_ms = int(min(remaining, NOTIFY_SLICE_SECONDS) * 1000) or 1
+            if win32event.WaitForSingleObject(self._handle, slice_ms) == win32event.WAIT_OBJECT_0:
+                try:
+                    win32print.FindNextPrinterChangeNotification(self._handle, None)
+                except Exception:
+                    pass
+                self.notifications += 1
+                return True
+
+    def _close(self) -> None:
+        try:
+            import win32print  # type: ignore
+        except Exception:
+            return
+        if self._handle is not None:
+            try:
+                win32print.FindClosePrinterChangeNotification(self._handle)
+            except Exception:
+                pass
+            self._handle = None
+        if self._printer is not None:
+            try:
+                win32print.ClosePrinter(self._printer)
+            except Exception:
+                pass
+            self._printer = None
+
+
+def wait_until(
+    done: Callable[[], bool],
+    cancel: CancelToken,
+    timeout: float,
+    notifier: SpoolerNotifier | None = None,
+    initial_delay: float = 0.005,
+    max_delay: float = 0.25,
+    backoff: float = 1.6,
+) -> WaitResult:
+    """Polls done() with exponential backoff until it is true, the timeout passes or cancel fires.
+
+    done() is checked before the first sleep, so work that has already finished costs
+    nothing. With a notifier, a spooler change ends the current sleep early and the
+    backoff starts over.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    delay = initial_delay
+    polls = 0
+    while True:
+        polls += 1
+        if done():
+            return _result(True, started, polls, notifier)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return _result(False, started, polls, notifier)
+        pause = min(delay, remaining)
+        if notifier is not None and notifier.wait(pause, cancel):
+            delay = initial_delay
+            continue
+        if notifier is None:
+            cancel.wait(pause)
+        delay = min(max_delay, delay * backoff)
+
+
+def wait_for_print_queue(
+    label: str,
+    pending: Callable[[], bool],
+    cancel: CancelToken,
+    timeout: float,
+    printer_name: str = "",
+    notifications: bool = True,
+) -> WaitResult:
+    """Waits for an Office application to hand a document to the spooler and logs the wait.
+
+    Raises SpoolTimeoutError if it is still printing at the timeout: closing the document
+    then can cancel the background print, so the job must not be reported as printed,
+    and PrintOut has already run, so it must not be retried either.
+    """
+    logger = logging.getLogger(__name__)
+    if notifications:
+        with SpoolerNotifier(printer_name) as notifier:
+            result = wait_until(lambda: not pending(), cancel, timeout, notifier if notifier.active else None)
+    else:
+        result = wait_until(lambda: not pending(), cancel, timeout)
+    if result.completed:
+        logger.info(
+            "%s spooled after %.0f ms (%s polls, %s notifications)",
+            label,
+            result.seconds * 1000,
+            result.polls,
+            result.notifications,
+        )
+    else:
+        logger.warning("%s still printing after %.1f s; giving up", label, result.seconds)
+        raise SpoolTimeoutError(f"{label} が {timeout:g} 秒以内にスプーラーへ渡りませんでした。")
+    return result
+
+
+def _result(completed: bool, started: float, polls: int, notifier: SpoolerNotifier | None) -> WaitResult:
+    notifications = notifier.notifications if notifier is not None else 0
+    return WaitResult(completed, time.monotonic() - started, polls, notifications)
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from PySide6 import QtCore
+
+from app.backend.errors import UnsupportedSettingError
+from app.backend.printer_utils import printer_cache
+from app.model.print_job import DuplexMode, JobSettings, PrintJob
+
+PAPER_KEYS = ("A3", "A4", "A5", "B4", "B5", "LETTER", "LEGAL")
+
+
+def paper_key(name: str) -> str:
+    if not name:
+        return ""
+    normalized = name.replace(" ", "").replace("-", "").upper()
+    for key in PAPER_KEYS:
+        if key in normalized:
+            return key
+    return ""
+
+
+@dataclass
+class PrinterCapabilities:
+    name: str
+    papers: dict[str, int] = field(default_factory=dict)
+    duplex: bool = False
+    color: bool = False
+    max_dpi: int = 0
+    max_copies: int = 0
+    collate: bool = False
+
+    def paper_id(self, paper_name: str) -> int | None:
+        if not paper_name:
+            return None
+        if paper_name in self.papers:
+            return self.papers[paper_name]
+        key = paper_key(paper_name)
+        for name, paper_id in self.papers.items():
+            if key and paper_key(name) == key:
+                return paper_id
+        return None
+
+
+@dataclass
+class ResolvedPrintSettings:
+    printer_name: str
+    copies: int
+    duplex: DuplexMode
+    paper_size: str = ""
+    paper_key: str = ""
+    quality: str = ""
+    paper_id: int | None = None
+    collate: bool = False
+    max_dpi: int = 0
+    # Copies the driver makes by itself; 0 when unknown. Beyond it the application makes them.
+    max_copies: int = 0
+
+
+class CapabilityRegistry(QtCore.QObject):
+    capabilities_ready = QtCore.Signal(str)
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._capabilities: dict[str, PrinterCapabilities | None] = {}
+        self._pending: set[str] = set()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="printer-caps")
+        self._logger = logging.getLogger(__name__)
+
+    def get(self, printer_name: str) -> PrinterCapabilities | None:
+        with self._lock:
+            return self._capabilities.get(printer_name)
+
+    def prefetch(self, printer_names: Iterable[str]) -> None:
+        for name in printer_names:
+            if not name:
+                continue
+            with self._lock:
+                if name in self._capabilities or name in self._pending:
+                    continue
+                self._pending.add(name)
+            self._pool.submit(self.ensure, name)
+
+    def ensure(self, printer_name: str) -> PrinterCapabilities | None:
+        with self._lock:
+            if printer_name in self._capabilities:
+                return self._capabilities[printer_name]
+        capabilities = _query_capabilities(printer_name)
+        with self._lock:
+            self._capabilities[printer_name] = capabilities
+            self._pending.discard(printer_name)
+        if capabilities is not None:
+            self._logger.info(
+                "Capabilities for %s: papers=%s duplex=%s color=%s dpi=%s copies=%s collate=%s",
+                printer_name,
+                len(capabilities.papers),
+                capabilities.duplex,
+                capabilities.color,
+                capabilities.max_dpi,
+                capabilities.max_copies,
+                capabilities.collate,
+            )
+            self.capabilities_ready.emit(printer_name)
+        return capabilities
+
+    def invalidate(self, printer_name: str | None = None) -> None:
+        with self._lock:
+            if printer_name is None:
+                self._capabilities.clear()
+            else:
+                self._capabilities.pop(printer_name, None)
+
+    def resolve(
+        self,
+        job: PrintJob,
+        job_settings: JobSettings,
+        printer_name: str | None = None,
+    ) -> ResolvedPrintSettings:
+        name = job.printer_name if printer_name is None else printer_name
+        settings = ResolvedPrintSettings(
+            printer_name=name,
+            copies=job_settings.copies,
+            duplex=job_settings.duplex,
+            paper_size=job_settings.paper_size,
+            paper_key=paper_key(job_settings.paper_size),
+            quality=job_settings.quality,
+        )
+        # An empty name prints to the default printer, which is checked like any other.
+        device = name or printer_cache().default_printer()
+        capabilities = self.ensure(device) if device else None
+        if capabilities is None:
+            return settings
+        if settings.duplex != DuplexMode.OFF and not capabilities.duplex:
+            raise UnsupportedSettingError(f"プリンター {device} は両面印刷に対応していません。")
+        settings.max_copies = capabilities.max_copies
+        if capabilities.max_copies and settings.copies > capabilities.max_copies:
+            # Many drivers report 1 because they do not make copies in hardware; Office and the
+            # PDF worker then print the document once per copy instead.
+            self._logger.info(
+                "%s makes at most %s copies itself; %s copies are made by the application",
+                device,
+                capabilities.max_copies,
+                settings.copies,
+            )
+        if settings.paper_size:
+            settings.paper_id = capabilities.paper_id(settings.paper_size)
+            if settings.paper_id is None and capabilities.papers:
+                raise UnsupportedSettingError(f"プリンター {device} は用紙サイズ {settings.paper_size} に対応していません。")
+        settings.collate = capabilities.collate and settings.copies > 1
+        settings.max_dpi = capabilities.max_dpi
+        return settings
+
+
+def _query_capabilities(printer_name: str) -> PrinterCapabilities | None:
+    try:
+        import win32print  # type: ignore
+    except Exception:
+        return None
+
+    def capability(index: int):
+        try:
+            return win32print.DeviceCapabilities(printer_name, None, index)
+        except Exception:
+            return None
+
+    ids = capability(win32print.DC_PAPERS)
+    if not ids:
+        return None
+    names = capability(win32print.DC_PAPERNAMES) or []
+    papers = {}
+    for name, paper_id in zip(names, ids):
+        cleaned = str(name).strip()
+        if cleaned:
+            papers.setdefault(cleaned, int(paper_id))
+    resolutions = capability(win32print.DC_ENUMRESOLUTIONS) or []
+    max_dpi = 0
+    for item in resolutions:
+        if isinstance(item, dict):
+            max_dpi = max(max_dpi, int(item.get("xres", 0) or 0))
+        elif isinstance(item, (tuple, list)) and item:
+            max_dpi = max(max_dpi, int(item[0]))
+    return PrinterCapabilities(
+        name=printer_name,
+        papers=papers,
+        duplex=_positive(capability(win32print.DC_DUPLEX)) > 0,
+        color=_positive(capability(win32print.DC_COLORDEVICE)) > 0,
+        max_dpi=max_dpi,
+        max_copies=_positive(capability(win32print.DC_COPIES)),
+        collate=_positive(capability(win32print.DC_COLLATE)) > 0,
+    )
+
+
+def _positive(value) -> int:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+_registry: CapabilityRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def capability_registry() -> CapabilityRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = CapabilityRegistry()
+        return _registry
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from pathlib import Path
+
+from PySide6 import QtCore
+
+from app.backend.printer_utils import PrinterInfoCache
+
+
+def load_snapshot(path: Path) -> dict | None:
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(data, dict):
+        return None
+    return data
+
+
+def save_snapshot(path: Path, cache: PrinterInfoCache) -> None:
+    data = cache.snapshot()
+    data["saved_at"] = time.time()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    except Exception:
+        logging.getLogger(__name__).warning("Failed to save printer snapshot to %s", path)
+
+
+class PrinterDiscovery(QtCore.QThread):
+    discovered = QtCore.Signal(bool)
+
+    def __init__(self, cache: PrinterInfoCache, printer_names: list[str], parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self._cache = cache
+        self._printer_names = [name for name in printer_names if name]
+
+    def run(self) -> None:
+        started = time.monotonic()
+        changed = self._cache.refresh()
+        names = set(self._printer_names)
+        default_printer = self._cache.default_printer()
+        if default_printer:
+            names.add(default_printer)
+        for name in names:
+            before = self._cache.peek_paper_sizes(name)
+            self._cache.invalidate(name)
+            if self._cache.paper_sizes(name) != before:
+                changed = True
+        logging.getLogger(__name__).info(
+            "Printer discovery finished in %.2fs (changed=%s)", time.monotonic() - started, changed
+        )
+        self.discovered.emit(changed)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import abc
+import threading
+import time
+from dataclasses import dataclass, replace
+
+# PRINTER_STATUS_* flags from winspool.h
+_STATUS_PAUSED = 0x00000001
+_STATUS_ERROR = 0x00000002
+_STATUS_PAPER_JAM = 0x00000008
+_STATUS_PAPER_OUT = 0x00000010
+_STATUS_OFFLINE = 0x00000080
+_STATUS_NOT_AVAILABLE = 0x00001000
+_STATUS_NO_TONER = 0x00040000
+_STATUS_USER_INTERVENTION = 0x00100000
+_STATUS_DOOR_OPEN = 0x00400000
+_ATTRIBUTE_WORK_OFFLINE = 0x00000400
+
+
+@dataclass(frozen=True)
+class PrinterStatus:
+    name: str
+    queued_jobs: int = 0
+    queued_bytes: int = 0
+    offline: bool = False
+    error: bool = False
+    paper_out: bool = False
+    paused: bool = False
+    detail: str = ""
+
+    def has_problem(self) -> bool:
+        return self.offline or self.error or self.paper_out or self.paused
+
+    def describe(self) -> str:
+        if self.paper_out:
+            return "用紙切れ"
+        if self.offline:
+            return "オフライン"
+        if self.paused:
+            return "一時停止中"
+        if self.error:
+            return self.detail or "エラー"
+        return ""
+
+
+class PrinterStatusMonitor(abc.ABC):
+    @abc.abstractmethod
+    def status(self, printer_name: str) -> PrinterStatus:
+        ...
+
+
+class SpoolerStatusMonitor(PrinterStatusMonitor):
+    """Reads queue depth and problem flags from the Windows spooler, cached briefly per printer."""
+
+    def __init__(self, ttl: float = 0.5) -> None:
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._cache: dict[str, tuple[float, PrinterStatus]] = {}
+
+    def status(self, printer_name: str) -> PrinterStatus:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(printer_name)
+            if entry is not None and now - entry[0] < self._ttl:
+                return entry[1]
+        status = _query_status(printer_name)
+        with self._lock:
+            self._cache[printer_name] = (time.monotonic(), status)
+        return status
+
+
+class FakePrinterStatusMonitor(PrinterStatusMonitor):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._statuses: dict[str, PrinterStatus] = {}
+
+    def set_status(self, printer_name: str, **values) -> None:
+        with self._lock:
+            current = self._statuses.get(printer_name, PrinterStatus(printer_name))
+            self._statuses[printer_name] = replace(current, **values)
+
+    def status(self, printer_name: str) -> PrinterStatus:
+        with self._lock:
+            return self._statuses.get(printer_name, PrinterStatus(printer_name))
+
+
+def _query_status(printer_name: str) -> PrinterStatus:
+    try:
+        import win32print  # type: ignore
+    except Exception:
+        return PrinterStatus(printer_name)
+    handle = None
+    try:
+        handle = win32print.OpenPrinter(printer_name)
+        info = win32print.GetPrinter(handle, 2) or {}
+        jobs = info.get("cJobs", 0) or 0
+        queued_bytes = 0
+        if jobs:
+            try:
+                for job in win32print.EnumJobs(handle, 0, jobs, 2):
+                    queued_bytes += int(job.get("Size", 0) or 0)
+            except Exception:
+                pass
+    except Exception:
+        return PrinterStatus(printer_name)
+    finally:
+        if handle:
+            win32print.ClosePrinter(handle)
+    flags = int(info.get("Status", 0) or 0)
+    attributes = int(info.get("Attributes", 0) or 0)
+    detail = ""
+    if flags & _STATUS_PAPER_JAM:
+        detail = "紙詰まり"
+    elif flags & _STATUS_NO_TONER:
+        detail = "トナー切れ"
+    elif flags & _STATUS_DOOR_OPEN:
+        detail = "カバーが開いています"
+    elif flags & _STATUS_USER_INTERVENTION:
+        detail = "操作が必要です"
+    return PrinterStatus(
+        name=printer_name,
+        queued_jobs=int(jobs),
+        queued_bytes=queued_bytes,
+        offline=bool(flags & (_STATUS_OFFLINE | _STATUS_NOT_AVAILABLE) or attributes & _ATTRIBUTE_WORK_OFFLINE),
+        error=bool(flags & (_STATUS_ERROR | _STATUS_PAPER_JAM | _STATUS_NO_TONER | _STATUS_DOOR_OPEN | _STATUS_USER_INTERVENTION)),
+        paper_out=bool(flags & _STATUS_PAPER_OUT),
+        paused=bool(flags & _STATUS_PAUSED),
+        detail=detail,
+    )
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+from collections import Counter
 from typing import List
 
 import subprocess
+import threading
+import time
+
+from PySide6 import QtCore
 
 
 def _require_win32print():
@@ -75,6 +80,22 @@ def resolve_excel_printer_name(printer_name: str) -> str:
     return printer_name
 
 
+def get_queue_depth(printer_name: str) -> int:
+    if not printer_name:
+        return 0
+    win32print = _require_win32print()
+    handle = None
+    try:
+        handle = win32print.OpenPrinter(printer_name)
+        info = win32print.GetPrinter(handle, 2)
+        return int(info.get("cJobs", 0)) if info else 0
+    except Exception:
+        return 0
+    finally:
+        if handle:
+            win32print.ClosePrinter(handle)
+
+
 def set_default_printer(printer_name: str) -> bool:
     if not printer_name:
         return False
@@ -92,3 +113,170 @@ def set_default_printer(printer_name: str) -> bool:
                 except Exception:
                     return False
         return False
+
+
+class PrinterInfoCache(QtCore.QObject):
+    """TTL cache in front of the spooler queries used by the UI, job manager and backends."""
+
+    printers_changed = QtCore.Signal()
+
+    def __init__(
+        self,
+        printers_ttl: float = 30.0,
+        default_ttl: float = 10.0,
+        paper_ttl: float = 300.0,
+        port_ttl: float = 300.0,
+        parent: QtCore.QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._ttls = {
+            "printers": printers_ttl,
+            "default": default_ttl,
+            "paper": paper_ttl,
+            "port": port_ttl,
+        }
+        self._lock = threading.RLock()
+        self._entries: dict[tuple[str, str], tuple[float, object]] = {}
+        self._hits: Counter = Counter()
+        self._misses: Counter = Counter()
+        self._known_printers: tuple[str, ...] | None = None
+        self._known_default: str | None = None
+
+    def printers(self) -> List[str]:
+        return list(self._get("printers", "", self._query_printers))
+
+    def default_printer(self) -> str:
+        return self._get("default", "", self._query_default)
+
+    def paper_sizes(self, printer_name: str) -> list[str]:
+        if not printer_name:
+            return []
+        return list(self._get("paper", printer_name, lambda: tuple(_safe_paper_sizes(printer_name))))
+
+    def excel_printer_name(self, printer_name: str) -> str:
+        if not printer_name:
+            return ""
+        return self._get("port", printer_name, lambda: resolve_excel_printer_name(printer_name))
+
+    def invalidate(self, printer_name: str | None = None) -> None:
+        with self._lock:
+            if printer_name is None:
+                self._entries.clear()
+                return
+            for kind in ("paper", "port"):
+                self._entries.pop((kind, printer_name), None)
+            self._entries.pop(("default", ""), None)
+
+    def peek_paper_sizes(self, printer_name: str) -> list[str] | None:
+        with self._lock:
+            entry = self._entries.get(("paper", printer_name))
+        return None if entry is None else list(entry[1])
+
+    def seed(self, snapshot: dict) -> None:
+        printers = tuple(str(name) for name in snapshot.get("printers", []) if name)
+        default = str(snapshot.get("default_printer", "") or "")
+        papers = snapshot.get("paper_sizes", {})
+        now = time.monotonic()
+        with self._lock:
+            self._entries[("printers", "")] = (now, printers)
+            self._entries[("default", "")] = (now, default)
+            if isinstance(papers, dict):
+                for name, sizes in papers.items():
+                    if name in printers and isinstance(sizes, list):
+                        self._entries[("paper", name)] = (now, tuple(str(size) for size in sizes))
+            self._known_printers = printers
+            self._known_default = default
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            printers = self._known_printers or ()
+            return {
+                "printers": list(printers),
+                "default_printer": self._known_default or "",
+                "paper_sizes": {
+                    key: list(value)
+                    for (kind, key), (_, value) in self._entries.items()
+                    if kind == "paper" and key in printers
+                },
+            }
+
+    def refresh(self) -> bool:
+        with self._lock:
+            self._entries.pop(("printers", ""), None)
+            self._entries.pop(("default", ""), None)
+            before = (self._known_printers, self._known_default)
+        try:
+            self.printers()
+        except Exception:
+            pass
+        self.default_printer()
+        return before != (self._known_printers, self._known_default)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                kind: {"hits": self._hits[kind], "misses": self._misses[kind]}
+                for kind in self._ttls
+            }
+
+    def _get(self, kind: str, key: str, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is not None and now - entry[0] < self._ttls[kind]:
+                self._hits[kind] += 1
+                return entry[1]
+            self._misses[kind] += 1
+        value = loader()
+        with self._lock:
+            self._entries[(kind, key)] = (time.monotonic(), value)
+        return value
+
+    def _query_printers(self) -> tuple[str, ...]:
+        printers = tuple(list_printers())
+        self._note_change(printers=printers)
+        return printers
+
+    def _query_default(self) -> str:
+        try:
+            default = get_default_printer_name()
+        except Exception:
+            default = ""
+        self._note_change(default=default)
+        return default
+
+    def _note_change(self, printers: tuple[str, ...] | None = None, default: str | None = None) -> None:
+        changed = False
+        with self._lock:
+            if printers is not None:
+                if self._known_printers is not None and printers != self._known_printers:
+                    for name in set(self._known_printers) - set(printers):
+                        self._entries.pop(("paper", name), None)
+                        self._entries.pop(("port", name), None)
+                    changed = True
+                self._known_printers = printers
+            if default is not None:
+                if self._known_default is not None and default != self._known_default:
+                    changed = True
+                self._known_default = default
+        if changed:
+            self.printers_changed.emit()
+
+
+def _safe_paper_sizes(printer_name: str) -> list[str]:
+    try:
+        return list_paper_sizes(printer_name)
+    except Exception:
+        return []
+
+
+_printer_cache: PrinterInfoCache | None = None
+_printer_cache_lock = threading.Lock()
+
+
+def printer_cache() -> PrinterInfoCache:
+    global _printer_cache
+    with _printer_cache_lock:
+        if _printer_cache is None:
+            _printer_cache = PrinterInfoCache()
+        return _printer_cache
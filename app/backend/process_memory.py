@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import time
+
+# PROCESS_QUERY_LIMITED_INFORMATION
+_QUERY_ACCESS = 0x1000
+
+
+def peak_memory(pid: int) -> int:
+    """Peak working set of a running process in bytes, or 0 when it cannot be read."""
+    try:
+        import win32api  # type: ignore
+        import win32process  # type: ignore
+    except Exception:
+        return _proc_peak_memory(pid)
+    try:
+        handle = win32api.OpenProcess(_QUERY_ACCESS, False, pid)
+    except Exception:
+        return 0
+    try:
+        return int(win32process.GetProcessMemoryInfo(handle)["PeakWorkingSetSize"])
+    except Exception:
+        return 0
+    finally:
+        win32api.CloseHandle(handle)
+
+
+def _proc_peak_memory(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+class PeakMemorySampler:
+    """Tracks the peak memory of a worker and the processes it drives, sampled while they run."""
+
+    def __init__(self, interval: float = 0.25) -> None:
+        self._interval = interval
+        self._last_sample = 0.0
+        self._peaks: dict[int, int] = {}
+
+    @property
+    def peak(self) -> int:
+        return sum(self._peaks.values())
+
+    def sample(self, *pids: int | None, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_sample < self._interval:
+            return
+        self._last_sample = now
+        for pid in pids:
+            if pid:
+                self._peaks[pid] = max(self._peaks.get(pid, 0), peak_memory(pid))
@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import abc
+import getpass
+import importlib.util
+import itertools
+import logging
+import platform
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable
+
+# JOB_STATUS_* flags from winspool.h
+JOB_STATUS_PAUSED = 0x00000001
+JOB_STATUS_ERROR = 0x00000002
+JOB_STATUS_DELETING = 0x00000004
+JOB_STATUS_SPOOLING = 0x00000008
+JOB_STATUS_PRINTING = 0x00000010
+JOB_STATUS_PRINTED = 0x00000080
+JOB_STATUS_DELETED = 0x00000100
+JOB_STATUS_BLOCKED_DEVQ = 0x00000200
+JOB_STATUS_COMPLETE = 0x00001000
+
+OUTCOME_PRINTED = "printed"
+OUTCOME_DELETED = "deleted"
+OUTCOME_ERROR = "error"
+OUTCOME_UNTRACKED = "untracked"
+OUTCOME_TIMEOUT = "timeout"
+
+
+@dataclass(frozen=True)
+class SpoolJobInfo:
+    job_id: int
+    document: str = ""
+    status: int = 0
+    total_pages: int = 0
+    pages_printed: int = 0
+    size: int = 0
+    user: str = ""
+    machine: str = ""
+
+
+class SpoolQueue(abc.ABC):
+    def available(self) -> bool:
+        return True
+
+    @abc.abstractmethod
+    def jobs(self, printer_name: str) -> list[SpoolJobInfo]:
+        ...
+
+
+class Win32SpoolQueue(SpoolQueue):
+    def available(self) -> bool:
+        try:
+            return importlib.util.find_spec("win32print") is not None
+        except (ImportError, ValueError):
+            return False
+
+    def jobs(self, printer_name: str) -> list[SpoolJobInfo]:
+        try:
+            import win32print  # type: ignore
+        except Exception:
+            return []
+        handle = None
+        try:
+            handle = win32print.OpenPrinter(printer_name)
+            entries = win32print.EnumJobs(handle, 0, -1, 2)
+        except Exception:
+            return []
+        finally:
+            if handle:
+                win32print.ClosePrinter(handle)
+        return [
+            SpoolJobInfo(
+                job_id=int(entry.get("JobId", 0)),
+                document=str(entry.get("pDocument", "") or ""),
+                status=int(entry.get("Status", 0) or 0),
+                total_pages=int(entry.get("TotalPages", 0) or 0),
+                pages_printed=int(entry.get("PagesPrinted", 0) or 0),
+                size=int(entry.get("Size", 0) or 0),
+                user=str(entry.get("pUserName", "") or ""),
+                machine=str(entry.get("pMachineName", "") or ""),
+            )
+            for entry in entries
+        ]
+
+
+class FakeSpoolQueue(SpoolQueue):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._queues: dict[str, dict[int, SpoolJobInfo]] = {}
+
+    def add_job(
+        self,
+        printer_name: str,
+        document: str,
+        pages: int = 1,
+        status: int = JOB_STATUS_SPOOLING,
+        user: str = "",
+        machine: str = "",
+    ) -> int:
+        with self._lock:
+            job_id = next(self._ids)
+            info = SpoolJobInfo(job_id, document, status, pages, user=user, machine=machine)
+            self._queues.setdefault(printer_name, {})[job_id] = info
+            return job_id
+
+    def update_job(self, printer_name: str, job_id: int, **values) -> None:
+        with self._lock:
+            queue = self._queues.get(printer_name, {})
+            if job_id in queue:
+                queue[job_id] = replace(queue[job_id], **values)
+
+    def remove_job(self, printer_name: str, job_id: int) -> None:
+        with self._lock:
+            self._queues.get(printer_name, {}).pop(job_id, None)
+
+    def jobs(self, printer_name: str) -> list[SpoolJobInfo]:
+        with self._lock:
+            return list(self._queues.get(printer_name, {}).values())
+
+
+@dataclass
+class SpoolRecord:
+    job_id: str
+    printer_name: str
+    document: str
+    submitted_at: float
+    known_ids: frozenset[int] = frozenset()
+    spooled_at: float | None = None
+    printing_at: float | None = None
+    finished_at: float | None = None
+    spool_job_id: int | None = None
+    pages: int = 0
+    pages_printed: int = 0
+    outcome: str = ""
+    deleting: bool = False
+    handed_off_at: float | None = None
+    busy_seconds: float = 0.0
+
+    def latency(self) -> float | None:
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.submitted_at
+
+
+@dataclass
+class _PrinterStats:
+    jobs: int = 0
+    pages: int = 0
+    busy_seconds: float = 0.0
+    total_latency: float = 0.0
+    outcomes: dict[str, int] = field(default_factory=dict)
+
+
+class SpoolTracker:
+    """Follows the spooler jobs created by our prints until they are printed, deleted or fail.
+
+    begin() notes the jobs already queued on the printer before the backend runs; after the
+    backend returns, handed_off() starts watching for the new spooler job. Only a new job with
+    our document name (and our user and machine, where the spooler reports them) is claimed;
+    one that does not turn up within match_timeout is reported as untracked. A background
+    thread polls the queues and calls on_finished(record) once the job leaves the spooler.
+    """
+
+    def __init__(
+        self,
+        queue: SpoolQueue | None = None,
+        on_finished: Callable[[SpoolRecord], None] | None = None,
+        poll_interval: float = 0.5,
+        match_timeout: float = 2.0,
+        track_timeout: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+        user: str | None = None,
+        machine: str | None = None,
+    ) -> None:
+        self._queue = queue or Win32SpoolQueue()
+        self._user = (_current_user() if user is None else user).casefold()
+        self._machine = (platform.node() if machine is None else machine).lstrip("\\").casefold()
+        self._available = self._queue.available()
+        self._on_finished = on_finished
+        self._poll_interval = poll_interval
+        self._match_timeout = match_timeout
+        self._track_timeout = track_timeout
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._records: list[SpoolRecord] = []
+        self._stats: dict[str, _PrinterStats] = {}
+        self._last_finished: dict[str, float] = {}
+        self._closed = False
+        self._logger = logging.getLogger(__name__)
+        self._thread = threading.Thread(target=self._run, name="spool-tracker", daemon=True)
+        self._thread.start()
+
+    def begin(self, job_id: str, printer_name: str, document: str) -> SpoolRecord:
+        known = frozenset(info.job_id for info in self._jobs(printer_name))
+        return SpoolRecord(job_id, printer_name, document, self._clock(), known)
+
+    def handed_off(self, record: SpoolRecord) -> None:
+        record.handed_off_at = self._clock()
+        if not self._available:
+            self._finish(record, OUTCOME_UNTRACKED, record.handed_off_at)
+            self._report(record)
+            return
+        with self._condition:
+            self._records.append(record)
+            self._condition.notify_all()
+
+    def pending(self, printer_name: str | None = None) -> int:
+        """Our jobs still being followed, on one printer or on all of them."""
+        with self._condition:
+            if printer_name is None:
+                return len(self._records)
+            return sum(1 for record in self._records if record.printer_name == printer_name)
+
+    def abandon(self) -> list[SpoolRecord]:
+        with self._condition:
+            records, self._records = self._records, []
+        return records
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._condition:
+            return {
+                printer: {
+                    "jobs": stats.jobs,
+                    "pages": stats.pages,
+                    "avg_latency_s": stats.total_latency / stats.jobs if stats.jobs else 0.0,
+                    "pages_per_minute": stats.pages * 60.0 / stats.busy_seconds if stats.busy_seconds else 0.0,
+                    **stats.outcomes,
+                }
+                for printer, stats in self._stats.items()
+            }
+
+    def poll(self) -> None:
+        with self._condition:
+            records = list(self._records)
+        by_printer: dict[str, list[SpoolRecord]] = {}
+        for record in records:
+            by_printer.setdefault(record.printer_name, []).append(record)
+        finished = []
+        for printer_name, printer_records in by_printer.items():
+            current = {info.job_id: info for info in self._jobs(printer_name)}
+            now = self._clock()
+            claimed = {record.spool_job_id for record in printer_records if record.spool_job_id is not None}
+            for record in printer_records:
+                if record.spool_job_id is None:
+                    info = self._match(record, current, claimed)
+                    if info is None:
+                        if now - record.handed_off_at >= self._match_timeout:
+                            self._finish(record, OUTCOME_UNTRACKED, now)
+                            finished.append(record)
+                        continue
+                    record.spool_job_id = info.job_id
+                    claimed.add(info.job_id)
+                if self._observe(record, current.get(record.spool_job_id), now):
+                    finished.append(record)
+        if not finished:
+            return
+        done = {id(record) for record in finished}
+        with self._condition:
+            self._records = [record for record in self._records if id(record) not in done]
+        for record in finished:
+            self._report(record)
+
+    def _match(self, record: SpoolRecord, current: dict[int, SpoolJobInfo], claimed: set[int]) -> SpoolJobInfo | None:
+        candidates = [
+            info for job_id, info in sorted(current.items())
+            if job_id not in record.known_ids and job_id not in claimed
+        ]
+        document = record.document.casefold()
+        if not document:
+            return None
+        for info in candidates:
+            # Another client's job on a shared printer must not be taken for ours.
+            if self._user and info.user and info.user.casefold() != self._user:
+                continue
+            if self._machine and info.machine and info.machine.lstrip("\\").casefold() != self._machine:
+                continue
+            if document in info.document.casefold():
+                return info
+        return None
+
+    def _observe(self, record: SpoolRecord, info: SpoolJobInfo | None, now: float) -> bool:
+        if info is None:
+            # The job left the queue; unless we saw it being deleted, it was printed.
+            self._finish(record, OUTCOME_DELETED if record.deleting else OUTCOME_PRINTED, now)
+            return True
+        record.pages = max(record.pages, info.total_pages)
+        record.pages_printed = max(record.pages_printed, info.pages_printed)
+        if record.spooled_at is None and not info.status & JOB_STATUS_SPOOLING:
+            record.spooled_at = now
+        if record.printing_at is None and info.status & JOB_STATUS_PRINTING:
+            record.printing_at = now
+        if info.status & (JOB_STATUS_DELETING | JOB_STATUS_DELETED):
+            record.deleting = True
+        if info.status & (JOB_STATUS_ERROR | JOB_STATUS_BLOCKED_DEVQ):
+            self._finish(record, OUTCOME_ERROR, now)
+            return True
+        if info.status & (JOB_STATUS_PRINTED | JOB_STATUS_COMPLETE):
+            self._finish(record, OUTCOME_PRINTED, now)
+            return True
+        if now - record.submitted_at >= self._track_timeout:
+            self._finish(record, OUTCOME_TIMEOUT, now)
+            return True
+        return False
+
+    def _finish(self, record: SpoolRecord, outcome: str, now: float) -> None:
+        record.outcome = outcome
+        record.finished_at = now
+        if record.spooled_at is None:
+            record.spooled_at = record.handed_off_at
+        if outcome == OUTCOME_PRINTED:
+            record.pages_printed = max(record.pages_printed, record.pages)
+
+    def _report(self, record: SpoolRecord) -> None:
+        with self._condition:
+            stats = self._stats.setdefault(record.printer_name, _PrinterStats())
+            stats.outcomes[record.outcome] = stats.outcomes.get(record.outcome, 0) + 1
+            if record.outcome == OUTCOME_PRINTED and record.spool_job_id is not None:
+                started = max(
+                    record.printing_at or record.spooled_at,
+                    self._last_finished.get(record.printer_name, 0.0),
+                )
+                record.busy_seconds = max(0.0, record.finished_at - started)
+                stats.jobs += 1
+                stats.pages += record.pages_printed
+                stats.busy_seconds += record.busy_seconds
+                stats.total_latency += record.latency()
+                self._last_finished[record.printer_name] = record.finished_at
+        self._logger.info(
+            "Spool job %s on %s: %s | spooled %.1fs printed %.1fs pages %s",
+            record.spool_job_id,
+            record.printer_name,
+            record.outcome,
+            record.spooled_at - record.submitted_at,
+            record.latency(),
+            record.pages_printed,
+        )
+        if self._on_finished is not None:
+            try:
+                self._on_finished(record)
+            except Exception:
+                self._logger.exception("Spool completion handler failed")
+
+    def _jobs(self, printer_name: str) -> list[SpoolJobInfo]:
+        try:
+            return self._queue.jobs(printer_name)
+        except Exception:
+            self._logger.debug("Spool queue query failed for %s", printer_name, exc_info=True)
+            return []
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._records and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            self.poll()
+            with self._condition:
+                if not self._closed:
+                    self._condition.wait(self._poll_interval)
+
+
+def _current_user() -> str:
+    try:
+        return getpass.getuser()
+    except Exception:
+        return ""
@@ -1,40 +1,81 @@
 from __future__ import annotations
 
 import gc
-import time
+from pathlib import Path
+from typing import Callable
 
 from app.app_context import AppContext
 from app.model.print_job import PrintJob
+from app.backend.errors import (
+    OFFICE_DEPENDENCY_SUMMARY,
+    FileMissingError,
+    MissingDependencyError,
+    PrinterUnavailableError,
+)
+from app.backend.cancel_token import CancelToken
+from app.backend.printer_capabilities import ResolvedPrintSettings
+from app.backend.print_wait import wait_for_print_queue
 
 
 class WordBackend:
-    def __init__(self, context: AppContext) -> None:
+    SPOOL_TIMEOUT_SECONDS = 30.0
+
+    def __init__(self, context: AppContext, timeouts: dict[str, float] | None = None) -> None:
         self._context = context
+        self._spool_timeout = (timeouts or {}).get("spool", self.SPOOL_TIMEOUT_SECONDS)
 
-    def print(self, job: PrintJob) -> None:
+    def print(
+        self,
+        job: PrintJob,
+        settings: ResolvedPrintSettings,
+        cancel: CancelToken | None = None,
+        stage: Callable[..., None] | None = None,
+    ) -> None:
+        cancel = cancel or CancelToken()
+        stage = stage or (lambda _name, server=None: None)
+        if not Path(job.file_path).exists():
+            raise FileMissingError("ファイルが見つかりません。")
         try:
             import pythoncom  # type: ignore
             import win32com.client  # type: ignore
         except Exception as exc:
-            raise RuntimeError("Word 印刷には pywin32 が必要です。") from exc
+            raise MissingDependencyError("Word 印刷には pywin32 が必要です。", OFFICE_DEPENDENCY_SUMMARY) from exc
 
         pythoncom.CoInitialize()
         app = None
         doc = None
         try:
+            stage("launch")
             app = win32com.client.DispatchEx("Word.Application")
             app.Visible = False
             if hasattr(app, "DisplayAlerts"):
                 app.DisplayAlerts = False
+            # Passing the application lets a supervising worker identify the server process.
+            stage("open", server=app)
             doc = app.Documents.Open(job.file_path, ReadOnly=True)
-            if job.printer_name:
-                app.ActivePrinter = job.printer_name
-            paper_const = _word_paper_constant(job.paper_size, win32com.client.constants)
+            cancel.check()
+            if settings.printer_name:
+                try:
+                    app.ActivePrinter = settings.printer_name
+                except Exception as exc:
+                    raise PrinterUnavailableError(f"プリンターを指定できません: {settings.printer_name}") from exc
+            paper_const = _word_paper_constant(settings.paper_key, win32com.client.constants)
             if paper_const is not None:
                 doc.PageSetup.PaperSize = paper_const
-            doc.PrintOut(Copies=job.copies, Background=False)
-            _wait_for_print_queue(app)
+            cancel.check()
+            stage("print")
+            doc.PrintOut(Copies=settings.copies, Background=False)
+            stage("spool")
+            wait_for_print_queue(
+                f"Word {job.file_name}",
+                lambda: _printing(app),
+                cancel,
+                self._spool_timeout,
+                settings.printer_name,
+                self._context.settings.spool_wait_notifications,
+            )
         finally:
+            stage("close")
             if doc is not None:
                 doc.Close(False)
             if app is not None:
@@ -47,31 +88,24 @@ class WordBackend:
             pythoncom.CoUninitialize()
 
 
-def _wait_for_print_queue(app) -> None:
-    if hasattr(app, "BackgroundPrintingStatus"):
-        for _ in range(300):
-            if app.BackgroundPrintingStatus == 0:
-                break
-            time.sleep(0.1)
+def _printing(app) -> bool:
+    return bool(getattr(app, "BackgroundPrintingStatus", 0))
+
+
+_WORD_PAPER_CONSTANTS = {
+    "A3": ["wdPaperA3"],
+    "A4": ["wdPaperA4"],
+    "A5": ["wdPaperA5"],
+    "B4": ["wdPaperB4"],
+    "B5": ["wdPaperB5", "wdPaperB5JIS"],
+    "LETTER": ["wdPaperLetter"],
+    "LEGAL": ["wdPaperLegal"],
+}
 
 
-def _word_paper_constant(name: str, constants) -> int | None:
-    if not name:
-        return None
-    normalized = name.replace(" ", "").replace("-", "").upper()
-    mapping = {
-        "A3": ["wdPaperA3"],
-        "A4": ["wdPaperA4"],
-        "A5": ["wdPaperA5"],
-        "B4": ["wdPaperB4"],
-        "B5": ["wdPaperB5", "wdPaperB5JIS"],
-        "LETTER": ["wdPaperLetter"],
-        "LEGAL": ["wdPaperLegal"],
-    }
-    for key, candidates in mapping.items():
-        if key in normalized:
-            for candidate in candidates:
-                value = getattr(constants, candidate, None)
-                if value is not None:
-                    return value
+def _word_paper_constant(key: str, constants) -> int | None:
+    for candidate in _WORD_PAPER_CONSTANTS.get(key, []):
+        value = getattr(constants, candidate, None)
+        if value is not None:
+            return value
     return None
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+ANY_PRINTER = "*"
+
+# What each stage's duration grows with: nothing, the file size or the number of pages.
+STAGE_BASIS = {
+    "start": "fixed",
+    "launch": "fixed",
+    "open": "bytes",
+    "print": "pages",
+    "spool": "pages",
+    "close": "fixed",
+}
+
+# Seconds per unit assumed until a backend/printer has history.
+DEFAULT_SECONDS_PER_UNIT = {
+    "start": 10.0,
+    "launch": 20.0,
+    "open": 10.0,
+    "print": 5.0,
+    "spool": 2.0,
+    "close": 10.0,
+}
+
+MIN_SAMPLES = 3
+_BYTES_PER_UNIT = 1024 * 1024
+
+
+@dataclass
+class _Estimate:
+    # Smoothed seconds per unit and its mean deviation, as in TCP's retransmission timer.
+    mean: float = 0.0
+    deviation: float = 0.0
+    samples: int = 0
+
+    def add(self, value: float) -> None:
+        if not self.samples:
+            self.mean = value
+            self.deviation = value / 2
+        else:
+            self.deviation = 0.75 * self.deviation + 0.25 * abs(value - self.mean)
+            self.mean = 0.875 * self.mean + 0.125 * value
+        self.samples += 1
+
+
+def stage_units(stage: str, pages: int, size: int) -> float:
+    basis = STAGE_BASIS.get(stage, "fixed")
+    # The leading 1 stands in for the fixed cost every document has.
+    if basis == "pages":
+        return 1.0 + max(0, pages)
+    if basis == "bytes":
+        return 1.0 + max(0, size) / _BYTES_PER_UNIT
+    return 1.0
+
+
+class AdaptiveTimeouts:
+    """Per-job stage timeouts from the job size and the durations seen in past runs.
+
+    Each successful print records how long every stage took per unit of work (pages,
+    megabytes or nothing), per backend and printer and per backend across printers. A
+    timeout is the units of the job times the smoothed rate plus four deviations, times
+    the safety factor, clamped to the floor and ceiling. Until a key has MIN_SAMPLES
+    the defaults in DEFAULT_SECONDS_PER_UNIT are used instead.
+    """
+
+    def __init__(
+        self,
+        history: dict | None = None,
+        safety_factor: float = 2.0,
+        floor: float = 30.0,
+        ceiling: float = 1800.0,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._estimates: dict[tuple[str, str, str], _Estimate] = {}
+        self.configure(safety_factor, floor, ceiling)
+        self._load(history or {})
+
+    def configure(self, safety_factor: float, floor: float, ceiling: float) -> None:
+        with self._lock:
+            self._safety_factor = max(1.0, safety_factor)
+            self._floor = max(1.0, floor)
+            self._ceiling = max(self._floor, ceiling)
+
+    def timeouts(self, backend: str, printer: str, pages: int, size: int) -> dict[str, float]:
+        with self._lock:
+            result = {}
+            for stage, default in DEFAULT_SECONDS_PER_UNIT.items():
+                estimate = self._lookup(backend, printer, stage)
+                rate = estimate.mean + 4 * estimate.deviation if estimate else default
+                budget = stage_units(stage, pages, size) * rate * self._safety_factor
+                result[stage] = min(self._ceiling, max(self._floor, budget))
+            return result
+
+    def record(self, backend: str, printer: str, durations: dict[str, float], pages: int, size: int) -> None:
+        with self._lock:
+            for stage, seconds in durations.items():
+                if stage not in STAGE_BASIS or seconds < 0:
+                    continue
+                rate = seconds / stage_units(stage, pages, size)
+                for key in ((backend, printer, stage), (backend, ANY_PRINTER, stage)):
+                    self._estimates.setdefault(key, _Estimate()).add(rate)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            history: dict[str, dict] = {}
+            for (backend, printer, stage), estimate in self._estimates.items():
+                history.setdefault(backend, {}).setdefault(printer, {})[stage] = {
+                    "mean": round(estimate.mean, 4),
+                    "deviation": round(estimate.deviation, 4),
+                    "samples": estimate.samples,
+                }
+            return history
+
+    def _lookup(self, backend: str, printer: str, stage: str) -> _Estimate | None:
+        for key in ((backend, printer, stage), (backend, ANY_PRINTER, stage)):
+            estimate = self._estimates.get(key)
+            if estimate is not None and estimate.samples >= MIN_SAMPLES:
+                return estimate
+        return None
+
+    def _load(self, history: dict) -> None:
+        for backend, printers in history.items():
+            if not isinstance(printers, dict):
+                continue
+            for printer, stages in printers.items():
+                if not isinstance(stages, dict):
+                    continue
+                for stage, values in stages.items():
+                    try:
+                        estimate = _Estimate(
+                            float(values["mean"]), float(values["deviation"]), int(values["samples"])
+                        )
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    self._estimates[(str(backend), str(printer), str(stage))] = estimate
+
+
+class StageTimer:
+    """Stage callback for the backends that measures how long each stage took."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._stage: str | None = None
+        self._started = 0.0
+        self._durations: dict[str, float] = {}
+
+    def __call__(self, name: str, server=None) -> None:
+        self.finish()
+        self._stage = name
+        self._started = self._clock()
+
+    def finish(self) -> None:
+        if self._stage is not None:
+            elapsed = self._clock() - self._started
+            self._durations[self._stage] = self._durations.get(self._stage, 0.0) + elapsed
+            self._stage = None
+
+    def durations(self) -> dict[str, float]:
+        return dict(self._durations)
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+
+KNOB_DPI = "dpi"
+KNOB_QUEUE_DEPTH = "queue_depth"
+KNOBS = (KNOB_DPI, KNOB_QUEUE_DEPTH)
+
+DPI_STEPS = (150, 200, 300, 400, 600)
+# A trial must beat the baseline by this much to be kept; smaller differences are noise.
+MIN_GAIN = 0.05
+# Above this CPU use or share of the memory budget the host has no headroom left.
+MAX_LOAD = 0.85
+MAX_CHANGES = 50
+
+
+@dataclass
+class TuningChange:
+    at: str
+    printer: str
+    knob: str
+    old: int
+    new: int
+    reason: str
+
+
+@dataclass
+class PrinterTuning:
+    # 0 means not tuned: the DPI follows the print quality and the depth the global setting.
+    dpi: int = 0
+    queue_depth: int = 0
+    baseline_ppm: float = 0.0
+    # The knob under trial and the value to go back to if it does not pay off.
+    trial_knob: str = ""
+    trial_previous: int = 0
+    next_knob: int = 0
+    directions: dict[str, int] = field(default_factory=lambda: {KNOB_DPI: -1, KNOB_QUEUE_DEPTH: 1})
+    pages: float = 0.0
+    seconds: float = 0.0
+    cpu: float = 0.0
+    memory: float = 0.0
+    changes: list[dict] = field(default_factory=list)
+
+
+class Autotuner:
+    """Tunes render DPI and spooler look-ahead per printer from the throughput of past runs.
+
+    Each printer alternates between a baseline measurement and a trial that moves one
+    knob a step. Observations are pooled until they cover min_pages pages. A trial is
+    kept if pages per minute improved by MIN_GAIN with CPU and memory headroom to
+    spare; otherwise the knob goes back and the next trial tries the other direction.
+    The DPI never drops below min_dpi (or the requested DPI if that is lower). Without
+    headroom the only trial is a lower DPI, kept if throughput holds.
+    """
+
+    def __init__(
+        self,
+        state: dict | None = None,
+        min_dpi: int = 300,
+        max_queue_depth: int = 8,
+        default_queue_depth: int = 4,
+        min_pages: int = 20,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._printers: dict[str, PrinterTuning] = {}
+        self._min_pages = min_pages
+        self._logger = logging.getLogger(__name__)
+        self.configure(min_dpi, max_queue_depth, default_queue_depth)
+        self._load(state or {})
+
+    def configure(self, min_dpi: int, max_queue_depth: int, default_queue_depth: int) -> None:
+        with self._lock:
+            self._min_dpi = min_dpi
+            self._max_queue_depth = max(1, max_queue_depth)
+            self._default_queue_depth = default_queue_depth
+
+    def render_dpi(self, printer: str, requested: int) -> int:
+        with self._lock:
+            tuning = self._printers.get(printer)
+            if tuning is None or not tuning.dpi:
+                return requested
+            return max(min(requested, tuning.dpi), min(requested, self._min_dpi))
+
+    def queue_depth(self, printer: str) -> int:
+        with self._lock:
+            tuning = self._printers.get(printer)
+            if tuning is None or not tuning.queue_depth:
+                return self._default_queue_depth
+            return tuning.queue_depth
+
+    def observe(self, printer: str, pages: float, seconds: float, cpu: float, memory: float) -> list[TuningChange]:
+        """Adds one run's measurements for a printer; returns the changes it led to."""
+        if pages <= 0 or seconds <= 0:
+            return []
+        with self._lock:
+            tuning = self._printers.setdefault(printer, PrinterTuning())
+            tuning.cpu = max(tuning.cpu, cpu)
+            tuning.memory = max(tuning.memory, memory)
+            tuning.pages += pages
+            tuning.seconds += seconds
+            if tuning.pages < self._min_pages:
+                return []
+            ppm = tuning.pages * 60.0 / tuning.seconds
+            headroom = tuning.cpu < MAX_LOAD and tuning.memory < MAX_LOAD
+            load = f"CPU {tuning.cpu:.0%}、メモリ {tuning.memory:.0%}"
+            tuning.pages = tuning.seconds = tuning.cpu = tuning.memory = 0.0
+            if tuning.trial_knob:
+                changes = [self._decide(printer, tuning, ppm, headroom, load)]
+                return [change for change in changes if change is not None]
+            tuning.baseline_ppm = ppm
+            change = self._start_trial(printer, tuning, headroom, load)
+            return [change] if change is not None else []
+
+    def changes(self) -> list[TuningChange]:
+        with self._lock:
+            result = [
+                TuningChange(**change) for tuning in self._printers.values() for change in tuning.changes
+            ]
+        return sorted(result, key=lambda change: change.at, reverse=True)
+
+    def current(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                printer: {KNOB_DPI: tuning.dpi, KNOB_QUEUE_DEPTH: tuning.queue_depth}
+                for printer, tuning in self._printers.items()
+            }
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {printer: asdict(tuning) for printer, tuning in self._printers.items()}
+
+    def _decide(
+        self, printer: str, tuning: PrinterTuning, ppm: float, headroom: bool, load: str
+    ) -> TuningChange | None:
+        knob = tuning.trial_knob
+        value = self._value(tuning, knob)
+        previous = tuning.trial_previous
+        tuning.trial_knob = ""
+        measured = f"{tuning.baseline_ppm:.1f} → {ppm:.1f} ページ/分"
+        if headroom:
+            keep = ppm >= tuning.baseline_ppm * (1 + MIN_GAIN)
+        else:
+            # Short of headroom, shedding load without losing throughput is worth keeping.
+            keep = self._lowers_load(knob, previous, value) and ppm >= tuning.baseline_ppm * (1 - MIN_GAIN)
+        if keep:
+            # Keep going the same way with this knob next time.
+            tuning.next_knob = KNOBS.index(knob)
+            return self._record(printer, tuning, knob, previous, value, f"採用: {measured}（{load}）")
+        self._set_value(tuning, knob, previous)
+        tuning.directions[knob] = -tuning.directions[knob]
+        reason = "負荷が高すぎます" if not headroom else "改善しませんでした"
+        return self._record(printer, tuning, knob, value, previous, f"元に戻しました: {reason}、{measured}（{load}）")
+
+    def _start_trial(self, printer: str, tuning: PrinterTuning, headroom: bool, load: str) -> TuningChange | None:
+        candidates = [KNOBS[(tuning.next_knob + offset) % len(KNOBS)] for offset in range(len(KNOBS))]
+        if not headroom:
+            # Only shed load; a lower DPI is the one knob that does.
+            candidates = [KNOB_DPI]
+            tuning.directions[KNOB_DPI] = -1
+        for knob in candidates:
+            current = self._value(tuning, knob)
+            target = self._step(knob, current, tuning.directions[knob])
+            if target is None and headroom:
+                tuning.directions[knob] = -tuning.directions[knob]
+                target = self._step(knob, current, tuning.directions[knob])
+            if target is None:
+                continue
+            tuning.next_knob = (KNOBS.index(knob) + 1) % len(KNOBS)
+            tuning.trial_knob = knob
+            tuning.trial_previous = self._stored(tuning, knob)
+            self._set_value(tuning, knob, target)
+            reason = f"試行: 基準 {tuning.baseline_ppm:.1f} ページ/分（{load}）"
+            return self._record(printer, tuning, knob, current, target, reason)
+        return None
+
+    def _step(self, knob: str, current: int, direction: int) -> int | None:
+        if knob == KNOB_DPI:
+            allowed = [dpi for dpi in DPI_STEPS if dpi >= self._min_dpi]
+            lower = [dpi for dpi in allowed if dpi < current]
+            higher = [dpi for dpi in allowed if dpi > current]
+            if direction < 0:
+                return lower[-1] if lower else None
+            return higher[0] if higher else None
+        if self._default_queue_depth <= 0:
+            # An unlimited spooler queue is left alone.
+            return None
+        target = current + direction
+        return target if 1 <= target <= self._max_queue_depth else None
+
+    def _value(self, tuning: PrinterTuning, knob: str) -> int:
+        if knob == KNOB_DPI:
+            return tuning.dpi or DPI_STEPS[-1]
+        return tuning.queue_depth or self._default_queue_depth
+
+    def _stored(self, tuning: PrinterTuning, knob: str) -> int:
+        return tuning.dpi if knob == KNOB_DPI else tuning.queue_depth
+
+    def _set_value(self, tuning: PrinterTuning, knob: str, value: int) -> None:
+        if knob == KNOB_DPI:
+            tuning.dpi = value
+        else:
+            tuning.queue_depth = value
+
+    def _lowers_load(self, knob: str, previous: int, value: int) -> bool:
+        return knob == KNOB_DPI and value < (previous or DPI_STEPS[-1])
+
+    def _record(
+        self, printer: str, tuning: PrinterTuning, knob: str, old: int, new: int, reason: str
+    ) -> TuningChange:
+        change = TuningChange(dt.datetime.now().isoformat(timespec="seconds"), printer, knob, old, new, reason)
+        tuning.changes = (tuning.changes + [asdict(change)])[-MAX_CHANGES:]
+        self._logger.info("Autotune %s: %s %s -> %s (%s)", printer, knob, old, new, reason)
+        return change
+
+    def _load(self, state: dict) -> None:
+        for printer, values in state.items():
+            if not isinstance(values, dict):
+                continue
+            try:
+                tuning = PrinterTuning(**values)
+            except TypeError:
+                continue
+            self._printers[str(printer)] = tuning
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class _BreakerState:
+    failures: int = 0
+    opened_at: float | None = None
+
+
+class CircuitBreaker:
+    """Per-printer breaker that opens after consecutive printer faults.
+
+    While open, the printer is unavailable; after the cooldown it is offered again so
+    that one job can probe it. A success closes the breaker, a failure reopens it.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 3,
+        cooldown: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._threshold = max(1, threshold)
+        self._cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._states: dict[str, _BreakerState] = {}
+
+    def available(self, printer_name: str) -> bool:
+        with self._lock:
+            state = self._states.get(printer_name)
+            if state is None or state.opened_at is None:
+                return True
+            return self._clock() - state.opened_at >= self._cooldown
+
+    def is_open(self, printer_name: str) -> bool:
+        with self._lock:
+            state = self._states.get(printer_name)
+            return state is not None and state.opened_at is not None
+
+    def record_success(self, printer_name: str) -> None:
+        with self._lock:
+            self._states.pop(printer_name, None)
+
+    def record_failure(self, printer_name: str) -> bool:
+        """Returns True when this failure opened (or reopened) the breaker."""
+        with self._lock:
+            state = self._states.setdefault(printer_name, _BreakerState())
+            state.failures += 1
+            if state.opened_at is not None or state.failures >= self._threshold:
+                state.opened_at = self._clock()
+                return True
+            return False
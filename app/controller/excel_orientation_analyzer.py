@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import gc
+import os
 from dataclasses import dataclass
 
 from PySide6 import QtCore
 
+from app.controller.resource_governor import estimate_job_memory, resource_governor
 from app.model.print_job import PrintJob
 
 
@@ -33,6 +35,11 @@ class ExcelOrientationAnalyzer(QtCore.QThread):
             return
 
         results: list[ExcelOrientationResult] = []
+        # One Excel instance opens the workbooks in turn, so the largest one sets the peak.
+        largest = max((_file_size(job.file_path) for job in self._jobs), default=0)
+        reservation = resource_governor().acquire(
+            "excel-orientation", "excel", estimate_job_memory("excel", "", largest)
+        )
         pythoncom.CoInitialize()
         try:
             app = win32com.client.DispatchEx("Excel.Application")
@@ -86,5 +93,13 @@ class ExcelOrientationAnalyzer(QtCore.QThread):
         finally:
             gc.collect()
             pythoncom.CoUninitialize()
+            resource_governor().release(reservation)
 
         self.completed.emit(results)
+
+
+def _file_size(file_path: str) -> int:
+    try:
+        return os.stat(file_path).st_size
+    except OSError:
+        return 0
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List
+
+from PySide6 import QtCore
+
+from app.controller.folder_walker import FolderWalker, WalkFilter
+from app.model.print_job import PrintJob, FileType
+
+
+class FileIngestor(QtCore.QThread):
+    chunk_ready = QtCore.Signal(list)
+    progress = QtCore.Signal(int, int)
+    finished_ingest = QtCore.Signal(bool)
+
+    CHUNK_SIZE = 500
+    FLUSH_INTERVAL = 0.2
+
+    def __init__(
+        self,
+        sources: List[str],
+        existing_paths: set[str],
+        build_job: Callable[[str, FileType], PrintJob],
+        detect_file_type: Callable[[str], FileType],
+        walk_filter: WalkFilter | None = None,
+        parent: QtCore.QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._sources = list(sources)
+        self._walker = FolderWalker(walk_filter)
+        self._seen = set(existing_paths)
+        self._build_job = build_job
+        self._detect_file_type = detect_file_type
+        self._cancel_requested = False
+        self._logger = logging.getLogger(__name__)
+
+    def request_cancel(self) -> None:
+        self._cancel_requested = True
+
+    def run(self) -> None:
+        scanned = 0
+        added = 0
+        chunk: List[PrintJob] = []
+        last_flush = time.monotonic()
+        started = last_flush
+        for path in self._iter_paths(self._sources):
+            if self._cancel_requested:
+                break
+            scanned += 1
+            normalized = str(Path(path))
+            if normalized in self._seen:
+                continue
+            self._seen.add(normalized)
+            file_type = self._detect_file_type(normalized)
+            if file_type == FileType.UNKNOWN:
+                continue
+            chunk.append(self._build_job(normalized, file_type))
+            now = time.monotonic()
+            if len(chunk) >= self.CHUNK_SIZE or now - last_flush >= self.FLUSH_INTERVAL:
+                added += len(chunk)
+                self.chunk_ready.emit(chunk)
+                self.progress.emit(scanned, added)
+                chunk = []
+                last_flush = now
+        if chunk and not self._cancel_requested:
+            added += len(chunk)
+            self.chunk_ready.emit(chunk)
+        self.progress.emit(scanned, added)
+        self._logger.info(
+            "Ingested %s files (%s added) in %.2fs%s",
+            scanned,
+            added,
+            time.monotonic() - started,
+            " (cancelled)" if self._cancel_requested else "",
+        )
+        self.finished_ingest.emit(self._cancel_requested)
+
+    def _iter_paths(self, sources: Iterable[str]) -> Iterator[str]:
+        for source in sources:
+            if self._cancel_requested:
+                return
+            if Path(source).is_dir():
+                yield from self._walker.walk(source, lambda: self._cancel_requested)
+            else:
+                yield source
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+import stat
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Tuple
+
+_HIDDEN_ATTRIBUTES = getattr(stat, "FILE_ATTRIBUTE_HIDDEN", 0x2) | getattr(stat, "FILE_ATTRIBUTE_SYSTEM", 0x4)
+
+
+@dataclass
+class WalkFilter:
+    extensions: Tuple[str, ...] = ()
+    exclude_patterns: Tuple[str, ...] = ()
+    max_depth: int = 0
+    skip_hidden: bool = True
+    min_size: int = 0
+    max_size: int = 0
+
+    def __post_init__(self) -> None:
+        self.extensions = tuple(ext.lower() for ext in self.extensions)
+        self.exclude_patterns = tuple(pattern.lower() for pattern in self.exclude_patterns)
+
+    def accepts_extension(self, name: str) -> bool:
+        if not self.extensions:
+            return True
+        return os.path.splitext(name)[1].lower() in self.extensions
+
+    def is_excluded(self, name: str) -> bool:
+        lowered = name.lower()
+        return any(fnmatch.fnmatchcase(lowered, pattern) for pattern in self.exclude_patterns)
+
+    def accepts_size(self, size: int) -> bool:
+        if self.min_size and size < self.min_size:
+            return False
+        if self.max_size and size > self.max_size:
+            return False
+        return True
+
+    @property
+    def needs_stat(self) -> bool:
+        return bool(self.min_size or self.max_size)
+
+
+class FolderWalker:
+    def __init__(self, walk_filter: WalkFilter | None = None, max_workers: int = 8) -> None:
+        self._filter = walk_filter or WalkFilter()
+        self._max_workers = max(1, max_workers)
+
+    def walk(self, root: str, cancelled: Callable[[], bool] | None = None) -> Iterator[str]:
+        """Yields files depth-first in name order, the same order on every walk.
+
+        Subfolders are scanned in parallel ahead of the output; results are held until
+        their turn comes.
+        """
+        cancelled = cancelled or (lambda: False)
+        with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="walker") as pool:
+            pending: list[Future] = [pool.submit(self._scan, root, 1)]
+            try:
+                while pending:
+                    files, subdirs = pending.pop().result()
+                    if cancelled():
+                        return
+                    children = [pool.submit(self._scan, path, depth) for path, depth in subdirs]
+                    pending.extend(reversed(children))
+                    yield from files
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _scan(self, directory: str, depth: int) -> Tuple[List[str], List[Tuple[str, int]]]:
+        files: List[str] = []
+        subdirs: List[Tuple[str, int]] = []
+        walk_filter = self._filter
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if walk_filter.is_excluded(name):
+                        continue
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if not is_dir and not entry.is_file(follow_symlinks=False):
+                            continue
+                        if walk_filter.skip_hidden and _is_hidden(entry):
+                            continue
+                        if is_dir:
+                            if not walk_filter.max_depth or depth < walk_filter.max_depth:
+                                subdirs.append((entry.path, depth + 1))
+                            continue
+                        if not walk_filter.accepts_extension(name):
+                            continue
+                        if walk_filter.needs_stat and not walk_filter.accepts_size(entry.stat().st_size):
+                            continue
+                    except OSError:
+                        continue
+                    files.append(entry.path)
+        except OSError:
+            pass
+        files.sort(key=_sort_key)
+        subdirs.sort(key=lambda subdir: _sort_key(subdir[0]))
+        return files, subdirs
+
+
+def _sort_key(path: str) -> str:
+    return os.path.basename(path).casefold()
+
+
+def _is_hidden(entry: os.DirEntry) -> bool:
+    if sys.platform == "win32":
+        # On Windows the attributes come with the directory listing, so this stat is free.
+        attributes = getattr(entry.stat(follow_symlinks=False), "st_file_attributes", 0)
+        return bool(attributes & _HIDDEN_ATTRIBUTES)
+    return entry.name.startswith(".")
@@ -1,95 +1,751 @@
 from __future__ import annotations
 
+import itertools
 import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import replace
+from typing import Iterable, Iterator
 
 from PySide6 import QtCore
 
 from app.app_context import AppContext
+from app.controller.adaptive_timeouts import StageTimer
+from app.controller.circuit_breaker import CircuitBreaker
 from app.controller.job_manager import JobManager
-from app.model.print_job import PrintJob, FileType, JobStatus
-from app.backend.pdf_backend import PdfBackend
+from app.controller.printer_pool import estimate_pages, pool_name
+from app.controller.resource_governor import MemoryReservation, estimate_job_memory, resource_governor
+from app.controller.rule_compiler import pdf_page_count
+from app.controller.status_batcher import StatusBatcher
+from app.model.print_job import PrintJob, FileType, JobSettings, JobStatus
+from app.backend.pdf_backend import PdfBackend, render_dpi
 from app.backend.word_backend import WordBackend
 from app.backend.excel_backend import ExcelBackend
 from app.backend.ppt_backend import PptBackend
+from app.backend.office_process import OfficeProcessBackend
+from app.backend.cancel_token import CancelToken
+from app.backend.host_load import cpu_busy_since, cpu_times
+from app.backend.errors import PrinterUnavailableError, classify
+from app.backend.printer_capabilities import ResolvedPrintSettings, capability_registry
+from app.backend.printer_status import PrinterStatus, PrinterStatusMonitor, SpoolerStatusMonitor
+from app.backend.printer_utils import printer_cache
+from app.backend.spool_tracker import (
+    OUTCOME_DELETED,
+    OUTCOME_ERROR,
+    OUTCOME_PRINTED,
+    OUTCOME_TIMEOUT,
+    SpoolQueue,
+    SpoolRecord,
+    SpoolTracker,
+)
+
+_OFFICE_KINDS = {
+    FileType.WORD: "word",
+    FileType.EXCEL: "excel",
+    FileType.PPT: "ppt",
+}
 
 
 class JobExecutor(QtCore.QThread):
-    job_status = QtCore.Signal(str, object, str)
-    progress = QtCore.Signal(int, int, str)
-    job_failed = QtCore.Signal(str)
+    """Long-lived print service fed through submit() and stream().
+
+    Jobs can be submitted, reprioritized, edited and withdrawn from the GUI thread while the
+    executor is printing. finished_all is emitted each time the work submitted so far
+    has been printed (or cancelled) and the executor goes idle.
+
+    stream() hands over an iterator over the job store instead of a list; the executor
+    pulls from it on its own thread, so a large batch is never loaded on the GUI thread.
+    """
+
     finished_all = QtCore.Signal(bool)
 
+    IDLE_POLL_SECONDS = 0.2
+    # Jobs whose page count is estimated per pass, so a large submission does not delay the first print.
+    ESTIMATE_BATCH = 32
+    # Jobs pulled from a stream at a time, so a cancel is noticed while a large batch loads.
+    FEED_CHUNK = 500
+    # Streamed jobs kept queued ahead of the printer under a windowed (arrival-order) policy.
+    LOOKAHEAD = 500
+    MAX_BACKOFF_SECONDS = 60.0
+
     def __init__(
         self,
         context: AppContext,
         job_manager: JobManager,
-        jobs_override: list[PrintJob] | None = None,
+        status_monitor: PrinterStatusMonitor | None = None,
+        spool_queue: SpoolQueue | None = None,
     ) -> None:
         super().__init__()
         self._context = context
         self._job_manager = job_manager
-        self._jobs_override = list(jobs_override) if jobs_override is not None else None
+        self._condition = threading.Condition()
+        self._scheduler = job_manager.create_scheduler()
+        # Jobs owned by the executor: queued, printing, held in a lane or waiting to retry.
+        self._active: set[str] = set()
+        # Streamed jobs not pulled yet, and how many of the announced ones have not arrived.
+        self._feed: Iterator[PrintJob] | None = None
+        self._feed_left = 0
+        # Ids taken on in this batch; a stream skips them so nothing is printed twice.
+        self._taken: set[str] = set()
+        self._withdrawn: set[str] = set()
+        # Saved copies of jobs edited while printing, held in a lane or waiting to retry.
+        self._edited: dict[str, PrintJob] = {}
+        self._current: str | None = None
+        self._current_token: CancelToken | None = None
+        self._cancel_requested_at: float | None = None
+        self._busy = False
+        self._stopping = False
         self._cancel_requested = False
+        self._batch_cancelled = False
+        self._status_monitor = status_monitor or SpoolerStatusMonitor()
+        self._spool_queue = spool_queue
+        self._tracker: SpoolTracker | None = None
+        # Jobs held back per printer while it reports a problem or a job waits to retry, kept in
+        # submission order. The last field is the monotonic time the job may run again.
+        self._lanes: dict[str, deque[tuple[PrintJob, JobSettings, str, float]]] = {}
+        self._completed = 0
+        self._total = 0
+        self._attempts: dict[str, int] = {}
+        self._history_changed = False
+        # Per lane in the current batch, for the autotuner: pages the spooler reported printed,
+        # when the first job started and when the last printed job left the spooler.
+        self._lane_runs: dict[str, list[float]] = {}
+        self._cpu_mark: tuple[float, float] | None = None
+        self._breaker = CircuitBreaker(
+            context.settings.breaker_failure_threshold,
+            context.settings.breaker_cooldown_seconds,
+        )
         self._logger = logging.getLogger(__name__)
+        self.updates = StatusBatcher(parent=self)
+
+    def submit(self, jobs: Iterable[PrintJob]) -> int:
+        added = 0
+        with self._condition:
+            self._renew_scheduler()
+            for job in jobs:
+                if job.id in self._active:
+                    continue
+                self._withdrawn.discard(job.id)
+                self._active.add(job.id)
+                self._taken.add(job.id)
+                self._scheduler.push(job)
+                added += 1
+            if added:
+                self._total += added
+                self._busy = True
+                self._condition.notify_all()
+        if added:
+            self._logger.info("Queued %s jobs (%s pending, %s policy)", added, len(self._scheduler), self._scheduler.policy.name)
+        return added
+
+    def stream(self, jobs: Iterator[PrintJob], count: int) -> int:
+        """Queues the jobs an iterator yields; count is how many it is expected to yield.
+
+        A stream handed over while another is still being read follows it.
+        """
+        if count <= 0:
+            return 0
+        with self._condition:
+            self._renew_scheduler()
+            self._feed = jobs if self._feed is None else itertools.chain(self._feed, jobs)
+            self._feed_left += count
+            self._total += count
+            self._busy = True
+            self._condition.notify_all()
+        self._logger.info("Streaming %s jobs (%s policy)", count, self._scheduler.policy.name)
+        return count
+
+    def withdraw(self, job_ids: Iterable[str]) -> list[str]:
+        withdrawn = []
+        with self._condition:
+            for job_id in job_ids:
+                if job_id not in self._active:
+                    if self._feed is not None:
+                        # Not pulled from the stream yet; skip it when it comes.
+                        self._taken.add(job_id)
+                    continue
+                if job_id == self._current and self._current_token is not None:
+                    # Interrupt the backend; the job is reported as cancelled when it stops.
+                    self._current_token.cancel()
+                    continue
+                if self._scheduler.remove(job_id) is not None:
+                    self._active.discard(job_id)
+                    self._total -= 1
+                    withdrawn.append(job_id)
+                else:
+                    # Held in a lane or waiting for a retry; the executor drops it when it gets there.
+                    self._withdrawn.add(job_id)
+            self._condition.notify_all()
+        for job_id in withdrawn:
+            self.updates.post(job_id, JobStatus.CANCELLED, "キャンセルしました")
+        return withdrawn
+
+    def reprioritize(self, priorities: dict[str, int]) -> None:
+        with self._condition:
+            for job_id, priority in priorities.items():
+                self._scheduler.reprioritize(job_id, priority)
+
+    def update(self, jobs: Iterable[PrintJob]) -> None:
+        """Takes the saved copy of jobs whose printer or settings were edited after submit().
+
+        The job store can hand out a different object than the one queued here, so
+        edits are passed in rather than picked up from a shared object.
+        """
+        with self._condition:
+            for job in jobs:
+                if job.id not in self._active or self._scheduler.update(job):
+                    continue
+                # Printing, held in a lane or waiting to retry: used from its next attempt on.
+                self._edited[job.id] = job
+
+    def is_active(self, job_id: str) -> bool:
+        with self._condition:
+            return job_id in self._active
+
+    def is_busy(self) -> bool:
+        with self._condition:
+            return self._busy
+
+    def total(self) -> int:
+        with self._condition:
+            return self._total
 
     def request_cancel(self) -> None:
-        self._cancel_requested = True
+        with self._condition:
+            if self._busy:
+                self._cancel_requested = True
+                self._cancel_requested_at = self._cancel_requested_at or time.monotonic()
+                if self._current_token is not None:
+                    self._current_token.cancel()
+            self._condition.notify_all()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopping = True
+            self._cancel_requested = True
+            self._condition.notify_all()
+        self.wait()
 
     def run(self) -> None:
-        jobs = self._jobs_override if self._jobs_override is not None else [
-            job for job in self._job_manager.jobs() if job.enabled
-        ]
-        total = len(jobs)
-        completed = 0
-        cancelled = False
-
-        for job in jobs:
+        self._tracker = SpoolTracker(self._spool_queue, on_finished=self._on_spool_finished)
+        try:
+            while True:
+                job = self._next_job()
+                if job is None:
+                    break
+                self._process(job)
+                with self._condition:
+                    self._current = None
+        finally:
+            self._cancel_batch()
+            self._tracker.close()
+
+    def _next_job(self) -> PrintJob | None:
+        while True:
             if self._cancel_requested:
-                cancelled = True
-                self._mark_remaining_as_cancelled(job, jobs)
-                break
-            self.job_status.emit(job.id, JobStatus.PRINTING, "")
-            self.progress.emit(completed, total, job.file_name)
+                self._cancel_batch()
+            self._drain_lanes()
+            self._refill()
+            self._estimate_pages()
+            with self._condition:
+                if self._stopping:
+                    return None
+                job = self._scheduler.pop()
+                if job is not None:
+                    self._current = job.id
+                    return job
+                if self._scheduler:
+                    # The rest still wait for a page estimate.
+                    continue
+                idle = self._feed is None and not self._lanes and not self._tracker.pending()
+                if not idle:
+                    self._condition.wait(self.IDLE_POLL_SECONDS)
+                    continue
+                if not self._busy:
+                    self._condition.wait()
+                    continue
+            self._finish_batch()
+
+    def _renew_scheduler(self) -> None:
+        if not self._scheduler and self._feed is None:
+            # Policy changes take effect once the queue has run dry.
+            self._scheduler = self._job_manager.create_scheduler()
+
+    def _refill(self) -> None:
+        """Moves streamed jobs into the scheduler, reading the store outside the lock."""
+        while not self._cancel_requested:
+            with self._condition:
+                feed = self._feed
+                room = self.FEED_CHUNK
+                if self._scheduler.policy.windowed:
+                    room = min(room, self.LOOKAHEAD - len(self._scheduler))
+            if feed is None or room <= 0:
+                return
+            jobs = list(itertools.islice(feed, room))
+            with self._condition:
+                for job in jobs:
+                    if job.id in self._taken or job.id in self._active:
+                        continue
+                    self._taken.add(job.id)
+                    self._active.add(job.id)
+                    self._scheduler.push(job)
+                    self._feed_left -= 1
+                if not jobs and self._feed is feed:
+                    # Jobs removed or unchecked before they were reached never arrive.
+                    self._total -= self._feed_left
+                    self._feed = None
+                    self._feed_left = 0
+
+    def _estimate_pages(self) -> None:
+        with self._condition:
+            scheduler = self._scheduler
+            jobs = scheduler.unsized(self.ESTIMATE_BATCH)
+        if not jobs:
+            return
+        # Opening the documents happens here, on the executor thread, without the lock held.
+        pages = {job.id: scheduler.estimate(job) for job in jobs}
+        with self._condition:
+            for job_id, count in pages.items():
+                scheduler.set_pages(job_id, count)
+
+    def _process(self, job: PrintJob) -> None:
+        job = self._latest(job)
+        try:
+            job_settings = self._job_manager.resolve_job_settings(job)
+            printer_name = self._dispatch_printer(job, job_settings.copies)
+        except Exception as exc:
+            self._fail(job, exc)
+            return
+        self._submit(job, job_settings, printer_name)
+
+    def _cancel_batch(self) -> None:
+        with self._condition:
+            feed, self._feed, self._feed_left = self._feed, None, 0
+            taken = set(self._taken)
+            cancelled = [job.id for job in self._scheduler.drain()]
+            for lane in self._lanes.values():
+                cancelled.extend(job.id for job, *_ in lane)
+            self._lanes.clear()
+            self._active.difference_update(cancelled)
+            self._withdrawn.clear()
+            self._edited.clear()
+            self._cancel_requested = False
+            requested_at, self._cancel_requested_at = self._cancel_requested_at, None
+            self._batch_cancelled = self._batch_cancelled or bool(cancelled) or self._busy
+        if feed is not None:
+            cancelled.extend(job.id for job in feed if job.id not in taken)
+        for job_id in cancelled:
+            self._attempts.pop(job_id, None)
+            self.updates.post(job_id, JobStatus.CANCELLED, "キャンセルしました")
+        for record in self._tracker.abandon():
+            self.updates.post(record.job_id, JobStatus.SUCCESS, "スプール済み（印刷完了は未確認）")
+        if cancelled:
+            self._logger.info("Cancelled %s queued jobs", len(cancelled))
+        if requested_at is not None:
+            self._logger.info("Cancel took effect after %.0f ms", (time.monotonic() - requested_at) * 1000)
 
+    def _finish_batch(self) -> None:
+        for printer, stats in self._tracker.stats().items():
+            self._logger.info("Spooler stats for %s: %s", printer, stats)
+        self._logger.info("Memory governor stats: %s", resource_governor().snapshot())
+        with self._condition:
+            runs = {lane: run for lane, run in self._lane_runs.items() if run[0] > 0}
+            self._lane_runs.clear()
+        if self._context.settings.autotune_enabled and runs:
+            self._autotune(runs)
+        self._cpu_mark = None
+        if self._history_changed:
+            self._history_changed = False
+            self._context.save_print_history(self._job_manager.adaptive_timeouts.to_dict())
+        with self._condition:
+            if self._scheduler or self._feed is not None or self._lanes or self._tracker.pending():
+                # submit() ran while the stats were written; the batch goes on.
+                return
+            cancelled = self._batch_cancelled
+            self._taken.clear()
+            self._busy = False
+            self._batch_cancelled = False
+            self._total = 0
+            self._completed = 0
+        self.finished_all.emit(cancelled)
+
+    def _release(self, job_id: str) -> None:
+        with self._condition:
+            self._active.discard(job_id)
+            self._edited.pop(job_id, None)
+
+    def _latest(self, job: PrintJob) -> PrintJob:
+        with self._condition:
+            return self._edited.pop(job.id, job)
+
+    def _consume_withdrawn(self, job: PrintJob) -> bool:
+        with self._condition:
+            if job.id not in self._withdrawn:
+                return False
+            self._withdrawn.discard(job.id)
+            self._active.discard(job.id)
+            self._edited.pop(job.id, None)
+            self._total -= 1
+        self._attempts.pop(job.id, None)
+        self.updates.post(job.id, JobStatus.CANCELLED, "キャンセルしました")
+        return True
+
+    def _submit(self, job: PrintJob, job_settings: JobSettings, printer_name: str) -> None:
+        if self._consume_withdrawn(job):
+            return
+        printer_name = self._reroute(job, printer_name)
+        lane = self._lane_name(printer_name)
+        if self._lanes.get(lane) or not self._breaker.available(lane) or not self._ready(lane):
+            self._defer(job, job_settings, printer_name, lane)
+            return
+        self._print(job, job_settings, printer_name)
+
+    def _print(self, job: PrintJob, job_settings: JobSettings, printer_name: str) -> None:
+        token = None
+        started = time.monotonic()
+        if self._cpu_mark is None:
+            self._cpu_mark = cpu_times()
+        self.updates.post(job.id, JobStatus.PRINTING)
+        self.updates.post_progress(self._completed, self._total, job.file_name)
+        try:
+            self._logger.info(
+                "Printing %s | printer=%s copies=%s duplex=%s",
+                job.file_path,
+                printer_name or "default",
+                job_settings.copies,
+                job_settings.duplex.value,
+            )
+            if job_settings.paper_size:
+                self._logger.info("Paper size: %s", job_settings.paper_size)
+            settings = capability_registry().resolve(job, job_settings, printer_name)
+            lane = self._lane_name(printer_name)
+            settings = self._tuned(job, settings, lane)
+            pages, size = self._job_size(job, settings.copies)
+            timeouts = self._timeouts_for(job, lane, pages, size)
+            backend = self._resolve_backend(job, timeouts)
+            record = self._tracker.begin(job.id, lane, job.file_name)
+            token = self._begin_job(job)
+            timer = StageTimer()
+            reservation = None
             try:
-                self._logger.info(
-                    "Printing %s | printer=%s copies=%s duplex=%s",
-                    job.file_path,
-                    job.printer_name or "default",
-                    job.copies,
-                    job.duplex.value,
-                )
-                if job.paper_size:
-                    self._logger.info("Paper size: %s", job.paper_size)
-                backend = self._resolve_backend(job)
-                backend.print(job)
-                self.job_status.emit(job.id, JobStatus.SUCCESS, "")
-            except Exception as exc:
-                self._logger.exception("Print failed for %s", job.file_path)
-                message = str(exc) or "予期しないエラーが発生しました。"
-                self.job_status.emit(job.id, JobStatus.FAILED, message)
-                self.job_failed.emit(job.id)
+                reservation = self._reserve_memory(job, settings, size, token)
+                backend.print(job, settings, token, timer)
             finally:
-                completed += 1
-                self.progress.emit(completed, total, job.file_name)
+                if reservation is not None:
+                    resource_governor().release(reservation, getattr(backend, "peak_memory", 0))
+                with self._condition:
+                    self._current = None
+                    self._current_token = None
+            timer.finish()
+            self._record_durations(job, lane, timer.durations(), pages, size)
+            self.updates.post(job.id, JobStatus.PRINTING, "プリンターで印刷中")
+            self._tracker.handed_off(record)
+        except Exception as exc:
+            if token is not None and token.cancelled:
+                self._finish_cancelled(job, token)
+            else:
+                self._handle_failure(job, job_settings, printer_name, exc)
+            return
+        self._breaker.record_success(lane)
+        with self._condition:
+            self._lane_runs.setdefault(lane, [0.0, started, started])
+        self._attempts.pop(job.id, None)
+        self._release(job.id)
+        self._completed += 1
+        self.updates.post_progress(self._completed, self._total, job.file_name)
 
-        self.finished_all.emit(cancelled)
+    def _tuned(self, job: PrintJob, settings: ResolvedPrintSettings, lane: str) -> ResolvedPrintSettings:
+        if not self._context.settings.autotune_enabled or job.file_type != FileType.PDF:
+            return settings
+        requested = render_dpi(settings)
+        dpi = self._job_manager.autotuner.render_dpi(lane, requested)
+        if dpi == requested:
+            return settings
+        return replace(settings, max_dpi=dpi)
+
+    def _autotune(self, runs: dict[str, list[float]]) -> None:
+        governor = resource_governor()
+        cpu = cpu_busy_since(self._cpu_mark)
+        memory = governor.take_peak() / max(1, governor.budget)
+        tuner = self._job_manager.autotuner
+        for lane, (pages, started, finished) in runs.items():
+            tuner.observe(lane, pages, finished - started, cpu, memory)
+        self._context.save_autotune_state(tuner.to_dict())
+
+    def _job_size(self, job: PrintJob, copies: int) -> tuple[int, int]:
+        counter = pdf_page_count if job.file_type == FileType.PDF else None
+        try:
+            size = os.stat(job.file_path).st_size
+        except OSError:
+            size = 0
+        return estimate_pages(job.file_path, counter) * max(1, copies), size
+
+    def _timeouts_for(self, job: PrintJob, lane: str, pages: int, size: int) -> dict[str, float] | None:
+        if not self._context.settings.adaptive_timeouts_enabled:
+            return None
+        timeouts = self._job_manager.adaptive_timeouts.timeouts(_backend_key(job), lane, pages, size)
+        self._logger.debug(
+            "Timeouts for %s (%s pages, %s bytes): %s",
+            job.file_name,
+            pages,
+            size,
+            ", ".join(f"{stage}={seconds:.0f}s" for stage, seconds in timeouts.items()),
+        )
+        return timeouts
+
+    def _record_durations(self, job: PrintJob, lane: str, durations: dict[str, float], pages: int, size: int) -> None:
+        if not durations:
+            return
+        self._job_manager.adaptive_timeouts.record(_backend_key(job), lane, durations, pages, size)
+        self._history_changed = True
+
+    def _reserve_memory(
+        self, job: PrintJob, settings: ResolvedPrintSettings, size: int, token: CancelToken
+    ) -> MemoryReservation:
+        kind = _backend_key(job)
+        dpi = render_dpi(settings) if job.file_type == FileType.PDF else 0
+        held = []
+
+        def on_wait(needed: int, budget: int) -> None:
+            held.append(needed)
+            self.updates.post(job.id, JobStatus.WAITING, "メモリの空きを待っています")
+
+        reservation = resource_governor().acquire(
+            job.id, kind, estimate_job_memory(kind, job.file_path, size, dpi), token, on_wait
+        )
+        if held:
+            self.updates.post(job.id, JobStatus.PRINTING)
+        return reservation
 
-    def _resolve_backend(self, job: PrintJob):
+    def _begin_job(self, job: PrintJob) -> CancelToken:
+        token = CancelToken()
+        with self._condition:
+            self._current = job.id
+            self._current_token = token
+            if self._cancel_requested:
+                token.cancel()
+        return token
+
+    def _finish_cancelled(self, job: PrintJob, token: CancelToken) -> None:
+        self._logger.info("Cancelled %s; backend stopped after %.0f ms", job.file_name, token.latency() * 1000)
+        self._attempts.pop(job.id, None)
+        self._release(job.id)
+        self.updates.post(job.id, JobStatus.CANCELLED, "キャンセルしました")
+        self._completed += 1
+        self.updates.post_progress(self._completed, self._total, job.file_name)
+
+    def _handle_failure(self, job: PrintJob, job_settings: JobSettings, printer_name: str, exc: Exception) -> None:
+        error = classify(exc)
+        lane = self._lane_name(printer_name)
+        attempts = self._attempts[job.id] = self._attempts.get(job.id, 0) + 1
+        if error.printer_fault and self._breaker.record_failure(lane):
+            self._logger.warning("Circuit breaker opened for %s: %s", lane, error.summary)
+        limit = max(1, self._context.settings.retry_max_attempts)
+        if not error.transient or attempts >= limit or self._cancel_requested:
+            self._fail(job, error)
+            return
+        if not self._breaker.available(lane):
+            # The printer is out of service: send the job to the fallback printer or hold it.
+            if self._fallback_for(lane):
+                self._submit(job, job_settings, printer_name)
+            else:
+                self._defer(job, job_settings, printer_name, lane, front=True)
+            return
+        delay = min(self.MAX_BACKOFF_SECONDS, self._context.settings.retry_backoff_seconds * 2 ** (attempts - 1))
+        self._logger.warning(
+            "Retrying %s in %.1fs (attempt %s/%s): %s", job.file_name, delay, attempts + 1, limit, error
+        )
+        # The job waits at the head of its printer's lane, so other printers keep working meanwhile.
+        self._defer(
+            job,
+            job_settings,
+            printer_name,
+            lane,
+            time.monotonic() + delay,
+            f"{delay:.0f} 秒後に再試行します（{attempts + 1}/{limit} 回目）",
+            front=True,
+        )
+
+    def _fail(self, job: PrintJob, exc: Exception) -> None:
+        error = classify(exc)
+        self._logger.error("Print failed for %s", job.file_path, exc_info=exc)
+        self._attempts.pop(job.id, None)
+        self._release(job.id)
+        self.updates.post(job.id, JobStatus.FAILED, str(error), error.summary)
+        self._completed += 1
+        self.updates.post_progress(self._completed, self._total, job.file_name)
+
+    def _ready(self, lane: str) -> bool:
+        return not self._status(lane).has_problem() and self._has_room(lane)
+
+    def _defer(
+        self,
+        job: PrintJob,
+        job_settings: JobSettings,
+        printer_name: str,
+        lane: str,
+        not_before: float = 0.0,
+        message: str = "",
+        front: bool = False,
+    ) -> None:
+        queue = self._lanes.setdefault(lane, deque())
+        reason = "障害発生中" if not self._breaker.available(lane) else self._status(lane).describe()
+        full = not reason and not not_before and not self._has_room(lane)
+        if not queue and reason:
+            self._logger.warning("Pausing lane %s: %s", lane, reason)
+        elif not queue and full:
+            self._logger.info("Spooler queue of %s is full (%s of our jobs), waiting", lane, self._tracker.pending(lane))
+        entry = (job, job_settings, printer_name, not_before)
+        if front:
+            queue.appendleft(entry)
+        else:
+            queue.append(entry)
+        if not message:
+            if reason:
+                message = f"プリンターが{reason}のため待機しています"
+            else:
+                message = "スプーラーの空きを待っています" if full else "前のジョブを待っています"
+        self.updates.post(job.id, JobStatus.WAITING, message)
+
+    def _drain_lanes(self) -> None:
+        for lane in list(self._lanes):
+            queue = self._lanes[lane]
+            self._refresh_lane(lane, queue)
+            while queue and not self._cancel_requested:
+                job, job_settings, printer_name, not_before = queue[0]
+                if self._consume_withdrawn(job):
+                    queue.popleft()
+                    continue
+                if not_before > time.monotonic():
+                    break
+                if not self._breaker.available(lane):
+                    if not self._fallback_for(lane):
+                        break
+                    queue.popleft()
+                    self._submit(job, job_settings, printer_name)
+                    continue
+                if not self._ready(lane):
+                    break
+                queue.popleft()
+                self._print(job, job_settings, printer_name)
+            if not queue:
+                self._logger.info("Lane %s resumed", lane)
+                del self._lanes[lane]
+
+    def _refresh_lane(self, lane: str, queue: deque) -> None:
+        """Resolves the settings of jobs edited while they waited; a new printer moves them out."""
+        with self._condition:
+            if not self._edited:
+                return
+            edited = {job.id: self._edited.pop(job.id) for job, *_ in queue if job.id in self._edited}
+        if not edited:
+            return
+        kept = deque()
+        moved = []
+        for entry in queue:
+            job = edited.get(entry[0].id)
+            if job is None:
+                kept.append(entry)
+                continue
+            try:
+                job_settings = self._job_manager.resolve_job_settings(job)
+                printer_name = self._dispatch_printer(job, job_settings.copies)
+            except Exception as exc:
+                self._fail(job, exc)
+                continue
+            if self._lane_name(printer_name) == lane:
+                kept.append((job, job_settings, printer_name, entry[3]))
+            else:
+                moved.append((job, job_settings, printer_name))
+        queue.clear()
+        queue.extend(kept)
+        for job, job_settings, printer_name in moved:
+            self._submit(job, job_settings, printer_name)
+
+    def _on_spool_finished(self, record: SpoolRecord) -> None:
+        if record.outcome == OUTCOME_ERROR:
+            error = PrinterUnavailableError("プリンターでエラーが発生しました。", "プリンターでエラーが発生しました。")
+            self.updates.post(record.job_id, JobStatus.FAILED, str(error), error.summary)
+            if self._breaker.record_failure(record.printer_name):
+                self._logger.warning("Circuit breaker opened for %s: spooler job error", record.printer_name)
+        elif record.outcome == OUTCOME_DELETED:
+            self.updates.post(record.job_id, JobStatus.CANCELLED, "スプーラーから削除されました")
+        elif record.outcome == OUTCOME_TIMEOUT:
+            self.updates.post(record.job_id, JobStatus.SUCCESS, "スプール済み（印刷完了は未確認）")
+        else:
+            self.updates.post(record.job_id, JobStatus.SUCCESS)
+        if record.busy_seconds > 0 and record.pages_printed > 0:
+            self._job_manager.pool_dispatcher.record_throughput(
+                record.printer_name, record.pages_printed, record.busy_seconds
+            )
+        if record.outcome == OUTCOME_PRINTED and record.spool_job_id is not None and record.pages_printed > 0:
+            # The autotuner measures up to the printed page, not the hand-off to the spooler:
+            # sending more jobs ahead would otherwise always look faster.
+            with self._condition:
+                run = self._lane_runs.get(record.printer_name)
+                if run is not None:
+                    run[0] += record.pages_printed
+                    run[2] = max(run[2], record.finished_at)
+
+    def _reroute(self, job: PrintJob, printer_name: str) -> str:
+        lane = self._lane_name(printer_name)
+        fallback = self._fallback_for(lane)
+        if not fallback:
+            return printer_name
+        self._logger.info("Rerouting %s from %s to fallback %s", job.file_name, lane, fallback)
+        return fallback
+
+    def _fallback_for(self, lane: str) -> str:
+        if self._breaker.available(lane):
+            return ""
+        fallback = self._context.settings.fallback_printers.get(lane, "")
+        if not fallback or fallback == lane or not self._breaker.available(fallback):
+            return ""
+        return fallback
+
+    def _has_room(self, lane: str) -> bool:
+        # Only our own jobs count: on a shared printer, other clients' jobs would hold us back indefinitely.
+        limit = self._context.settings.max_spooler_queue_depth
+        if limit > 0 and self._context.settings.autotune_enabled:
+            limit = self._job_manager.autotuner.queue_depth(lane)
+        return limit <= 0 or self._tracker.pending(lane) < limit
+
+    def _lane_name(self, printer_name: str) -> str:
+        return printer_name or printer_cache().default_printer()
+
+    def _status(self, printer_name: str) -> PrinterStatus:
+        try:
+            return self._status_monitor.status(printer_name)
+        except Exception:
+            self._logger.debug("Printer status query failed for %s", printer_name, exc_info=True)
+            return PrinterStatus(printer_name)
+
+    def _dispatch_printer(self, job: PrintJob, copies: int) -> str:
+        pool = pool_name(job.printer_name)
+        if pool is None:
+            return job.printer_name
+        pages = estimate_pages(job.file_path, pdf_page_count) * max(1, copies)
+        member = self._job_manager.pool_dispatcher.dispatch(
+            pool, pages, available=lambda name: self._breaker.available(name) and not self._status(name).has_problem()
+        )
+        self._logger.info("Pool %s: dispatched %s (%s pages) to %s", pool, job.file_name, pages, member)
+        return member
+
+    def _resolve_backend(self, job: PrintJob, timeouts: dict[str, float] | None = None):
         if job.file_type == FileType.PDF:
-            return PdfBackend(self._context)
+            return PdfBackend(self._context, timeouts)
+        if self._context.settings.office_process_isolation and job.file_type in _OFFICE_KINDS:
+            return OfficeProcessBackend(self._context, _OFFICE_KINDS[job.file_type], timeouts)
         if job.file_type == FileType.WORD:
-            return WordBackend(self._context)
+            return WordBackend(self._context, timeouts)
         if job.file_type == FileType.EXCEL:
-            return ExcelBackend(self._context)
+            return ExcelBackend(self._context, timeouts)
         if job.file_type == FileType.PPT:
-            return PptBackend(self._context)
+            return PptBackend(self._context, timeouts)
         raise RuntimeError("Unsupported file type")
 
-    def _mark_remaining_as_cancelled(self, current_job: PrintJob, jobs: list[PrintJob]) -> None:
-        mark = False
-        for job in jobs:
-            if job.id == current_job.id:
-                mark = True
-            if mark:
-                self.job_status.emit(job.id, JobStatus.CANCELLED, "キャンセルしました")
+
+def _backend_key(job: PrintJob) -> str:
+    return _OFFICE_KINDS.get(job.file_type, job.file_type.value.lower())
@@ -1,77 +1,214 @@
 from __future__ import annotations
 
+from collections import Counter
 from pathlib import Path
-from typing import List
+from dataclasses import replace
+from typing import Iterator, List
 
 from PySide6 import QtCore
 
-from app.app_context import AppContext
+from app.app_context import (
+    AUTOTUNE_SETTING_KEYS,
+    JOB_SETTING_KEYS,
+    PRINTER_SETTING_KEYS,
+    TIMEOUT_SETTING_KEYS,
+    AppContext,
+)
+from app.controller.adaptive_timeouts import AdaptiveTimeouts
+from app.controller.autotuner import Autotuner
+from app.controller.file_ingestor import FileIngestor
+from app.controller.folder_walker import FolderWalker, WalkFilter
+from app.controller.job_scheduler import JobScheduler, create_policy, folder_chain
+from app.controller.printer_pool import PoolDispatcher, pool_name, pool_target
+from app.controller.resource_governor import MB, resource_governor
 from app.controller.rules_engine import RulesEngine
-from app.model.print_job import PrintJob, FileType, JobStatus
-from app.backend.printer_utils import get_default_printer_name
+from app.model.print_job import (
+    PRIORITY_BULK,
+    SUPPORTED_EXTENSIONS,
+    FileType,
+    JobSettings,
+    JobStatus,
+    PrintJob,
+)
+from app.model.job_journal import JobJournal, JournaledJobStore, JournalSnapshot
+from app.model.job_store import MemoryJobStore, SqliteJobStore
+from app.backend.errors import PrintError
+from app.backend.printer_utils import get_queue_depth, printer_cache
 from app.backend.excel_backend import ExcelBackend
 from app.i18n import t
 
 
 class JobManager(QtCore.QObject):
     jobs_changed = QtCore.Signal()
+    jobs_appended = QtCore.Signal(int)
+    # Jobs removed or disabled; a running executor drops them from its queue.
+    jobs_withdrawn = QtCore.Signal(list)
+    # Jobs deleted from the list, after they were withdrawn.
+    jobs_removed = QtCore.Signal(list)
+    # Jobs whose printer or print settings were edited; a running executor takes the saved copy.
+    jobs_edited = QtCore.Signal(list)
     job_updated = QtCore.Signal(str)
+    jobs_updated = QtCore.Signal(list)
+    job_settings_changed = QtCore.Signal(set)
+
+    # Rewrite the journal once it holds this many entries per job.
+    JOURNAL_COMPACT_FACTOR = 4
 
     def __init__(self, context: AppContext) -> None:
         super().__init__()
         self._context = context
         self._rules = RulesEngine(context)
-        self._jobs: List[PrintJob] = []
+        if context.settings.job_store_mode == "sqlite":
+            self._jobs = SqliteJobStore(context.job_store_path)
+        else:
+            self._jobs = MemoryJobStore()
+        self._recovered = JournalSnapshot()
+        if context.settings.journal_enabled:
+            # Read what a crashed session left behind before this session starts appending.
+            self._recovered = JobJournal.replay(context.job_journal_path)
+            self._jobs = JournaledJobStore(self._jobs, JobJournal(context.job_journal_path))
+        self._status_counts: Counter | None = None
+        self.jobs_changed.connect(self._invalidate_counts)
+        self.jobs_appended.connect(self._invalidate_counts)
+        context.settings_changed.connect(self._on_settings_changed)
+        self.pool_dispatcher = PoolDispatcher(context.printer_pools, queue_depth=get_queue_depth)
+        context.rules_changed.connect(lambda: self.pool_dispatcher.set_pools(context.printer_pools))
+        self.adaptive_timeouts = AdaptiveTimeouts(
+            context.load_print_history(),
+            context.settings.timeout_safety_factor,
+            context.settings.timeout_floor_seconds,
+            context.settings.timeout_ceiling_seconds,
+        )
+        self.autotuner = Autotuner(
+            context.load_autotune_state(),
+            context.settings.autotune_min_dpi,
+            context.settings.autotune_max_queue_depth,
+            context.settings.max_spooler_queue_depth,
+        )
+        # 0 lets the governor use half of the physical memory.
+        resource_governor().set_budget(context.settings.memory_budget_mb * MB)
 
     def jobs(self) -> List[PrintJob]:
-        return list(self._jobs)
+        return list(self._jobs.iter_jobs())
+
+    def iter_jobs(self, enabled_only: bool = False, waiting_only: bool = False) -> Iterator[PrintJob]:
+        if waiting_only:
+            return self._jobs.iter_jobs(lambda job: job.enabled and job.status == JobStatus.WAITING)
+        if enabled_only:
+            return self._jobs.iter_jobs(lambda job: job.enabled)
+        return self._jobs.iter_jobs()
 
     def job_count(self) -> int:
         return len(self._jobs)
 
+    def enabled_job_count(self, waiting_only: bool = False) -> int:
+        return sum(1 for _job in self.iter_jobs(enabled_only=True, waiting_only=waiting_only))
+
+    def status_counts(self) -> Counter:
+        if self._status_counts is None:
+            self._status_counts = self._jobs.count_by_status()
+        return Counter(self._status_counts)
+
     def get_job(self, index: int) -> PrintJob:
-        return self._jobs[index]
+        return self._jobs.get(index)
 
     def find_job_by_id(self, job_id: str) -> PrintJob | None:
-        for job in self._jobs:
-            if job.id == job_id:
-                return job
-        return None
+        return self._jobs.find(job_id)
+
+    def row_of(self, job_id: str) -> int:
+        return self._jobs.index_of(job_id)
 
     def clear(self) -> None:
+        job_ids = [job.id for job in self._jobs.iter_jobs()]
+        self.jobs_withdrawn.emit(job_ids)
         self._jobs.clear()
+        self.jobs_removed.emit(job_ids)
         self.jobs_changed.emit()
 
+    def close(self) -> None:
+        self._jobs.close()
+
+    def recovered_jobs(self) -> JournalSnapshot:
+        return self._recovered
+
+    def restore_recovered(self) -> List[PrintJob]:
+        """Puts the jobs of a crashed session back and returns those still to be printed."""
+        snapshot, self._recovered = self._recovered, JournalSnapshot()
+        for job in snapshot.jobs:
+            if job.status == JobStatus.PRINTING:
+                # It may or may not have reached the printer; print it again.
+                job.status = JobStatus.WAITING
+                job.message = "前回の実行が中断されました"
+        known = self._jobs.paths()
+        jobs = [job for job in snapshot.jobs if job.file_path not in known]
+        self._jobs.extend(jobs, journal=False)
+        self._jobs.journal.compact(self._jobs.iter_jobs())
+        self.jobs_changed.emit()
+        return [job for job in jobs if job.enabled and job.status == JobStatus.WAITING]
+
+    def discard_recovered(self) -> None:
+        self._recovered = JournalSnapshot()
+        if isinstance(self._jobs, JournaledJobStore):
+            self._jobs.journal.compact(self._jobs.iter_jobs())
+
+    def mark_run(self, active: bool) -> None:
+        if not isinstance(self._jobs, JournaledJobStore):
+            return
+        journal = self._jobs.journal
+        journal.append_run(active)
+        if not active and journal.entries > self.JOURNAL_COMPACT_FACTOR * len(self._jobs) + 1000:
+            journal.compact(self._jobs.iter_jobs())
+
     def add_files(self, file_paths: List[str]) -> None:
-        added = False
+        default_printer = self._default_printer()
+        new_jobs: List[PrintJob] = []
+        seen: set[str] = set()
         for path in file_paths:
             normalized = str(Path(path))
-            if any(job.file_path == normalized for job in self._jobs):
+            if normalized in seen or self._jobs.has_path(normalized):
                 continue
+            seen.add(normalized)
             file_type = self._detect_file_type(normalized)
             if file_type == FileType.UNKNOWN:
                 continue
-            printer = self._resolve_printer_for_path(normalized)
-            job = PrintJob(
-                file_path=normalized,
-                file_type=file_type,
-                printer_name=printer,
-                copies=self._context.settings.copies,
-                duplex=self._context.settings.duplex,
-                paper_size=self._context.settings.paper_size,
-            )
-            self._jobs.append(job)
-            added = True
-        if added:
+            new_jobs.append(self._build_job(normalized, file_type, default_printer))
+        if new_jobs:
+            self._jobs.extend(new_jobs)
             self.jobs_changed.emit()
 
+    def add_jobs(self, jobs: List[PrintJob]) -> None:
+        new_jobs = [job for job in jobs if not self._jobs.has_path(job.file_path)]
+        if new_jobs:
+            self._jobs.extend(new_jobs)
+            self.jobs_appended.emit(len(new_jobs))
+
+    def create_ingestor(self, sources: List[str]) -> FileIngestor:
+        default_printer = self._default_printer()
+        return FileIngestor(
+            sources,
+            self._jobs.paths(),
+            lambda path, file_type: self._build_job(path, file_type, default_printer),
+            self._detect_file_type,
+            self.walk_filter(),
+        )
+
+    def walk_filter(self, recursive: bool = True) -> WalkFilter:
+        settings = self._context.settings
+        return WalkFilter(
+            extensions=SUPPORTED_EXTENSIONS,
+            exclude_patterns=tuple(settings.folder_exclude_patterns),
+            max_depth=settings.folder_max_depth if recursive else 1,
+            skip_hidden=settings.folder_skip_hidden,
+            min_size=max(0, settings.folder_min_size_kb) * 1024,
+            max_size=max(0, settings.folder_max_size_mb) * 1024 * 1024,
+        )
+
     def add_folder(self, folder_path: str, recursive: bool = True) -> None:
         folder = Path(folder_path)
         if not folder.exists() or not folder.is_dir():
             return
-        pattern = "**/*" if recursive else "*"
-        files = [str(path) for path in folder.glob(pattern) if path.is_file()]
-        self.add_files(files)
+        walker = FolderWalker(self.walk_filter(recursive))
+        self.add_files(list(walker.walk(str(folder))))
 
     def move_job(self, from_index: int, to_index: int) -> None:
         if from_index < 0 or from_index >= len(self._jobs):
@@ -82,8 +219,7 @@ class JobManager(QtCore.QObject):
             to_index = len(self._jobs) - 1
         if from_index == to_index:
             return
-        job = self._jobs.pop(from_index)
-        self._jobs.insert(to_index, job)
+        self._jobs.move(from_index, to_index)
         self.jobs_changed.emit()
 
     def set_job_enabled(self, job_id: str, enabled: bool) -> None:
@@ -91,36 +227,55 @@ class JobManager(QtCore.QObject):
         if not job:
             return
         job.enabled = enabled
+        self._jobs.save(job)
         self.job_updated.emit(job_id)
+        if not enabled:
+            self.jobs_withdrawn.emit([job_id])
 
     def set_jobs_enabled(self, job_ids: list[str], enabled: bool) -> None:
-        updated = False
-        ids = set(job_ids)
-        for job in self._jobs:
-            if job.id in ids:
-                job.enabled = enabled
-                updated = True
+        updated = []
+        for job in self._find_jobs(job_ids):
+            job.enabled = enabled
+            updated.append(job)
         if updated:
+            self._jobs.save_many(updated)
             self.jobs_changed.emit()
+            if not enabled:
+                self.jobs_withdrawn.emit([job.id for job in updated])
 
     def set_jobs_printer(self, job_ids: list[str], printer_name: str) -> None:
-        updated = False
-        ids = set(job_ids)
-        for job in self._jobs:
-            if job.id in ids:
-                job.printer_name = printer_name
-                job.manual_printer = True
-                updated = True
+        updated = []
+        for job in self._find_jobs(job_ids):
+            job.printer_name = printer_name
+            job.manual_printer = True
+            updated.append(job)
         if updated:
+            self._jobs.save_many(updated)
             self.jobs_changed.emit()
+            self.jobs_edited.emit([job.id for job in updated])
+
+    def set_jobs_priority(self, job_ids: list[str], priority: int) -> None:
+        updated = []
+        for job in self._find_jobs(job_ids):
+            if job.priority != priority:
+                job.priority = priority
+                updated.append(job)
+        if updated:
+            self._jobs.save_many(updated)
+
+    def create_scheduler(self) -> JobScheduler:
+        settings = self._context.settings
+        return JobScheduler(
+            create_policy(settings.schedule_policy),
+            chain_key=folder_chain if settings.schedule_keep_folder_order else None,
+        )
 
     def remove_jobs(self, job_ids: list[str]) -> None:
         if not job_ids:
             return
-        ids = set(job_ids)
-        before = len(self._jobs)
-        self._jobs = [job for job in self._jobs if job.id not in ids]
-        if len(self._jobs) != before:
+        self.jobs_withdrawn.emit(list(job_ids))
+        if self._jobs.remove(job_ids):
+            self.jobs_removed.emit(list(job_ids))
             self.jobs_changed.emit()
 
     def set_job_printer(self, job_id: str, printer_name: str) -> None:
@@ -129,95 +284,169 @@ class JobManager(QtCore.QObject):
             return
         job.printer_name = printer_name
         job.manual_printer = True
+        self._jobs.save(job)
         self.job_updated.emit(job_id)
+        self.jobs_edited.emit([job_id])
 
     def set_job_sheets(self, job_id: str, sheet_names: list[str]) -> None:
         job = self.find_job_by_id(job_id)
         if not job:
             return
         job.excel_sheets = list(sheet_names)
+        self._jobs.save(job)
         self.job_updated.emit(job_id)
+        self.jobs_edited.emit([job_id])
+
+    def set_excel_auto_orientation(self, job_ids: list[str], selected_ids) -> None:
+        selected = set(selected_ids)
+        updated = []
+        for job in self._find_jobs(job_ids):
+            if job.file_type == FileType.EXCEL:
+                job.excel_auto_orientation = job.id in selected
+                updated.append(job)
+        self._jobs.save_many(updated)
 
     def list_excel_sheets(self, file_path: str) -> list[str]:
         backend = ExcelBackend(self._context)
         return backend.list_sheets(file_path)
 
-    def set_job_status(self, job_id: str, status: JobStatus, message: str = "") -> None:
+    def set_job_status(self, job_id: str, status: JobStatus, message: str = "", summary: str = "") -> None:
         job = self.find_job_by_id(job_id)
         if not job:
             return
+        self._apply_status(job, status, message, summary)
+        self._jobs.save(job)
+        self.job_updated.emit(job_id)
+
+    def apply_status_updates(self, updates: list) -> None:
+        changed: dict[str, PrintJob] = {}
+        for update in updates:
+            job = changed.get(update.job_id) or self._jobs.find(update.job_id)
+            if job is None:
+                continue
+            self._apply_status(job, update.status, update.message, update.summary)
+            changed[job.id] = job
+        if changed:
+            self._jobs.save_many(changed.values())
+            self.jobs_updated.emit(list(changed))
+
+    def _apply_status(self, job: PrintJob, status: JobStatus, message: str, summary: str = "") -> None:
+        if self._status_counts is not None and job.status != status:
+            self._status_counts[job.status] -= 1
+            self._status_counts[status] += 1
         job.status = status
         job.message = message
+        if status in (JobStatus.SUCCESS, JobStatus.FAILED, JobStatus.CANCELLED):
+            # The job has left the executor; a later run queues it with the bulk again.
+            job.priority = PRIORITY_BULK
         if status == JobStatus.FAILED:
-            job.summary = self._summarize_message(message)
+            job.summary = summary or PrintError.summary
         else:
             job.summary = ""
-        self.job_updated.emit(job_id)
 
     def get_failed_jobs(self) -> List[PrintJob]:
-        return [job for job in self._jobs if job.enabled and job.status == JobStatus.FAILED]
+        return list(self._jobs.iter_jobs(lambda job: job.enabled and job.status == JobStatus.FAILED))
 
     def get_enabled_jobs(self) -> List[PrintJob]:
-        return [job for job in self._jobs if job.enabled]
+        return list(self._jobs.iter_jobs(lambda job: job.enabled))
+
+    def get_jobs_by_ids(self, job_ids: list[str]) -> List[PrintJob]:
+        return self._find_jobs(job_ids)
 
     def reset_failed_jobs(self) -> None:
-        updated = False
-        for job in self._jobs:
-            if job.status == JobStatus.FAILED:
-                job.status = JobStatus.WAITING
-                job.message = ""
-                job.summary = ""
-                updated = True
+        updated = []
+        for job in self._jobs.iter_jobs(lambda job: job.status == JobStatus.FAILED):
+            job.status = JobStatus.WAITING
+            job.message = ""
+            job.summary = ""
+            updated.append(job)
         if updated:
+            self._jobs.save_many(updated)
             self.jobs_changed.emit()
 
-    @staticmethod
-    def _summarize_message(message: str) -> str:
-        text = message.lower()
-        if ("pymupdf" in text or "fitz" in text) and ("必要" in message or "required" in text):
-            return "PDF 印刷に必要な部品が見つかりません。"
-        if "pywin32" in text or "win32com" in text:
-            return "Office 印刷に必要な部品が見つかりません。"
-        if "ファイルが見つかりません" in message or "file not found" in text:
-            return "ファイルが見つかりません。"
-        if "printer" in text or "プリンター" in message:
-            return "プリンターに接続できません。"
-        if "access is denied" in text or "権限" in message:
-            return "権限が足りません。"
-        return "印刷に失敗しました。"
-
     def apply_rules(self, force: bool = False) -> None:
-        for job in self._jobs:
+        default_printer = self._default_printer()
+        updated = []
+        for job in self._jobs.iter_jobs():
             if force or not job.manual_printer:
-                job.printer_name = self._resolve_printer_for_path(job.file_path)
+                job.printer_name = self._resolve_printer_for_path(job.file_path, default_printer)
                 if force:
                     job.manual_printer = False
-        self.jobs_changed.emit()
-
-    def apply_settings_to_jobs(self) -> None:
-        for job in self._jobs:
-            job.copies = self._context.settings.copies
-            job.duplex = self._context.settings.duplex
-            job.paper_size = self._context.settings.paper_size
-        self.jobs_changed.emit()
+                updated.append(job)
+        self._jobs.save_many(updated)
+        self.job_settings_changed.emit({"printer_name"})
+        if updated:
+            self.jobs_edited.emit([job.id for job in updated])
+
+    def rule_printers(self) -> set[str]:
+        printers = set()
+        for printer in self._rules.compiled().printers():
+            pool = pool_name(printer)
+            printers.update(self.pool_dispatcher.members(pool) if pool is not None else [printer])
+        return printers
+
+    def pool_targets(self) -> list[str]:
+        return [pool_target(name) for name in sorted(self.pool_dispatcher.pools())]
+
+    def resolve_job_settings(self, job: PrintJob) -> JobSettings:
+        settings = self._context.settings
+        resolved = self._rules.resolve_settings(
+            job.file_path,
+            JobSettings(copies=settings.copies, duplex=settings.duplex, paper_size=settings.paper_size),
+        )
+        overrides = job.overrides()
+        return replace(resolved, **overrides) if overrides else resolved
+
+    def set_jobs_overrides(self, job_ids: list[str], **values) -> None:
+        updated = []
+        for job in self._find_jobs(job_ids):
+            for key, value in values.items():
+                if key in JOB_SETTING_KEYS:
+                    setattr(job, key, value)
+            updated.append(job)
+        if updated:
+            self._jobs.save_many(updated)
+            self.jobs_updated.emit([job.id for job in updated])
+            self.jobs_edited.emit([job.id for job in updated])
+
+    def _on_settings_changed(self, keys: set) -> None:
+        if keys & PRINTER_SETTING_KEYS:
+            self.apply_rules()
+        if keys & JOB_SETTING_KEYS:
+            # Jobs inherit these values at print time, so nothing is written to the store.
+            self.job_settings_changed.emit(keys & JOB_SETTING_KEYS)
+        if keys & TIMEOUT_SETTING_KEYS:
+            settings = self._context.settings
+            self.adaptive_timeouts.configure(
+                settings.timeout_safety_factor, settings.timeout_floor_seconds, settings.timeout_ceiling_seconds
+            )
+        if keys & AUTOTUNE_SETTING_KEYS:
+            settings = self._context.settings
+            self.autotuner.configure(
+                settings.autotune_min_dpi, settings.autotune_max_queue_depth, settings.max_spooler_queue_depth
+            )
+        if "memory_budget_mb" in keys:
+            resource_governor().set_budget(self._context.settings.memory_budget_mb * MB)
 
     def reset_statuses(self) -> None:
-        for job in self._jobs:
+        updated = []
+        for job in self._jobs.iter_jobs():
             job.status = JobStatus.WAITING
             job.message = ""
             job.summary = ""
+            updated.append(job)
+        self._jobs.save_many(updated)
         self.jobs_changed.emit()
 
     def reset_statuses_for(self, job_ids: list[str]) -> None:
-        ids = set(job_ids)
-        updated = False
-        for job in self._jobs:
-            if job.id in ids:
-                job.status = JobStatus.WAITING
-                job.message = ""
-                job.summary = ""
-                updated = True
+        updated = []
+        for job in self._find_jobs(job_ids):
+            job.status = JobStatus.WAITING
+            job.message = ""
+            job.summary = ""
+            updated.append(job)
         if updated:
+            self._jobs.save_many(updated)
             self.jobs_changed.emit()
 
     def sort_jobs(self, column: int, descending: bool = False) -> None:
@@ -240,9 +469,21 @@ class JobManager(QtCore.QObject):
                 return self._status_text(job.status).lower()
             return ""
 
-        self._jobs.sort(key=key, reverse=descending)
+        ordered = sorted(self._jobs.iter_jobs(), key=key, reverse=descending)
+        self._jobs.reorder([job.id for job in ordered])
         self.jobs_changed.emit()
 
+    def _invalidate_counts(self, *_args) -> None:
+        self._status_counts = None
+
+    def _find_jobs(self, job_ids: list[str]) -> List[PrintJob]:
+        jobs = []
+        for job_id in job_ids:
+            job = self._jobs.find(job_id)
+            if job is not None:
+                jobs.append(job)
+        return jobs
+
     def _label_for_job(self, job: PrintJob) -> str:
         ext = job.extension
         if ext == ".pdf":
@@ -274,14 +515,21 @@ class JobManager(QtCore.QObject):
         }
         return mapping.get(status, status.value)
 
-    def _resolve_printer_for_path(self, file_path: str) -> str:
+    def _build_job(self, file_path: str, file_type: FileType, default_printer: str) -> PrintJob:
+        return PrintJob(
+            file_path=file_path,
+            file_type=file_type,
+            printer_name=self._rules.resolve_printer(file_path, default_printer),
+        )
+
+    def _default_printer(self) -> str:
         if self._context.settings.use_default_printer:
-            try:
-                default_printer = get_default_printer_name()
-            except Exception:
-                default_printer = ""
-        else:
-            default_printer = self._context.settings.selected_printer
+            return printer_cache().default_printer()
+        return self._context.settings.selected_printer
+
+    def _resolve_printer_for_path(self, file_path: str, default_printer: str | None = None) -> str:
+        if default_printer is None:
+            default_printer = self._default_printer()
         return self._rules.resolve_printer(file_path, default_printer)
 
     @staticmethod
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections import deque
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Iterator
+
+from app.controller.printer_pool import estimate_pages
+from app.controller.rule_compiler import pdf_page_count
+from app.model.print_job import FileType, PrintJob
+
+SCHEDULE_POLICIES = ("fifo", "priority", "sjf", "grouped")
+
+
+@dataclass
+class ScheduledJob:
+    job: PrintJob
+    sequence: int
+    # None until the page count has been estimated; only policies that need it wait for it.
+    pages: int | None = None
+    chain: str | None = None
+    removed: bool = False
+
+    @property
+    def bucket(self) -> tuple[str, str]:
+        return self.job.file_type.value, self.job.printer_name
+
+
+class SchedulePolicy:
+    name = "fifo"
+    # Keep jobs for the same application and printer together.
+    affinity = False
+    needs_pages = False
+    # The order only depends on arrival, so a caller streaming jobs in can keep just a
+    # window of them queued; other policies must see every job before the first pop.
+    windowed = True
+
+    def key(self, item: ScheduledJob) -> tuple:
+        return (item.sequence,)
+
+
+class PriorityPolicy(SchedulePolicy):
+    name = "priority"
+    windowed = False
+
+    def key(self, item: ScheduledJob) -> tuple:
+        return (-item.job.priority, item.sequence)
+
+
+class ShortestJobFirstPolicy(SchedulePolicy):
+    name = "sjf"
+    needs_pages = True
+    windowed = False
+
+    def key(self, item: ScheduledJob) -> tuple:
+        return (-item.job.priority, item.pages, item.sequence)
+
+
+class GroupedPolicy(PriorityPolicy):
+    name = "grouped"
+    affinity = True
+
+
+_POLICY_TYPES: dict[str, type[SchedulePolicy]] = {
+    policy.name: policy for policy in (SchedulePolicy, PriorityPolicy, ShortestJobFirstPolicy, GroupedPolicy)
+}
+
+
+def create_policy(name: str) -> SchedulePolicy:
+    return _POLICY_TYPES.get(name, SchedulePolicy)()
+
+
+def folder_chain(job: PrintJob) -> str:
+    return str(Path(job.file_path).parent).casefold()
+
+
+class JobScheduler:
+    """Decides the order in which the executor prints the jobs handed to it.
+
+    Jobs that share a chain key (e.g. the same folder when the user asked to keep
+    folder order) are released one at a time in the order they were pushed, so the
+    policy can only reorder jobs across chains. Ready jobs sit in heaps ordered by
+    the policy key; an affinity policy keeps one heap per (file type, printer) and
+    stays on the current one until it runs dry or an interactive job is waiting.
+
+    Counting pages can mean opening the document, so push() never does it. A policy
+    that orders by pages holds each job aside until the caller, on its own thread,
+    estimates it through unsized(), estimate() and set_pages().
+    """
+
+    def __init__(
+        self,
+        policy: SchedulePolicy | None = None,
+        chain_key: Callable[[PrintJob], str | None] | None = None,
+        page_estimator: Callable[[PrintJob], int] | None = None,
+    ) -> None:
+        self._policy = policy or SchedulePolicy()
+        self._chain_key = chain_key
+        self._page_estimator = page_estimator or _estimate_job_pages
+        self._sequence = itertools.count()
+        self._entries = itertools.count()
+        self._items: dict[str, ScheduledJob] = {}
+        self._chains: dict[str, deque[ScheduledJob]] = {}
+        self._ready: dict[tuple[str, str] | None, list] = {}
+        self._unsized: dict[str, ScheduledJob] = {}
+        self._last_bucket: tuple[str, str] | None = None
+
+    @property
+    def policy(self) -> SchedulePolicy:
+        return self._policy
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._items
+
+    def push(self, job: PrintJob) -> None:
+        if job.id in self._items:
+            return
+        item = ScheduledJob(job, next(self._sequence))
+        item.chain = self._chain_key(job) if self._chain_key else None
+        self._items[job.id] = item
+        if item.chain is None:
+            self._make_ready(item)
+            return
+        chain = self._chains.setdefault(item.chain, deque())
+        chain.append(item)
+        if len(chain) == 1:
+            self._make_ready(item)
+
+    def pop(self) -> PrintJob | None:
+        item = self._take()
+        if item is None:
+            return None
+        del self._items[item.job.id]
+        self._last_bucket = item.bucket
+        self._advance_chain(item)
+        return item.job
+
+    def remove(self, job_id: str) -> PrintJob | None:
+        item = self._items.pop(job_id, None)
+        if item is None:
+            return None
+        item.removed = True
+        self._unsized.pop(job_id, None)
+        if item.chain is not None:
+            chain = self._chains[item.chain]
+            if chain and chain[0] is item:
+                self._advance_chain(item)
+            else:
+                chain.remove(item)
+        return item.job
+
+    def reprioritize(self, job_id: str, priority: int) -> bool:
+        """Re-keys a queued job with a new priority."""
+        item = self._items.get(job_id)
+        if item is None:
+            return False
+        return self.update(replace(item.job, priority=priority))
+
+    def update(self, job: PrintJob) -> bool:
+        """Replaces a queued job with a newer copy of it and re-keys it.
+
+        The caller passes the copy it saved: the job store may hand out a different
+        object than the one queued here.
+        """
+        item = self._items.get(job.id)
+        if item is None:
+            return False
+        # The estimate covers every copy, so it is only kept while the copy count is unchanged.
+        pages = item.pages if job.copies == item.job.copies else None
+        fresh = replace(item, job=job, pages=pages)
+        item.removed = True
+        self._items[job.id] = fresh
+        self._unsized.pop(job.id, None)
+        if item.chain is None:
+            self._make_ready(fresh)
+            return True
+        chain = self._chains[item.chain]
+        for index, queued in enumerate(chain):
+            if queued is item:
+                chain[index] = fresh
+                if index == 0:
+                    self._make_ready(fresh)
+                break
+        return True
+
+    def unsized(self, limit: int) -> list[PrintJob]:
+        """Jobs next in line that still need a page estimate, oldest first."""
+        return [item.job for item in itertools.islice(self._unsized.values(), limit)]
+
+    def estimate(self, job: PrintJob) -> int:
+        return self._page_estimator(job)
+
+    def set_pages(self, job_id: str, pages: int) -> None:
+        item = self._unsized.pop(job_id, None)
+        if item is None:
+            return
+        item.pages = pages
+        self._make_ready(item)
+
+    def drain(self) -> Iterator[PrintJob]:
+        while True:
+            job = self.pop()
+            if job is None:
+                if not self._unsized:
+                    return
+                for job_id in list(self._unsized):
+                    self.set_pages(job_id, 0)
+                continue
+            yield job
+
+    def _make_ready(self, item: ScheduledJob) -> None:
+        if self._policy.needs_pages and item.pages is None:
+            self._unsized[item.job.id] = item
+            return
+        bucket = item.bucket if self._policy.affinity else None
+        entry = (self._policy.key(item), next(self._entries), item)
+        heapq.heappush(self._ready.setdefault(bucket, []), entry)
+
+    def _advance_chain(self, item: ScheduledJob) -> None:
+        if item.chain is None:
+            return
+        chain = self._chains[item.chain]
+        chain.popleft()
+        if chain:
+            self._make_ready(chain[0])
+        else:
+            del self._chains[item.chain]
+
+    def _take(self) -> ScheduledJob | None:
+        best_bucket = None
+        best_entry = None
+        for bucket, heap in list(self._ready.items()):
+            while heap and heap[0][2].removed:
+                heapq.heappop(heap)
+            if not heap:
+                del self._ready[bucket]
+                continue
+            if best_entry is None or heap[0] < best_entry:
+                best_bucket, best_entry = bucket, heap[0]
+        if best_entry is None:
+            return None
+        current = self._ready.get(self._last_bucket) if self._policy.affinity else None
+        if current and best_entry[2].job.priority <= current[0][2].job.priority:
+            best_bucket = self._last_bucket
+        return heapq.heappop(self._ready[best_bucket])[2]
+
+
+def _estimate_job_pages(job: PrintJob) -> int:
+    counter = pdf_page_count if job.file_type == FileType.PDF else None
+    return estimate_pages(job.file_path, counter) * max(1, job.copies or 1)
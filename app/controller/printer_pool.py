@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+POOL_PREFIX = "pool:"
+DEFAULT_PAGES_PER_MINUTE = 30.0
+BYTES_PER_PAGE_ESTIMATE = 60 * 1024
+
+
+def pool_name(printer_name: str) -> str | None:
+    if printer_name and printer_name.startswith(POOL_PREFIX):
+        return printer_name[len(POOL_PREFIX):]
+    return None
+
+
+def pool_target(name: str) -> str:
+    return f"{POOL_PREFIX}{name}"
+
+
+def estimate_pages(file_path: str, page_counter: Callable[[str], int | None] | None = None) -> int:
+    if page_counter is not None:
+        pages = page_counter(file_path)
+        if pages:
+            return pages
+    try:
+        size = os.stat(file_path).st_size
+    except OSError:
+        return 1
+    return max(1, size // BYTES_PER_PAGE_ESTIMATE)
+
+
+@dataclass
+class _MemberState:
+    outstanding_pages: float = 0.0
+    pages_per_second: float = DEFAULT_PAGES_PER_MINUTE / 60.0
+    updated_at: float = 0.0
+    dispatched: int = 0
+
+
+class PoolDispatcher:
+    """Chooses a pool member for each job by its estimated backlog in seconds.
+
+    The backlog of a member is the pages we have sent it that are not yet printed, plus
+    the jobs other clients have queued on its spooler, drained at the member's measured
+    throughput. Jobs are handed out in submission order, so every member receives its
+    share of the documents in their original order.
+    """
+
+    def __init__(
+        self,
+        pools: dict[str, list[str]] | None = None,
+        queue_depth: Callable[[str], int] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        pages_per_job: float = 5.0,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._pools: dict[str, list[str]] = {}
+        self._members: dict[str, _MemberState] = {}
+        self._queue_depth = queue_depth
+        self._clock = clock
+        self._pages_per_job = pages_per_job
+        self.set_pools(pools or {})
+
+    def set_pools(self, pools: dict[str, list[str]]) -> None:
+        with self._lock:
+            self._pools = {name: [member for member in members if member] for name, members in pools.items()}
+
+    def pools(self) -> dict[str, list[str]]:
+        with self._lock:
+            return {name: list(members) for name, members in self._pools.items()}
+
+    def members(self, name: str) -> list[str]:
+        with self._lock:
+            return list(self._pools.get(name, []))
+
+    def dispatch(self, name: str, pages: int, available: Callable[[str], bool] | None = None) -> str:
+        members = self.members(name)
+        if not members:
+            raise RuntimeError(f"プリンタープール {name} にプリンターが登録されていません。")
+        if available is not None:
+            # Members reporting a problem are skipped unless none of them is usable.
+            members = [member for member in members if available(member)] or members
+        depths = {member: self._external_depth(member) for member in members}
+        with self._lock:
+            now = self._clock()
+            best = None
+            best_backlog = 0.0
+            for member in members:
+                state = self._drain(member, now)
+                # The spooler count includes our own unfinished jobs, which are already in outstanding_pages.
+                own_jobs = math.ceil(state.outstanding_pages / self._pages_per_job)
+                external_pages = max(0, depths[member] - own_jobs) * self._pages_per_job
+                backlog = (state.outstanding_pages + external_pages) / state.pages_per_second
+                if best is None or backlog < best_backlog:
+                    best = member
+                    best_backlog = backlog
+            state = self._members[best]
+            state.outstanding_pages += max(1, pages)
+            state.dispatched += 1
+            return best
+
+    def record_throughput(self, member: str, pages: int, seconds: float) -> None:
+        if pages <= 0 or seconds <= 0:
+            return
+        with self._lock:
+            state = self._drain(member, self._clock())
+            measured = pages / seconds
+            state.pages_per_second = 0.7 * state.pages_per_second + 0.3 * measured
+
+    def backlog_seconds(self, member: str) -> float:
+        with self._lock:
+            state = self._drain(member, self._clock())
+            return state.outstanding_pages / state.pages_per_second
+
+    def _drain(self, member: str, now: float) -> _MemberState:
+        state = self._members.get(member)
+        if state is None:
+            state = _MemberState(updated_at=now)
+            self._members[member] = state
+            return state
+        elapsed = max(0.0, now - state.updated_at)
+        state.outstanding_pages = max(0.0, state.outstanding_pages - elapsed * state.pages_per_second)
+        state.updated_at = now
+        return state
+
+    def _external_depth(self, member: str) -> int:
+        if self._queue_depth is None:
+            return 0
+        try:
+            return max(0, int(self._queue_depth(member)))
+        except Exception:
+            return 0
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from app.backend.cancel_token import CancelToken
+
+MB = 1024 * 1024
+
+# Rough peak of each kind of work before the document itself is counted.
+BASE_MEMORY = {
+    "pdf": 120 * MB,
+    "word": 150 * MB,
+    "excel": 200 * MB,
+    "ppt": 250 * MB,
+}
+# How many times its file size an open document takes in the Office application.
+FILE_SIZE_FACTOR = {
+    "pdf": 1.0,
+    "word": 4.0,
+    "excel": 8.0,
+    "ppt": 3.0,
+}
+# Bytes held per rendered pixel: the RGB pixmap, its QImage copy and the image scaled to the page.
+PDF_BYTES_PER_PIXEL = 10
+DEFAULT_PAGE_POINTS = (595.0, 842.0)  # A4
+AUTO_BUDGET_SHARE = 0.5
+WAIT_SLICE_SECONDS = 0.1
+
+
+@dataclass
+class MemoryReservation:
+    key: str
+    kind: str
+    estimate: int
+    raw_estimate: int
+    admitted_at: float = 0.0
+
+
+def estimate_job_memory(kind: str, file_path: str, size: int, dpi: int = 0) -> int:
+    """Raw peak memory estimate in bytes, before the measured correction is applied."""
+    estimate = BASE_MEMORY.get(kind, BASE_MEMORY["word"]) + int(size * FILE_SIZE_FACTOR.get(kind, 1.0))
+    if kind == "pdf" and dpi:
+        width, height = pdf_largest_page(file_path)
+        estimate += int(width / 72 * dpi * height / 72 * dpi * PDF_BYTES_PER_PIXEL)
+    return estimate
+
+
+def pdf_largest_page(file_path: str) -> tuple[float, float]:
+    try:
+        import fitz  # type: ignore
+    except Exception:
+        return DEFAULT_PAGE_POINTS
+    try:
+        with fitz.open(file_path) as doc:
+            sizes = [(page.rect.width, page.rect.height) for page in doc]
+    except Exception:
+        return DEFAULT_PAGE_POINTS
+    return max(sizes, key=lambda size: size[0] * size[1], default=DEFAULT_PAGE_POINTS)
+
+
+def physical_memory() -> int:
+    try:
+        import win32api  # type: ignore
+
+        return int(win32api.GlobalMemoryStatusEx()["TotalPhys"])
+    except Exception:
+        pass
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, OSError, ValueError):
+        return 8 * 1024 * MB
+
+
+class ResourceGovernor:
+    """Admits memory-hungry work (PDF rendering, Office automation) within a memory budget.
+
+    Callers reserve their estimated peak before they start and release it when done,
+    passing the peak they measured if they have one. The ratio of measured to raw
+    estimate is smoothed per kind of work and applied to later estimates. A request is
+    admitted when it fits in what is left of the budget, or when nothing else holds a
+    reservation, so a single oversized job still runs on its own.
+    """
+
+    def __init__(self, budget: int = 0) -> None:
+        self._condition = threading.Condition()
+        self._budget = 0
+        self._reservations: dict[str, MemoryReservation] = {}
+        self._corrections: dict[str, float] = {}
+        self._waiting = 0
+        self._admitted = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._peak_reserved = 0
+        self._window_peak = 0
+        self._logger = logging.getLogger(__name__)
+        self.set_budget(budget)
+
+    def set_budget(self, budget: int) -> None:
+        with self._condition:
+            self._budget = budget if budget > 0 else int(physical_memory() * AUTO_BUDGET_SHARE)
+            self._condition.notify_all()
+
+    @property
+    def budget(self) -> int:
+        with self._condition:
+            return self._budget
+
+    def acquire(
+        self,
+        key: str,
+        kind: str,
+        raw_estimate: int,
+        cancel: CancelToken | None = None,
+        on_wait: Callable[[int, int], None] | None = None,
+    ) -> MemoryReservation:
+        started = time.monotonic()
+        with self._condition:
+            estimate = int(raw_estimate * self._corrections.get(kind, 1.0))
+            reservation = MemoryReservation(key, kind, estimate, raw_estimate)
+            if not self._fits(estimate):
+                self._logger.info(
+                    "Holding %s: needs %s MB, %s of %s MB in use",
+                    key,
+                    estimate // MB,
+                    self._reserved() // MB,
+                    self._budget // MB,
+                )
+                self._waiting += 1
+                try:
+                    if on_wait is not None:
+                        self._condition.release()
+                        try:
+                            on_wait(estimate, self._budget)
+                        finally:
+                            self._condition.acquire()
+                    while not self._fits(estimate):
+                        if cancel is not None:
+                            cancel.check()
+                        self._condition.wait(WAIT_SLICE_SECONDS)
+                finally:
+                    self._waiting -= 1
+                self._waits += 1
+                self._wait_seconds += time.monotonic() - started
+            reservation.admitted_at = time.monotonic()
+            self._reservations[key] = reservation
+            self._admitted += 1
+            self._peak_reserved = max(self._peak_reserved, self._reserved())
+            self._window_peak = max(self._window_peak, self._reserved())
+        return reservation
+
+    def release(self, reservation: MemoryReservation, measured_peak: int = 0) -> None:
+        with self._condition:
+            if self._reservations.get(reservation.key) is reservation:
+                del self._reservations[reservation.key]
+            if measured_peak > 0 and reservation.raw_estimate > 0:
+                ratio = measured_peak / reservation.raw_estimate
+                # Starts from the raw estimate and moves slowly, so one light job cannot undercut the next heavy one.
+                smoothed = 0.7 * self._corrections.get(reservation.kind, 1.0) + 0.3 * ratio
+                self._corrections[reservation.kind] = min(4.0, max(0.5, smoothed))
+                self._logger.debug(
+                    "%s peaked at %s MB (estimated %s MB)",
+                    reservation.key,
+                    measured_peak // MB,
+                    reservation.estimate // MB,
+                )
+            self._condition.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._condition:
+            return {
+                "budget_mb": self._budget // MB,
+                "reserved_mb": self._reserved() // MB,
+                "active": len(self._reservations),
+                "waiting": self._waiting,
+                "peak_reserved_mb": self._peak_reserved // MB,
+                "admitted": self._admitted,
+                "waits": self._waits,
+                "wait_seconds": round(self._wait_seconds, 1),
+                "corrections": {kind: round(value, 2) for kind, value in self._corrections.items()},
+            }
+
+    def take_peak(self) -> int:
+        """Highest reservation total since the previous call."""
+        with self._condition:
+            peak = self._window_peak
+            self._window_peak = self._reserved()
+            return peak
+
+    def _fits(self, estimate: int) -> bool:
+        return not self._reservations or self._reserved() + estimate <= self._budget
+
+    def _reserved(self) -> int:
+        return sum(reservation.estimate for reservation in self._reservations.values())
+
+
+_governor: ResourceGovernor | None = None
+_governor_lock = threading.Lock()
+
+
+def resource_governor() -> ResourceGovernor:
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = ResourceGovernor()
+        return _governor
@@ -0,0 +1,469 @@
+from __future__ import annotations
+
+import fnmatch
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from app.model.print_job import DuplexMode
+
+QUALITY_LEVELS = ("draft", "normal", "high")
+RESULT_FIELDS = ("printer", "copies", "duplex", "paper_size", "quality")
+# Regex constructs that only work in a pattern of their own: inline global flags, named
+# groups, backreferences and conditionals. Rules using them are matched one by one.
+_UNCOMBINABLE = re.compile(r"\(\?[aiLmsux]+\)|\(\?P[<=]|\(\?\(|\\[1-9]|\\g<")
+
+
+@dataclass
+class RoutingRule:
+    name: str = ""
+    path_prefix: str = ""
+    pattern: str = ""
+    regex: str = ""
+    extensions: tuple[str, ...] = ()
+    min_size: int = 0
+    max_size: int = 0
+    min_pages: int = 0
+    max_pages: int = 0
+    printer: str = ""
+    copies: int | None = None
+    duplex: DuplexMode | None = None
+    paper_size: str | None = None
+    quality: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RoutingRule":
+        extensions = data.get("extensions", data.get("extension", ()))
+        if isinstance(extensions, str):
+            extensions = [extensions]
+        regex = str(data.get("regex", "") or "")
+        if regex:
+            re.compile(regex)
+        copies = data.get("copies")
+        quality = data.get("quality")
+        paper_size = data.get("paper_size")
+        return cls(
+            name=str(data.get("name", "") or ""),
+            path_prefix=str(data.get("path_prefix", "") or ""),
+            pattern=str(data.get("pattern", "") or ""),
+            regex=regex,
+            extensions=tuple(_normalize_extension(ext) for ext in extensions if ext),
+            min_size=_kb(data.get("min_size_kb")),
+            max_size=_kb(data.get("max_size_kb")),
+            min_pages=_int(data.get("min_pages")),
+            max_pages=_int(data.get("max_pages")),
+            printer=str(data.get("printer", "") or ""),
+            copies=copies if isinstance(copies, int) and copies > 0 else None,
+            duplex=_parse_duplex(data.get("duplex")),
+            paper_size=paper_size if isinstance(paper_size, str) else None,
+            quality=quality if quality in QUALITY_LEVELS else None,
+        )
+
+    def has_action(self) -> bool:
+        return bool(self.printer) or any(
+            getattr(self, name) is not None for name in ("copies", "duplex", "paper_size", "quality")
+        )
+
+
+@dataclass(frozen=True)
+class RuleResult:
+    printer: str = ""
+    copies: int | None = None
+    duplex: DuplexMode | None = None
+    paper_size: str | None = None
+    quality: str | None = None
+
+
+class _TrieNode:
+    __slots__ = ("children", "mask")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.mask = 0
+
+
+class _FileFact:
+    __slots__ = ("mtime_ns", "size", "pages")
+
+    def __init__(self, mtime_ns: int, size: int) -> None:
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.pages: int | None = -1
+
+
+class FileFacts:
+    """Size and page count per file, kept until the file's size or mtime changes.
+
+    Rules are applied to every job again whenever a rule or printer setting changes;
+    this keeps each pass to one stat per file instead of re-opening every PDF.
+    """
+
+    def __init__(self, page_counter: Callable[[str], int | None], limit: int = 100_000) -> None:
+        self._page_counter = page_counter
+        self._limit = limit
+        self._facts: OrderedDict[str, _FileFact] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str) -> _FileFact | None:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        with self._lock:
+            fact = self._facts.get(file_path)
+            if fact is None or fact.mtime_ns != stat.st_mtime_ns or fact.size != stat.st_size:
+                fact = _FileFact(stat.st_mtime_ns, stat.st_size)
+                self._facts[file_path] = fact
+                while len(self._facts) > self._limit:
+                    self._facts.popitem(last=False)
+            else:
+                self._facts.move_to_end(file_path)
+        return fact
+
+    def pages(self, file_path: str, fact: _FileFact | None = None) -> int | None:
+        fact = fact or self.get(file_path)
+        if fact is None:
+            return None
+        if fact.pages == -1:
+            fact.pages = self._page_counter(file_path)
+        return fact.pages
+
+
+class CompiledRules:
+    """Routing rules compiled into bitmask lookups.
+
+    Every rule is a bit. The candidates for a path are the AND of the extension hash,
+    the directory prefix trie and one combined regex over the file name; only the
+    surviving rules are checked for size and page ranges, in rule order. Regexes that
+    cannot be part of the combined regex are matched on their own, and rules whose
+    pattern does not compile are dropped.
+    """
+
+    # Below this many surviving pattern rules, matching them one by one beats the combined regex.
+    INDIVIDUAL_MATCH_LIMIT = 3
+
+    def __init__(
+        self,
+        rules: list[RoutingRule],
+        version: int = 0,
+        page_counter: Callable[[str], int | None] | None = None,
+    ) -> None:
+        self.rules = _compilable(rules)
+        self.version = version
+        self._facts = FileFacts(page_counter) if page_counter else file_facts()
+        self._ext_masks: dict[str, int] = {}
+        self._any_ext = 0
+        self._trie = _TrieNode()
+        self._any_prefix = 0
+        self._any_name = 0
+        self._name_groups: list[tuple[int, int]] = []
+        literals: dict[str, int] = {}
+        self._name_matchers: dict[int, Callable[[str], re.Match | None]] = {}
+        self._individual = 0
+        self._conditional = 0
+        self._named = 0
+        self._dir_masks: dict[str, int] = {}
+        self._results: dict[tuple[str, str], RuleResult] = {}
+        parts = []
+        for index, rule in enumerate(self.rules):
+            bit = 1 << index
+            if rule.pattern or rule.regex or rule.min_size or rule.max_size or rule.min_pages or rule.max_pages:
+                self._conditional |= bit
+            if rule.extensions:
+                for ext in rule.extensions:
+                    self._ext_masks[ext] = self._ext_masks.get(ext, 0) | bit
+            else:
+                self._any_ext |= bit
+            if rule.path_prefix:
+                node = self._trie
+                for part in _split_dirs(rule.path_prefix):
+                    node = node.children.setdefault(part, _TrieNode())
+                node.mask |= bit
+            else:
+                self._any_prefix |= bit
+            if rule.pattern or rule.regex:
+                self._named |= bit
+                self._name_matchers[bit] = _name_matcher(rule)
+                if rule.pattern or not _UNCOMBINABLE.search(rule.regex):
+                    body = fnmatch.translate(rule.pattern) if rule.pattern else f".*?(?:{rule.regex})"
+                    parts.append(f"(?:(?=(?P<r{index}>{body})))?")
+                    self._name_groups.append((index, bit))
+                else:
+                    self._individual |= bit
+                literal = _glob_literal(rule.pattern) if rule.pattern else _regex_literal(rule.regex)
+                if literal:
+                    literals[literal] = literals.get(literal, 0) | bit
+            else:
+                self._any_name |= bit
+        self._name_regex = None
+        if parts:
+            try:
+                self._name_regex = re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+            except re.error as exc:
+                logging.getLogger(__name__).warning("Matching routing rules one by one: %s", exc)
+                for _index, bit in self._name_groups:
+                    self._individual |= bit
+                self._name_groups = []
+        if self._name_regex is not None:
+            group_index = self._name_regex.groupindex
+            self._name_groups = [(group_index[f"r{index}"], bit) for index, bit in self._name_groups]
+        # Rules whose pattern needs a literal substring. One scan finds every literal present;
+        # a longer literal also implies the shorter literals it contains.
+        self._literal_rules = 0
+        self._literal_bits: dict[str, int] = {}
+        self._literal_regex = None
+        if literals:
+            for literal, bits in literals.items():
+                self._literal_rules |= bits
+                self._literal_bits[literal] = 0
+                for other, other_bits in literals.items():
+                    if other in literal:
+                        self._literal_bits[literal] |= other_bits
+            alternatives = "|".join(re.escape(literal) for literal in sorted(literals, key=len, reverse=True))
+            self._literal_regex = re.compile(f"(?=({alternatives}))")
+
+    def resolve(self, file_path: str) -> RuleResult:
+        if not self.rules:
+            return RuleResult()
+        directory, name = _split_path(file_path)
+        dot = name.rfind(".")
+        ext = name[dot:].lower() if dot > 0 else ""
+        cached = self._results.get((directory, ext))
+        if cached is not None:
+            return cached
+        mask = self._ext_masks.get(ext, 0) | self._any_ext
+        if mask:
+            mask &= self._prefix_mask(directory)
+        if not mask & self._conditional:
+            # Only folder and extension conditions apply, so every file in this folder
+            # with this extension resolves the same way.
+            result = self._apply(mask, file_path)
+            self._results[(directory, ext)] = result
+            return result
+        if mask & ~self._any_name:
+            mask &= self._name_mask(name, mask)
+        return self._apply(mask, file_path)
+
+    def _apply(self, mask: int, file_path: str) -> RuleResult:
+        values: dict[str, object] = {}
+        fact = None
+        pending = set(RESULT_FIELDS)
+        while mask and pending:
+            low = mask & -mask
+            mask ^= low
+            rule = self.rules[low.bit_length() - 1]
+            if rule.min_size or rule.max_size or rule.min_pages or rule.max_pages:
+                fact = fact or self._facts.get(file_path)
+                if fact is None:
+                    continue
+            if (rule.min_size or rule.max_size) and not _in_range(fact.size, rule.min_size, rule.max_size):
+                continue
+            if rule.min_pages or rule.max_pages:
+                pages = self._facts.pages(file_path, fact)
+                if pages is None or not _in_range(pages, rule.min_pages, rule.max_pages):
+                    continue
+            for field_name in list(pending):
+                value = getattr(rule, field_name)
+                if value is None or (field_name == "printer" and not value):
+                    continue
+                values[field_name] = value
+                pending.discard(field_name)
+        return RuleResult(**values)
+
+    def printers(self) -> set[str]:
+        return {rule.printer for rule in self.rules if rule.printer}
+
+    def _prefix_mask(self, directory: str) -> int:
+        mask = self._dir_masks.get(directory)
+        if mask is None:
+            mask = self._any_prefix
+            node = self._trie
+            for part in _split_dirs(directory):
+                node = node.children.get(part)
+                if node is None:
+                    break
+                mask |= node.mask
+            self._dir_masks[directory] = mask
+        return mask
+
+    def _name_mask(self, name: str, candidates: int) -> int:
+        mask = self._any_name
+        # Cheap substring checks drop most pattern rules before the combined regex runs.
+        if candidates & self._literal_rules:
+            present = 0
+            for match in self._literal_regex.finditer(name.lower()):
+                present |= self._literal_bits[match.group(1)]
+            candidates &= ~(self._literal_rules & ~present)
+        remaining = candidates & ~mask & self._named
+        if not remaining:
+            return mask
+        individual = remaining & self._individual
+        remaining &= ~individual
+        if remaining.bit_count() <= self.INDIVIDUAL_MATCH_LIMIT:
+            individual |= remaining
+            remaining = 0
+        while individual:
+            bit = individual & -individual
+            individual ^= bit
+            if self._name_matchers[bit](name):
+                mask |= bit
+        if not remaining:
+            return mask
+        match = self._name_regex.match(name)
+        if match is not None:
+            regs = match.regs
+            for group, bit in self._name_groups:
+                if regs[group][0] >= 0:
+                    mask |= bit
+        return mask
+
+
+def compile_rules(
+    routing_rules: Iterable[dict],
+    extension_rules: dict,
+    version: int = 0,
+    page_counter: Callable[[str], int | None] | None = None,
+) -> CompiledRules:
+    logger = logging.getLogger(__name__)
+    rules: list[RoutingRule] = []
+    for data in routing_rules:
+        if not isinstance(data, dict):
+            continue
+        try:
+            rule = RoutingRule.from_dict(data)
+        except re.error as exc:
+            logger.warning("Skipping routing rule %s: invalid regex (%s)", data.get("name", ""), exc)
+            continue
+        if rule.has_action():
+            rules.append(rule)
+    # The per-extension rules edited in the settings panel act as the lowest-priority fallback.
+    for ext, data in extension_rules.items():
+        if isinstance(data, dict):
+            rule = RoutingRule.from_dict({**data, "extensions": [ext]})
+            if rule.has_action():
+                rules.append(rule)
+    return CompiledRules(rules, version, page_counter)
+
+
+def pdf_page_count(file_path: str) -> int | None:
+    if not file_path.lower().endswith(".pdf"):
+        return None
+    return file_facts().pages(file_path)
+
+
+_file_facts: FileFacts | None = None
+_file_facts_lock = threading.Lock()
+
+
+def file_facts() -> FileFacts:
+    global _file_facts
+    with _file_facts_lock:
+        if _file_facts is None:
+            _file_facts = FileFacts(_open_page_count)
+        return _file_facts
+
+
+def _open_page_count(file_path: str) -> int | None:
+    if not file_path.lower().endswith(".pdf"):
+        return None
+    try:
+        import fitz  # type: ignore
+    except Exception:
+        return None
+    try:
+        with fitz.open(file_path) as doc:
+            return doc.page_count
+    except Exception:
+        return None
+
+
+def _compilable(rules: list[RoutingRule]) -> list[RoutingRule]:
+    result = []
+    for rule in rules:
+        try:
+            _name_matcher(rule)
+        except re.error as exc:
+            logging.getLogger(__name__).warning("Skipping routing rule %s: invalid pattern (%s)", rule.name, exc)
+            continue
+        result.append(rule)
+    return result
+
+
+def _name_matcher(rule: RoutingRule) -> Callable[[str], re.Match | None]:
+    if rule.pattern:
+        return re.compile(fnmatch.translate(rule.pattern), re.IGNORECASE | re.DOTALL).match
+    if rule.regex:
+        return re.compile(rule.regex, re.IGNORECASE | re.DOTALL).search
+    return lambda name: None
+
+
+def _glob_literal(pattern: str) -> str:
+    # A bracket expression matches one of several characters, so none of them is required.
+    # "[!]...]" and "[]...]" keep a leading "]" inside the class, as fnmatch does.
+    pattern = re.sub(r"\[!?\]?[^\]]*\]", "*", pattern.lower())
+    return max(re.split(r"[*?\[\]]", pattern), key=len)
+
+
+def _regex_literal(regex: str) -> str:
+    if "|" in regex:
+        return ""
+    chars = []
+    for char in regex.lstrip("^"):
+        if char in ".^$*+?{}[]\\()":
+            if char in "*?{" and chars:
+                chars.pop()
+            break
+        chars.append(char)
+    return "".join(chars).lower()
+
+
+def _split_path(file_path: str) -> tuple[str, str]:
+    index = max(file_path.rfind("/"), file_path.rfind("\\"))
+    if index < 0:
+        return "", file_path
+    return file_path[:index], file_path[index + 1 :]
+
+
+def _split_dirs(path: str) -> list[str]:
+    return [part for part in path.replace("\\", "/").casefold().split("/") if part]
+
+
+def _normalize_extension(ext: str) -> str:
+    ext = str(ext).strip().lower()
+    return ext if ext.startswith(".") else f".{ext}"
+
+
+def _parse_duplex(value) -> DuplexMode | None:
+    if not value:
+        return None
+    try:
+        return DuplexMode(value)
+    except ValueError:
+        pass
+    try:
+        return DuplexMode[str(value).upper()]
+    except KeyError:
+        return None
+
+
+def _in_range(value: int, minimum: int, maximum: int) -> bool:
+    if minimum and value < minimum:
+        return False
+    if maximum and value > maximum:
+        return False
+    return True
+
+
+def _int(value) -> int:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _kb(value) -> int:
+    return _int(value) * 1024
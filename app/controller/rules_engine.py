@@ -1,19 +1,39 @@
 from __future__ import annotations
 
-from pathlib import Path
+from dataclasses import replace
 
 from app.app_context import AppContext
+from app.controller.rule_compiler import CompiledRules, RuleResult, compile_rules
+from app.model.print_job import JobSettings
 
 
 class RulesEngine:
     def __init__(self, context: AppContext) -> None:
         self._context = context
+        self._compiled: CompiledRules | None = None
+
+    def compiled(self) -> CompiledRules:
+        compiled = self._compiled
+        if compiled is None or compiled.version != self._context.rules_version:
+            compiled = compile_rules(
+                self._context.routing_rules,
+                self._context.rules,
+                self._context.rules_version,
+            )
+            self._compiled = compiled
+        return compiled
+
+    def resolve(self, file_path: str) -> RuleResult:
+        return self.compiled().resolve(file_path)
 
     def resolve_printer(self, file_path: str, default_printer: str) -> str:
-        ext = Path(file_path).suffix.lower()
-        rule = self._context.rules.get(ext)
-        if isinstance(rule, dict):
-            printer = rule.get("printer", "")
-            if printer:
-                return printer
-        return default_printer
+        return self.resolve(file_path).printer or default_printer
+
+    def resolve_settings(self, file_path: str, base: JobSettings) -> JobSettings:
+        result = self.resolve(file_path)
+        overrides = {
+            name: getattr(result, name)
+            for name in ("copies", "duplex", "paper_size", "quality")
+            if getattr(result, name) is not None
+        }
+        return replace(base, **overrides) if overrides else base
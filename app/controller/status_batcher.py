@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from PySide6 import QtCore
+
+from app.model.print_job import JobStatus
+
+
+@dataclass
+class StatusUpdate:
+    job_id: str
+    status: JobStatus
+    message: str = ""
+    summary: str = ""
+
+
+class StatusBatcher(QtCore.QObject):
+    """Coalesces status changes from worker threads and delivers them to the GUI at a bounded rate."""
+
+    flushed = QtCore.Signal(list)
+    progress = QtCore.Signal(int, int, str)
+
+    def __init__(self, interval_ms: int = 50, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._pending: OrderedDict[str, StatusUpdate] = OrderedDict()
+        self._failed: list[StatusUpdate] = []
+        self._progress: tuple[int, int, str] | None = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def start(self) -> None:
+        self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self.flush()
+
+    def post(self, job_id: str, status: JobStatus, message: str = "", summary: str = "") -> None:
+        update = StatusUpdate(job_id, status, message, summary)
+        with self._lock:
+            self._pending.pop(job_id, None)
+            self._pending[job_id] = update
+            if status == JobStatus.FAILED:
+                self._failed.append(update)
+
+    def post_progress(self, completed: int, total: int, current: str) -> None:
+        with self._lock:
+            self._progress = (completed, total, current)
+
+    def flush(self) -> None:
+        with self._lock:
+            updates = list(self._pending.values())
+            failed = self._failed
+            progress = self._progress
+            self._pending.clear()
+            self._failed = []
+            self._progress = None
+        if updates:
+            # A failure that was superseded within the same window (e.g. a retry)
+            # is still delivered so that it is not lost from the failure report.
+            delivered = {id(update) for update in updates}
+            updates = [update for update in failed if id(update) not in delivered] + updates
+            self.flushed.emit(updates)
+        if progress is not None:
+            self.progress.emit(*progress)
@@ -174,7 +174,7 @@ class UpdateManager(QtCore.QObject):
         self._checker.checked.connect(lambda info, err: self._on_checked(info, err, manual))
         self._checker.start()
         self._context.settings.last_update_check = _iso_now()
-        self._context.save_settings()
+        self._context.save_settings({"last_update_check"})
 
     def _on_checked(self, info: UpdateInfo | None, error: str, manual: bool) -> None:
         if error:
@@ -159,6 +159,43 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "excel_orientation_select_all": "すべて適用",
         "excel_orientation_clear": "すべて解除",
         "update_checking": "更新を確認中...",
+        "ingest_progress_fmt": "追加中: {added} 件（確認 {scanned} 件）",
+        "ingest_cancel": "追加をキャンセル",
+        "menu_view": "表示",
+        "failure_panel_title": "印刷エラー",
+        "failure_count": "件数",
+        "failure_count_fmt": "失敗: {count} 件",
+        "failure_retry_selected": "選択を再印刷",
+        "failure_retry_all": "すべて再印刷",
+        "failure_clear": "一覧をクリア",
+        "settings_schedule": "印刷順序",
+        "schedule_fifo": "リストの順番",
+        "schedule_priority": "選択した行を優先",
+        "schedule_sjf": "ページ数の少ない順",
+        "schedule_grouped": "アプリとプリンターでまとめる",
+        "settings_keep_folder_order": "同じフォルダー内の順番を保つ",
+        "title_resume": "前回の印刷の再開",
+        "msg_resume_fmt": "前回の印刷は {total} 件中 {done} 件が完了したところで中断されました。\n残りの印刷を再開しますか？",
+        "status_memory_fmt": "メモリ: {used} / {budget} MB",
+        "status_memory_waiting_fmt": "（待機 {waiting} 件）",
+        "action_autotune_report": "自動調整レポート",
+        "autotune_title": "自動調整レポート",
+        "autotune_heading": "プリンターごとの自動調整の履歴",
+        "autotune_disabled": "自動調整はオフです（設定 autotune_enabled）。これまでの記録を表示します。",
+        "autotune_current_fmt": "{printer}: 解像度 {dpi} DPI / 先行投入 {depth} 件",
+        "autotune_time": "日時",
+        "autotune_printer": "プリンター",
+        "autotune_setting": "項目",
+        "autotune_change": "変更",
+        "autotune_reason": "理由",
+        "autotune_empty": "まだ調整していません。",
+        "autotune_default": "既定",
+        "autotune_knob_dpi": "PDF の解像度 (DPI)",
+        "autotune_knob_queue_depth": "スプーラーへの先行投入数",
+        "autotune_default_printer": "既定のプリンター",
+        "context_job_settings": "部数・両面を指定…",
+        "job_settings_title": "部数・両面の個別指定",
+        "job_settings_inherit": "既定に従う",
     },
     "en": {
         "app_title": "Raku Print",
@@ -299,6 +336,43 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "excel_orientation_select_all": "Apply all",
         "excel_orientation_clear": "Clear all",
         "update_checking": "Checking for updates...",
+        "ingest_progress_fmt": "Adding: {added} files ({scanned} checked)",
+        "ingest_cancel": "Cancel adding",
+        "menu_view": "View",
+        "failure_panel_title": "Print errors",
+        "failure_count": "Count",
+        "failure_count_fmt": "Failed: {count}",
+        "failure_retry_selected": "Retry selected",
+        "failure_retry_all": "Retry all",
+        "failure_clear": "Clear list",
+        "settings_schedule": "Print order",
+        "schedule_fifo": "List order",
+        "schedule_priority": "Selected rows first",
+        "schedule_sjf": "Shortest first",
+        "schedule_grouped": "Group by app and printer",
+        "settings_keep_folder_order": "Keep order within each folder",
+        "title_resume": "Resume Printing",
+        "msg_resume_fmt": "The last print run stopped after {done} of {total} jobs.\nResume printing the rest?",
+        "status_memory_fmt": "Memory: {used} / {budget} MB",
+        "status_memory_waiting_fmt": " ({waiting} waiting)",
+        "action_autotune_report": "Autotune Report",
+        "autotune_title": "Autotune Report",
+        "autotune_heading": "Autotune history per printer",
+        "autotune_disabled": "Autotuning is off (setting autotune_enabled). Showing earlier results.",
+        "autotune_current_fmt": "{printer}: {dpi} DPI / {depth} jobs ahead",
+        "autotune_time": "Time",
+        "autotune_printer": "Printer",
+        "autotune_setting": "Setting",
+        "autotune_change": "Change",
+        "autotune_reason": "Reason",
+        "autotune_empty": "Nothing has been tuned yet.",
+        "autotune_default": "default",
+        "autotune_knob_dpi": "PDF resolution (DPI)",
+        "autotune_knob_queue_depth": "Jobs sent ahead to the spooler",
+        "autotune_default_printer": "Default printer",
+        "context_job_settings": "Set copies/duplex…",
+        "job_settings_title": "Per-file copies and duplex",
+        "job_settings_inherit": "Use default",
     },
     "ko": {
         "app_title": "라쿠 인쇄",
@@ -439,6 +513,43 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "excel_orientation_select_all": "모두 적용",
         "excel_orientation_clear": "모두 해제",
         "update_checking": "업데이트 확인 중...",
+        "ingest_progress_fmt": "추가 중: {added}개 ({scanned}개 확인)",
+        "ingest_cancel": "추가 취소",
+        "menu_view": "보기",
+        "failure_panel_title": "인쇄 오류",
+        "failure_count": "건수",
+        "failure_count_fmt": "실패: {count}건",
+        "failure_retry_selected": "선택 항목 다시 인쇄",
+        "failure_retry_all": "모두 다시 인쇄",
+        "failure_clear": "목록 지우기",
+        "settings_schedule": "인쇄 순서",
+        "schedule_fifo": "목록 순서",
+        "schedule_priority": "선택한 행 우선",
+        "schedule_sjf": "페이지 수가 적은 순",
+        "schedule_grouped": "앱과 프린터별로 묶기",
+        "settings_keep_folder_order": "같은 폴더 안의 순서 유지",
+        "title_resume": "이전 인쇄 재개",
+        "msg_resume_fmt": "이전 인쇄가 {total}건 중 {done}건 완료 후 중단되었습니다.\n남은 인쇄를 재개하시겠습니까?",
+        "status_memory_fmt": "메모리: {used} / {budget} MB",
+        "status_memory_waiting_fmt": " (대기 {waiting}건)",
+        "action_autotune_report": "자동 조정 보고서",
+        "autotune_title": "자동 조정 보고서",
+        "autotune_heading": "프린터별 자동 조정 기록",
+        "autotune_disabled": "자동 조정이 꺼져 있습니다(설정 autotune_enabled). 이전 기록을 표시합니다.",
+        "autotune_current_fmt": "{printer}: 해상도 {dpi} DPI / 선행 투입 {depth}건",
+        "autotune_time": "일시",
+        "autotune_printer": "프린터",
+        "autotune_setting": "항목",
+        "autotune_change": "변경",
+        "autotune_reason": "이유",
+        "autotune_empty": "아직 조정하지 않았습니다.",
+        "autotune_default": "기본값",
+        "autotune_knob_dpi": "PDF 해상도 (DPI)",
+        "autotune_knob_queue_depth": "스풀러 선행 투입 수",
+        "autotune_default_printer": "기본 프린터",
+        "context_job_settings": "부수·양면 지정…",
+        "job_settings_title": "파일별 부수·양면",
+        "job_settings_inherit": "기본값 사용",
     },
     "zh": {
         "app_title": "乐印",
@@ -579,6 +690,43 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "excel_orientation_select_all": "全部应用",
         "excel_orientation_clear": "全部取消",
         "update_checking": "正在检查更新...",
+        "ingest_progress_fmt": "正在添加: {added} 个（已检查 {scanned} 个）",
+        "ingest_cancel": "取消添加",
+        "menu_view": "视图",
+        "failure_panel_title": "打印错误",
+        "failure_count": "数量",
+        "failure_count_fmt": "失败: {count} 个",
+        "failure_retry_selected": "重新打印所选",
+        "failure_retry_all": "全部重新打印",
+        "failure_clear": "清除列表",
+        "settings_schedule": "打印顺序",
+        "schedule_fifo": "列表顺序",
+        "schedule_priority": "优先打印所选行",
+        "schedule_sjf": "页数少的优先",
+        "schedule_grouped": "按应用和打印机分组",
+        "settings_keep_folder_order": "保持同一文件夹内的顺序",
+        "title_resume": "继续上次打印",
+        "msg_resume_fmt": "上次打印在完成 {total} 个中的 {done} 个后中断。\n要继续打印剩余的文件吗？",
+        "status_memory_fmt": "内存: {used} / {budget} MB",
+        "status_memory_waiting_fmt": "（等待 {waiting} 个）",
+        "action_autotune_report": "自动调整报告",
+        "autotune_title": "自动调整报告",
+        "autotune_heading": "各打印机的自动调整记录",
+        "autotune_disabled": "自动调整已关闭（设置 autotune_enabled）。显示以往的记录。",
+        "autotune_current_fmt": "{printer}: 分辨率 {dpi} DPI / 预先提交 {depth} 个",
+        "autotune_time": "时间",
+        "autotune_printer": "打印机",
+        "autotune_setting": "项目",
+        "autotune_change": "变更",
+        "autotune_reason": "原因",
+        "autotune_empty": "尚未进行调整。",
+        "autotune_default": "默认",
+        "autotune_knob_dpi": "PDF 分辨率 (DPI)",
+        "autotune_knob_queue_depth": "预先提交到后台处理程序的数量",
+        "autotune_default_printer": "默认打印机",
+        "context_job_settings": "指定份数/双面…",
+        "job_settings_title": "单独设置份数和双面",
+        "job_settings_inherit": "使用默认",
     },
 }
 
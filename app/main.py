@@ -18,7 +18,7 @@ from app.controller.job_manager import JobManager
 from app.ui.main_window import MainWindow
 from app.ui.theme import apply_theme
 from app.ui.icon_data import ICON_PNG_BASE64
-from app.backend import pdf_worker
+from app.backend import office_worker, pdf_worker
 from app.i18n import set_language, resolve_language
 from app.updater import apply_update
 
@@ -63,6 +63,9 @@ def main() -> int:
     if "--pdf-worker" in sys.argv:
         return pdf_worker.main()
 
+    if "--office-worker" in sys.argv:
+        return office_worker.main()
+
     if "--apply-update" in sys.argv:
         idx = sys.argv.index("--apply-update")
         return apply_update(sys.argv[idx + 1 :])
@@ -77,6 +80,7 @@ def main() -> int:
     job_manager = JobManager(context)
     window = MainWindow(context, job_manager)
     window.show()
+    app.aboutToQuit.connect(context.close)
     return app.exec()
 
 
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List
+
+from app.model.job_store import job_from_record, job_to_record
+from app.model.print_job import PrintJob
+
+
+@dataclass
+class JournalSnapshot:
+    jobs: List[PrintJob] = field(default_factory=list)
+    # True when the journal ends inside a print run, i.e. the app stopped while printing.
+    running: bool = False
+
+
+class JobJournal:
+    """Append-only log of the job list so that a crashed session can be resumed.
+
+    Every change is appended as one JSON line (full job rows, removals, order and
+    run markers). A background thread writes the lines and fsyncs them in batches,
+    so a crash loses at most the last sync interval. replay() folds the log back
+    into the job list; compact() rewrites it as a snapshot of the current list.
+    """
+
+    SYNC_INTERVAL = 0.5
+    BATCH_SIZE = 500
+
+    def __init__(self, path: Path, sync_interval: float = SYNC_INTERVAL, batch_size: int = BATCH_SIZE) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._sync_interval = sync_interval
+        self._batch_size = batch_size
+        self._condition = threading.Condition()
+        # Entries are encoded on the writer thread; job records are copies taken at append time.
+        self._pending: list[dict] = []
+        self._first_pending = 0.0
+        self._writing = False
+        self._closed = False
+        self._entries = _count_lines(self._path)
+        self._syncs = 0
+        self._handle = open(self._path, "a", encoding="utf-8")
+        self._logger = logging.getLogger(__name__)
+        self._thread = threading.Thread(target=self._run, name="job-journal", daemon=True)
+        self._thread.start()
+
+    @property
+    def entries(self) -> int:
+        with self._condition:
+            return self._entries
+
+    def append_jobs(self, jobs: Iterable[PrintJob]) -> None:
+        self._append({"op": "job", "job": job_to_record(job)} for job in jobs)
+
+    def append_removed(self, job_ids: Iterable[str]) -> None:
+        self._append([{"op": "remove", "ids": list(job_ids)}])
+
+    def append_order(self, job_ids: Iterable[str]) -> None:
+        self._append([{"op": "order", "ids": list(job_ids)}])
+
+    def append_clear(self) -> None:
+        self._append([{"op": "clear"}])
+
+    def append_run(self, active: bool) -> None:
+        self._append([{"op": "run", "active": active}])
+
+    def sync(self) -> None:
+        with self._condition:
+            self._first_pending = 0.0
+            self._condition.notify_all()
+            while (self._pending or self._writing) and not self._closed:
+                self._condition.wait()
+
+    def compact(self, jobs: Iterable[PrintJob], running: bool = False) -> None:
+        lines = [_encode({"op": "job", "job": job_to_record(job)}) for job in jobs]
+        if running:
+            lines.append(_encode({"op": "run", "active": True}))
+        with self._condition:
+            # The snapshot supersedes anything not yet written; wait out a batch in flight
+            # so that it cannot land after the snapshot.
+            self._pending = []
+            while self._writing:
+                self._condition.wait()
+            self._handle.close()
+            tmp_path = self._path.with_name(self._path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                handle.writelines(lines)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, self._path)
+            self._handle = open(self._path, "a", encoding="utf-8")
+            self._entries = len(lines)
+
+    def close(self, discard: bool = False) -> None:
+        self.sync()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._handle.close()
+        if discard:
+            try:
+                self._path.unlink()
+            except OSError:
+                pass
+        self._logger.info("Job journal closed after %s syncs", self._syncs)
+
+    @staticmethod
+    def replay(path: Path) -> JournalSnapshot:
+        path = Path(path)
+        if not path.exists():
+            return JournalSnapshot()
+        records: OrderedDict[str, dict] = OrderedDict()
+        running = False
+        logger = logging.getLogger(__name__)
+        with open(path, "r", encoding="utf-8", errors="replace") as handle:
+            for number, line in enumerate(handle, 1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Typically the last line, torn by the crash.
+                    logger.warning("Skipping unreadable journal line %s", number)
+                    continue
+                op = entry.get("op")
+                if op == "job":
+                    record = entry.get("job") or {}
+                    if record.get("id"):
+                        records[record["id"]] = record
+                elif op == "remove":
+                    for job_id in entry.get("ids", []):
+                        records.pop(job_id, None)
+                elif op == "order":
+                    ordered = OrderedDict(
+                        (job_id, records[job_id]) for job_id in entry.get("ids", []) if job_id in records
+                    )
+                    ordered.update(records)
+                    records = ordered
+                elif op == "clear":
+                    records.clear()
+                elif op == "run":
+                    running = bool(entry.get("active"))
+        jobs = []
+        for record in records.values():
+            try:
+                jobs.append(job_from_record(record))
+            except (KeyError, TypeError, ValueError):
+                logger.warning("Skipping unreadable journal job %s", record.get("id"))
+        return JournalSnapshot(jobs, running and bool(jobs))
+
+    def _append(self, entries: Iterable[dict]) -> None:
+        lines = list(entries)
+        if not lines:
+            return
+        with self._condition:
+            if self._closed:
+                return
+            first = not self._pending
+            if first:
+                self._first_pending = time.monotonic()
+            self._pending.extend(lines)
+            self._entries += len(lines)
+            if first or len(self._pending) >= self._batch_size:
+                self._condition.notify_all()
+
+    def _run(self) -> None:
+        with self._condition:
+            while True:
+                if not self._pending:
+                    if self._closed:
+                        return
+                    self._condition.wait()
+                    continue
+                wait = self._first_pending + self._sync_interval - time.monotonic()
+                if wait > 0 and len(self._pending) < self._batch_size and not self._closed:
+                    self._condition.wait(wait)
+                    continue
+                entries, self._pending = self._pending, []
+                self._writing = True
+                self._condition.release()
+                try:
+                    self._write([_encode(entry) for entry in entries])
+                finally:
+                    self._condition.acquire()
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write(self, lines: list[str]) -> None:
+        try:
+            self._handle.writelines(lines)
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self._syncs += 1
+        except Exception:
+            self._logger.exception("Failed to write job journal %s", self._path)
+
+
+class JournaledJobStore:
+    """Wraps a job store and records every change in a JobJournal."""
+
+    def __init__(self, store, journal: JobJournal) -> None:
+        self._store = store
+        self._journal = journal
+
+    @property
+    def journal(self) -> JobJournal:
+        return self._journal
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, index: int) -> PrintJob:
+        return self._store.get(index)
+
+    def find(self, job_id: str) -> PrintJob | None:
+        return self._store.find(job_id)
+
+    def index_of(self, job_id: str) -> int:
+        return self._store.index_of(job_id)
+
+    def has_path(self, file_path: str) -> bool:
+        return self._store.has_path(file_path)
+
+    def paths(self) -> set[str]:
+        return self._store.paths()
+
+    def extend(self, jobs: Iterable[PrintJob], journal: bool = True) -> None:
+        jobs = list(jobs)
+        self._store.extend(jobs)
+        if journal:
+            self._journal.append_jobs(jobs)
+
+    def save(self, job: PrintJob) -> None:
+        self._store.save(job)
+        self._journal.append_jobs([job])
+
+    def save_many(self, jobs: Iterable[PrintJob]) -> None:
+        jobs = list(jobs)
+        self._store.save_many(jobs)
+        self._journal.append_jobs(jobs)
+
+    def remove(self, job_ids: Iterable[str]) -> int:
+        job_ids = list(job_ids)
+        removed = self._store.remove(job_ids)
+        if removed:
+            self._journal.append_removed(job_ids)
+        return removed
+
+    def move(self, from_index: int, to_index: int) -> None:
+        self._store.move(from_index, to_index)
+        self._journal.append_order(job.id for job in self._store.iter_jobs())
+
+    def reorder(self, job_ids: List[str]) -> None:
+        self._store.reorder(job_ids)
+        self._journal.append_order(job_ids)
+
+    def clear(self) -> None:
+        self._store.clear()
+        self._journal.append_clear()
+
+    def iter_jobs(self, predicate: Callable[[PrintJob], bool] | None = None) -> Iterator[PrintJob]:
+        return self._store.iter_jobs(predicate)
+
+    def count_by_status(self) -> Counter:
+        return self._store.count_by_status()
+
+    def close(self) -> None:
+        self._store.close()
+        # A clean shutdown leaves nothing to resume.
+        self._journal.close(discard=True)
+
+
+def _encode(entry: dict) -> str:
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _count_lines(path: Path) -> int:
+    try:
+        with open(path, "rb") as handle:
+            return sum(1 for _line in handle)
+    except OSError:
+        return 0
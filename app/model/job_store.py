@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List
+
+import json
+import sqlite3
+import threading
+
+from app.model.print_job import PrintJob, FileType, DuplexMode, JobStatus
+
+
+class MemoryJobStore:
+    def __init__(self) -> None:
+        self._jobs: List[PrintJob] = []
+        self._rows: dict[str, int] | None = None
+        self._paths: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def get(self, index: int) -> PrintJob:
+        return self._jobs[index]
+
+    def find(self, job_id: str) -> PrintJob | None:
+        row = self.index_of(job_id)
+        return self._jobs[row] if row >= 0 else None
+
+    def index_of(self, job_id: str) -> int:
+        if self._rows is None:
+            self._rows = {job.id: row for row, job in enumerate(self._jobs)}
+        return self._rows.get(job_id, -1)
+
+    def has_path(self, file_path: str) -> bool:
+        return file_path in self._paths
+
+    def paths(self) -> set[str]:
+        return set(self._paths)
+
+    def extend(self, jobs: Iterable[PrintJob]) -> None:
+        for job in jobs:
+            if self._rows is not None:
+                self._rows[job.id] = len(self._jobs)
+            self._jobs.append(job)
+            self._paths.add(job.file_path)
+
+    def save(self, job: PrintJob) -> None:
+        return
+
+    def save_many(self, jobs: Iterable[PrintJob]) -> None:
+        return
+
+    def remove(self, job_ids: Iterable[str]) -> int:
+        ids = set(job_ids)
+        before = len(self._jobs)
+        self._jobs = [job for job in self._jobs if job.id not in ids]
+        self._paths = {job.file_path for job in self._jobs}
+        self._rows = None
+        return before - len(self._jobs)
+
+    def move(self, from_index: int, to_index: int) -> None:
+        job = self._jobs.pop(from_index)
+        self._jobs.insert(to_index, job)
+        self._rows = None
+
+    def reorder(self, job_ids: List[str]) -> None:
+        by_id = {job.id: job for job in self._jobs}
+        self._jobs = [by_id[job_id] for job_id in job_ids if job_id in by_id]
+        self._rows = None
+
+    def clear(self) -> None:
+        self._jobs.clear()
+        self._paths.clear()
+        self._rows = None
+
+    def iter_jobs(self, predicate: Callable[[PrintJob], bool] | None = None) -> Iterator[PrintJob]:
+        for job in list(self._jobs):
+            if predicate is None or predicate(job):
+                yield job
+
+    def count_by_status(self) -> Counter:
+        return Counter(job.status for job in self._jobs)
+
+    def close(self) -> None:
+        return
+
+
+_COLUMNS = (
+    "id",
+    "position",
+    "file_path",
+    "file_type",
+    "printer_name",
+    "copies",
+    "duplex",
+    "manual_printer",
+    "enabled",
+    "status",
+    "message",
+    "summary",
+    "excel_sheets",
+    "excel_auto_orientation",
+    "paper_size",
+    "priority",
+)
+
+
+class SqliteJobStore:
+    """Disk-backed job list for very large batches.
+
+    Only the row order (job ids) is kept in memory; job rows are materialized
+    on demand and kept in a small LRU cache.
+    """
+
+    CHUNK_SIZE = 500
+
+    def __init__(self, db_path: Path, cache_size: int = 2000) -> None:
+        self._db_path = Path(db_path)
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        self._order: List[str] = []
+        self._rows: dict[str, int] | None = None
+        self._cache: OrderedDict[str, PrintJob] = OrderedDict()
+        self._cache_size = cache_size
+
+    def _create_schema(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DROP TABLE IF EXISTS jobs")
+            self._conn.execute(
+                """
+                CREATE TABLE jobs (
+                    id TEXT PRIMARY KEY,
+                    position INTEGER NOT NULL,
+                    file_path TEXT NOT NULL,
+                    file_type TEXT NOT NULL,
+                    printer_name TEXT NOT NULL,
+                    copies INTEGER,
+                    duplex TEXT,
+                    manual_printer INTEGER NOT NULL,
+                    enabled INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    excel_sheets TEXT NOT NULL,
+                    excel_auto_orientation INTEGER NOT NULL,
+                    paper_size TEXT,
+                    priority INTEGER NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX idx_jobs_status ON jobs(status)")
+            self._conn.execute("CREATE INDEX idx_jobs_printer ON jobs(printer_name)")
+            self._conn.execute("CREATE UNIQUE INDEX idx_jobs_path ON jobs(file_path)")
+            self._conn.execute("CREATE INDEX idx_jobs_position ON jobs(position)")
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def get(self, index: int) -> PrintJob:
+        job = self.find(self._order[index])
+        if job is None:
+            raise IndexError(index)
+        return job
+
+    def find(self, job_id: str) -> PrintJob | None:
+        with self._lock:
+            job = self._cache.get(job_id)
+            if job is not None:
+                self._cache.move_to_end(job_id)
+                return job
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            job = _row_to_job(row)
+            self._remember(job)
+            return job
+
+    def index_of(self, job_id: str) -> int:
+        with self._lock:
+            if self._rows is None:
+                self._rows = {job_id: row for row, job_id in enumerate(self._order)}
+            return self._rows.get(job_id, -1)
+
+    def has_path(self, file_path: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM jobs WHERE file_path = ?", (file_path,)).fetchone()
+        return row is not None
+
+    def paths(self) -> set[str]:
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT file_path FROM jobs")}
+
+    def extend(self, jobs: Iterable[PrintJob]) -> None:
+        with self._lock, self._conn:
+            start = len(self._order)
+            batch = list(jobs)
+            self._conn.executemany(
+                f"INSERT INTO jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                [_job_to_row(job, start + offset) for offset, job in enumerate(batch)],
+            )
+            for job in batch:
+                if self._rows is not None:
+                    self._rows[job.id] = len(self._order)
+                self._order.append(job.id)
+                self._remember(job)
+
+    def save(self, job: PrintJob) -> None:
+        self.save_many([job])
+
+    def save_many(self, jobs: Iterable[PrintJob]) -> None:
+        with self._lock, self._conn:
+            rows = []
+            for job in jobs:
+                row = _job_to_row(job, 0)
+                rows.append(row[2:] + (row[0],))
+            if not rows:
+                return
+            assignments = ", ".join(f"{name} = ?" for name in _COLUMNS[2:])
+            self._conn.executemany(f"UPDATE jobs SET {assignments} WHERE id = ?", rows)
+
+    def remove(self, job_ids: Iterable[str]) -> int:
+        ids = set(job_ids)
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in ids])
+            before = len(self._order)
+            self._order = [job_id for job_id in self._order if job_id not in ids]
+            for job_id in ids:
+                self._cache.pop(job_id, None)
+            self._rows = None
+            removed = before - len(self._order)
+            if removed:
+                self._write_positions()
+            return removed
+
+    def move(self, from_index: int, to_index: int) -> None:
+        with self._lock:
+            job_id = self._order.pop(from_index)
+            self._order.insert(to_index, job_id)
+            self._rows = None
+            with self._conn:
+                self._write_positions()
+
+    def reorder(self, job_ids: List[str]) -> None:
+        with self._lock:
+            known = set(self._order)
+            self._order = [job_id for job_id in job_ids if job_id in known]
+            self._rows = None
+            with self._conn:
+                self._write_positions()
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM jobs")
+            self._order.clear()
+            self._cache.clear()
+            self._rows = None
+
+    def iter_jobs(self, predicate: Callable[[PrintJob], bool] | None = None) -> Iterator[PrintJob]:
+        last_position = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE position > ? ORDER BY position LIMIT ?",
+                    (last_position, self.CHUNK_SIZE),
+                ).fetchall()
+                jobs = [self._cache.get(row[0]) or _row_to_job(row) for row in rows]
+            if not rows:
+                return
+            last_position = rows[-1][1]
+            for job in jobs:
+                if predicate is None or predicate(job):
+                    yield job
+
+    def count_by_status(self) -> Counter:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts: Counter = Counter()
+        for status, count in rows:
+            try:
+                counts[JobStatus(status)] = count
+            except ValueError:
+                continue
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        try:
+            self._db_path.unlink()
+        except OSError:
+            pass
+
+    def _remember(self, job: PrintJob) -> None:
+        self._cache[job.id] = job
+        self._cache.move_to_end(job.id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _write_positions(self) -> None:
+        self._conn.executemany(
+            "UPDATE jobs SET position = ? WHERE id = ?",
+            [(position, job_id) for position, job_id in enumerate(self._order)],
+        )
+
+
+def _job_to_row(job: PrintJob, position: int) -> tuple:
+    return (
+        job.id,
+        position,
+        job.file_path,
+        job.file_type.value,
+        job.printer_name,
+        job.copies,
+        job.duplex.value if job.duplex is not None else None,
+        int(job.manual_printer),
+        int(job.enabled),
+        job.status.value,
+        job.message,
+        job.summary,
+        json.dumps(job.excel_sheets, ensure_ascii=False),
+        int(job.excel_auto_orientation),
+        job.paper_size,
+        job.priority,
+    )
+
+
+def _row_to_job(row: tuple) -> PrintJob:
+    return PrintJob(
+        id=row[0],
+        file_path=row[2],
+        file_type=FileType(row[3]),
+        printer_name=row[4],
+        copies=row[5],
+        duplex=DuplexMode(row[6]) if row[6] is not None else None,
+        manual_printer=bool(row[7]),
+        enabled=bool(row[8]),
+        status=JobStatus(row[9]),
+        message=row[10],
+        summary=row[11],
+        excel_sheets=list(json.loads(row[12] or "[]")),
+        excel_auto_orientation=bool(row[13]),
+        paper_size=row[14],
+        priority=row[15],
+    )
+
+
+def job_to_record(job: PrintJob) -> dict:
+    record = dict(zip(_COLUMNS, _job_to_row(job, 0)))
+    del record["position"]
+    return record
+
+
+def job_from_record(record: dict) -> PrintJob:
+    row = tuple(record.get(column, 0) for column in _COLUMNS)
+    return _row_to_job(row)
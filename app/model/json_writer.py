@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class JsonFileWriter:
+    """Writes JSON files from a background thread, coalescing bursts of saves to the same file."""
+
+    def __init__(self, delay: float = 0.5, max_delay: float = 3.0) -> None:
+        self._delay = delay
+        self._max_delay = max_delay
+        self._condition = threading.Condition()
+        # path -> (data, first_scheduled, deadline)
+        self._pending: dict[Path, tuple[object, float, float]] = {}
+        self._writing = 0
+        self._closed = False
+        self._scheduled = 0
+        self._coalesced = 0
+        self._writes = 0
+        self._failures = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._logger = logging.getLogger(__name__)
+        self._thread = threading.Thread(target=self._run, name="json-writer", daemon=True)
+        self._thread.start()
+
+    def schedule(self, path: Path, data: object) -> None:
+        data = copy.deepcopy(data)
+        now = time.monotonic()
+        with self._condition:
+            if self._closed:
+                self._write(path, data)
+                return
+            self._scheduled += 1
+            previous = self._pending.get(path)
+            if previous:
+                self._coalesced += 1
+            first = previous[1] if previous else now
+            deadline = min(now + self._delay, first + self._max_delay)
+            self._pending[path] = (data, first, deadline)
+            self._condition.notify()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._pending = {path: (data, first, 0.0) for path, (data, first, _) in self._pending.items()}
+            self._condition.notify_all()
+            while self._pending or self._writing:
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def stats(self) -> dict[str, float]:
+        with self._condition:
+            return {
+                "scheduled": self._scheduled,
+                "writes": self._writes,
+                "coalesced": self._coalesced,
+                "failures": self._failures,
+                "avg_latency_ms": (self._total_latency / self._writes * 1000) if self._writes else 0.0,
+                "max_latency_ms": self._max_latency * 1000,
+            }
+
+    def _run(self) -> None:
+        with self._condition:
+            while True:
+                if self._closed and not self._pending:
+                    return
+                now = time.monotonic()
+                due = [path for path, (_, _, deadline) in self._pending.items() if deadline <= now]
+                if not due:
+                    timeout = min((deadline for _, _, deadline in self._pending.values()), default=None)
+                    self._condition.wait(None if timeout is None else max(0.0, timeout - now))
+                    continue
+                batch = [(path, self._pending.pop(path)[0]) for path in due]
+                self._writing += 1
+                self._condition.release()
+                try:
+                    for path, data in batch:
+                        self._write(path, data)
+                finally:
+                    self._condition.acquire()
+                    self._writing -= 1
+                    self._condition.notify_all()
+
+    def _write(self, path: Path, data: object) -> None:
+        started = time.perf_counter()
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(data, handle, indent=2)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            self._logger.exception("Failed to write %s", path)
+            with self._condition:
+                self._failures += 1
+            return
+        latency = time.perf_counter() - started
+        with self._condition:
+            self._writes += 1
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
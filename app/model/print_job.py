@@ -7,6 +7,9 @@ import uuid
 from typing import List
 
 
+SUPPORTED_EXTENSIONS = (".pdf", ".doc", ".docx", ".xls", ".xlsx", ".xlsm", ".ppt", ".pptx")
+
+
 class FileType(str, Enum):
     PDF = "PDF"
     WORD = "Word"
@@ -30,13 +33,28 @@ class JobStatus(str, Enum):
     SKIPPED = "スキップ"
 
 
+@dataclass
+class JobSettings:
+    copies: int = 1
+    duplex: DuplexMode = DuplexMode.OFF
+    paper_size: str = ""
+    quality: str = ""
+
+
+JOB_SETTING_FIELDS = ("copies", "duplex", "paper_size")
+
+PRIORITY_BULK = 0
+PRIORITY_INTERACTIVE = 1
+
+
 @dataclass
 class PrintJob:
     file_path: str
     file_type: FileType
     printer_name: str
-    copies: int
-    duplex: DuplexMode
+    # None means the value is inherited from the extension rule or the global settings.
+    copies: int | None = None
+    duplex: DuplexMode | None = None
     manual_printer: bool = False
     enabled: bool = True
     status: JobStatus = JobStatus.WAITING
@@ -44,7 +62,8 @@ class PrintJob:
     summary: str = ""
     excel_sheets: List[str] = field(default_factory=list)
     excel_auto_orientation: bool = False
-    paper_size: str = ""
+    paper_size: str | None = None
+    priority: int = PRIORITY_BULK
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
 
     @property
@@ -55,6 +74,9 @@ class PrintJob:
     def extension(self) -> str:
         return Path(self.file_path).suffix.lower()
 
+    def overrides(self) -> dict:
+        return {name: getattr(self, name) for name in JOB_SETTING_FIELDS if getattr(self, name) is not None}
+
     def display_printer(self) -> str:
         return self.printer_name or "自動"
 
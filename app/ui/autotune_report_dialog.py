@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from PySide6 import QtWidgets
+
+from app.controller.autotuner import KNOB_DPI, KNOB_QUEUE_DEPTH, TuningChange
+from app.i18n import t
+
+
+class AutotuneReportDialog(QtWidgets.QDialog):
+    def __init__(
+        self,
+        changes: Iterable[TuningChange],
+        current: dict[str, dict[str, int]],
+        enabled: bool,
+        parent: QtWidgets.QWidget | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._changes = list(changes)
+        self._current = current
+        self._enabled = enabled
+        self.resize(820, 420)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.title_label = QtWidgets.QLabel()
+        self.title_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(self.title_label)
+        self.current_label = QtWidgets.QLabel()
+        self.current_label.setWordWrap(True)
+        layout.addWidget(self.current_label)
+
+        self.table = QtWidgets.QTableWidget(0, 5)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.setAlternatingRowColors(True)
+        layout.addWidget(self.table)
+
+        button_layout = QtWidgets.QHBoxLayout()
+        button_layout.addStretch(1)
+        self.close_button = QtWidgets.QPushButton()
+        button_layout.addWidget(self.close_button)
+        layout.addLayout(button_layout)
+        self.close_button.clicked.connect(self.accept)
+
+        self.retranslate()
+
+    def retranslate(self) -> None:
+        self.setWindowTitle(t("autotune_title"))
+        self.title_label.setText(t("autotune_heading") if self._enabled else t("autotune_disabled"))
+        lines = [
+            t(
+                "autotune_current_fmt",
+                printer=printer or t("autotune_default_printer"),
+                dpi=_value_text(values.get(KNOB_DPI, 0)),
+                depth=_value_text(values.get(KNOB_QUEUE_DEPTH, 0)),
+            )
+            for printer, values in sorted(self._current.items())
+        ]
+        self.current_label.setText("\n".join(lines))
+        self.table.setHorizontalHeaderLabels(
+            [t("autotune_time"), t("autotune_printer"), t("autotune_setting"), t("autotune_change"), t("autotune_reason")]
+        )
+        self.close_button.setText(t("btn_close"))
+        self._set_rows()
+
+    def _set_rows(self) -> None:
+        self.table.setRowCount(0)
+        if not self._changes:
+            self.table.setRowCount(1)
+            self.table.setItem(0, 0, QtWidgets.QTableWidgetItem(t("autotune_empty")))
+            self.table.setSpan(0, 0, 1, 5)
+            return
+        for row, change in enumerate(self._changes):
+            self.table.insertRow(row)
+            setting = t("autotune_knob_dpi") if change.knob == KNOB_DPI else t("autotune_knob_queue_depth")
+            values = [
+                change.at.replace("T", " "),
+                change.printer or t("autotune_default_printer"),
+                setting,
+                f"{_value_text(change.old)} → {_value_text(change.new)}",
+                change.reason,
+            ]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QtWidgets.QTableWidgetItem(value))
+        self.table.resizeColumnsToContents()
+
+
+def _value_text(value: int) -> str:
+    return str(value) if value else t("autotune_default")
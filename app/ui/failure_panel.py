@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from app.i18n import t
+
+
+@dataclass
+class _FailureEntry:
+    job_id: str
+    file_name: str
+    message: str
+
+
+@dataclass
+class _FailureGroup:
+    summary: str
+    printer: str
+    entries: list[_FailureEntry] = field(default_factory=list)
+
+
+class FailureGroupModel(QtCore.QAbstractItemModel):
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self._groups: list[_FailureGroup] = []
+        self._group_rows: dict[tuple[str, str], int] = {}
+        self._job_groups: dict[str, tuple[str, str]] = {}
+
+    def failure_count(self) -> int:
+        return len(self._job_groups)
+
+    def add_failure(self, job_id: str, file_name: str, summary: str, printer: str, message: str) -> None:
+        if job_id in self._job_groups:
+            self.remove_jobs([job_id])
+        key = (summary, printer)
+        row = self._group_rows.get(key)
+        if row is None:
+            row = len(self._groups)
+            self.beginInsertRows(QtCore.QModelIndex(), row, row)
+            self._groups.append(_FailureGroup(summary, printer))
+            self._group_rows[key] = row
+            self.endInsertRows()
+        group = self._groups[row]
+        parent = self.index(row, 0)
+        child_row = len(group.entries)
+        self.beginInsertRows(parent, child_row, child_row)
+        group.entries.append(_FailureEntry(job_id, file_name, message))
+        self._job_groups[job_id] = key
+        self.endInsertRows()
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1), [])
+
+    def remove_jobs(self, job_ids: Iterable[str]) -> None:
+        ids = {job_id for job_id in job_ids if job_id in self._job_groups}
+        if not ids:
+            return
+        self.beginResetModel()
+        for job_id in ids:
+            self._job_groups.pop(job_id, None)
+        groups = []
+        for group in self._groups:
+            group.entries = [entry for entry in group.entries if entry.job_id not in ids]
+            if group.entries:
+                groups.append(group)
+        self._groups = groups
+        self._group_rows = {(group.summary, group.printer): row for row, group in enumerate(groups)}
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._groups.clear()
+        self._group_rows.clear()
+        self._job_groups.clear()
+        self.endResetModel()
+
+    def all_job_ids(self) -> list[str]:
+        return list(self._job_groups)
+
+    def job_ids_for(self, indexes: Iterable[QtCore.QModelIndex]) -> list[str]:
+        job_ids: list[str] = []
+        for index in indexes:
+            if not index.isValid() or index.column() != 0:
+                continue
+            if index.internalId() == 0:
+                job_ids.extend(entry.job_id for entry in self._groups[index.row()].entries)
+            else:
+                group = self._groups[index.internalId() - 1]
+                job_ids.append(group.entries[index.row()].job_id)
+        return list(dict.fromkeys(job_ids))
+
+    def index(self, row: int, column: int, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> QtCore.QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+        return self.createIndex(row, column, parent.row() + 1)
+
+    def parent(self, index: QtCore.QModelIndex = QtCore.QModelIndex()) -> QtCore.QModelIndex:
+        if not index.isValid() or index.internalId() == 0:
+            return QtCore.QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if not parent.isValid():
+            return len(self._groups)
+        if parent.internalId() == 0 and parent.column() == 0:
+            return len(self._groups[parent.row()].entries)
+        return 0
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 3
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return [t("log_summary"), t("table_printer"), t("failure_count")][section]
+        return None
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if index.internalId() == 0:
+            group = self._groups[index.row()]
+            if role == QtCore.Qt.DisplayRole:
+                if column == 0:
+                    return group.summary
+                if column == 1:
+                    return group.printer
+                if column == 2:
+                    return str(len(group.entries))
+            return None
+        entry = self._groups[index.internalId() - 1].entries[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            if column == 0:
+                return entry.file_name
+            if column == 2:
+                return entry.message
+        if role == QtCore.Qt.ToolTipRole and entry.message:
+            return entry.message
+        return None
+
+    def retranslate(self) -> None:
+        self.headerDataChanged.emit(QtCore.Qt.Horizontal, 0, self.columnCount() - 1)
+
+
+class FailurePanel(QtWidgets.QDockWidget):
+    retry_requested = QtCore.Signal(list)
+
+    def __init__(self, log_path: str, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._log_path = log_path
+        self.setObjectName("failure_panel")
+        self.setAllowedAreas(QtCore.Qt.BottomDockWidgetArea | QtCore.Qt.RightDockWidgetArea)
+
+        container = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(container)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        self.count_label = QtWidgets.QLabel()
+        layout.addWidget(self.count_label)
+
+        self.model = FailureGroupModel(self)
+        self.tree = QtWidgets.QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setAlternatingRowColors(True)
+        self.tree.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tree.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.tree.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tree.header().setStretchLastSection(True)
+        layout.addWidget(self.tree)
+
+        button_row = QtWidgets.QHBoxLayout()
+        self.retry_selected_button = QtWidgets.QPushButton()
+        self.retry_all_button = QtWidgets.QPushButton()
+        self.open_log_button = QtWidgets.QPushButton()
+        self.clear_button = QtWidgets.QPushButton()
+        button_row.addWidget(self.retry_selected_button)
+        button_row.addWidget(self.retry_all_button)
+        button_row.addStretch(1)
+        button_row.addWidget(self.open_log_button)
+        button_row.addWidget(self.clear_button)
+        layout.addLayout(button_row)
+
+        self.setWidget(container)
+
+        self.retry_selected_button.clicked.connect(self._on_retry_selected)
+        self.retry_all_button.clicked.connect(self._on_retry_all)
+        self.open_log_button.clicked.connect(self._open_log)
+        self.clear_button.clicked.connect(self.model.clear)
+        self.model.rowsInserted.connect(self._refresh_count)
+        self.model.modelReset.connect(self._refresh_count)
+
+        self.retranslate()
+
+    def retranslate(self) -> None:
+        self.setWindowTitle(t("failure_panel_title"))
+        self.retry_selected_button.setText(t("failure_retry_selected"))
+        self.retry_all_button.setText(t("failure_retry_all"))
+        self.open_log_button.setText(t("btn_open_log"))
+        self.clear_button.setText(t("failure_clear"))
+        self.model.retranslate()
+        self._refresh_count()
+
+    def add_failure(self, job_id: str, file_name: str, summary: str, printer: str, message: str) -> None:
+        self.model.add_failure(job_id, file_name, summary, printer, message)
+
+    def remove_jobs(self, job_ids: Iterable[str]) -> None:
+        self.model.remove_jobs(job_ids)
+
+    def clear(self) -> None:
+        self.model.clear()
+
+    def failure_count(self) -> int:
+        return self.model.failure_count()
+
+    def _on_retry_selected(self) -> None:
+        job_ids = self.model.job_ids_for(self.tree.selectionModel().selectedRows())
+        if job_ids:
+            self.retry_requested.emit(job_ids)
+
+    def _on_retry_all(self) -> None:
+        job_ids = self.model.all_job_ids()
+        if job_ids:
+            self.retry_requested.emit(job_ids)
+
+    def _refresh_count(self, *_args) -> None:
+        count = self.model.failure_count()
+        self.count_label.setText(t("failure_count_fmt", count=count))
+        self.retry_all_button.setEnabled(count > 0)
+        self.retry_selected_button.setEnabled(count > 0)
+
+    def _open_log(self) -> None:
+        QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(self._log_path))
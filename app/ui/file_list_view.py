@@ -10,11 +10,19 @@ from app.i18n import t
 
 
 class JobTableModel(QtCore.QAbstractTableModel):
+    PAGE_SIZE = 500
+    # Job fields that are shown in the table, by column.
+    SETTING_COLUMNS = {"printer_name": 6}
+
     def __init__(self, job_manager: JobManager) -> None:
         super().__init__()
         self._job_manager = job_manager
+        self._loaded_rows = min(job_manager.job_count(), self.PAGE_SIZE)
         self._job_manager.jobs_changed.connect(self._on_jobs_changed)
+        self._job_manager.jobs_appended.connect(self._on_jobs_appended)
         self._job_manager.job_updated.connect(self._on_job_updated)
+        self._job_manager.jobs_updated.connect(self._on_jobs_updated)
+        self._job_manager.job_settings_changed.connect(self._on_job_settings_changed)
         self._status_icons = self._build_status_icons()
         self._status_colors = {
             JobStatus.WAITING: QtGui.QColor("#9AA0A6"),
@@ -26,7 +34,25 @@ class JobTableModel(QtCore.QAbstractTableModel):
         }
 
     def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
-        return self._job_manager.job_count()
+        if parent.isValid():
+            return 0
+        return self._loaded_rows
+
+    def canFetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return self._loaded_rows < self._job_manager.job_count()
+
+    def fetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        remaining = self._job_manager.job_count() - self._loaded_rows
+        count = min(remaining, self.PAGE_SIZE)
+        if count <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._loaded_rows, self._loaded_rows + count - 1)
+        self._loaded_rows += count
+        self.endInsertRows()
 
     def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
         return len(self._headers())
@@ -207,15 +233,43 @@ class JobTableModel(QtCore.QAbstractTableModel):
 
     def _on_jobs_changed(self) -> None:
         self.beginResetModel()
+        total = self._job_manager.job_count()
+        self._loaded_rows = min(total, max(self._loaded_rows, self.PAGE_SIZE))
         self.endResetModel()
 
+    def _on_jobs_appended(self, _count: int) -> None:
+        if self._loaded_rows < self.PAGE_SIZE:
+            self.fetchMore()
+
     def _on_job_updated(self, job_id: str) -> None:
-        for row in range(self._job_manager.job_count()):
-            if self._job_manager.get_job(row).id == job_id:
-                top_left = self.index(row, 0)
-                bottom_right = self.index(row, self.columnCount() - 1)
-                self.dataChanged.emit(top_left, bottom_right, [])
-                break
+        row = self._job_manager.row_of(job_id)
+        if 0 <= row < self._loaded_rows:
+            top_left = self.index(row, 0)
+            bottom_right = self.index(row, self.columnCount() - 1)
+            self.dataChanged.emit(top_left, bottom_right, [])
+
+    def _on_jobs_updated(self, job_ids: list[str]) -> None:
+        rows = sorted(
+            row for row in (self._job_manager.row_of(job_id) for job_id in job_ids)
+            if 0 <= row < self._loaded_rows
+        )
+        last_column = self.columnCount() - 1
+        start = previous = None
+        for row in rows + [None]:
+            if start is not None and (row is None or row != previous + 1):
+                self.dataChanged.emit(self.index(start, 0), self.index(previous, last_column), [])
+                start = None
+            if row is not None and start is None:
+                start = row
+            previous = row
+
+    def _on_job_settings_changed(self, keys: set) -> None:
+        if not self._loaded_rows:
+            return
+        for key in keys:
+            column = self.SETTING_COLUMNS.get(key)
+            if column is not None:
+                self.dataChanged.emit(self.index(0, column), self.index(self._loaded_rows - 1, column), [])
 
     def _build_status_icons(self) -> dict[JobStatus, QtGui.QIcon]:
         return {
@@ -258,6 +312,7 @@ class FileListView(QtWidgets.QTableView):
     excel_sheets_requested = QtCore.Signal(str)
     print_selected_requested = QtCore.Signal(list)
     printer_selected_requested = QtCore.Signal(list)
+    job_settings_requested = QtCore.Signal(list)
 
     def __init__(self, job_manager: JobManager, parent: QtWidgets.QWidget | None = None) -> None:
         super().__init__(parent)
@@ -362,6 +417,7 @@ class FileListView(QtWidgets.QTableView):
         menu = QtWidgets.QMenu(self)
         print_selected_action = menu.addAction(t("context_print_selected"))
         printer_selected_action = menu.addAction(t("context_printer_select"))
+        job_settings_action = menu.addAction(t("context_job_settings"))
         sheet_action = menu.addAction(t("context_excel_sheets"))
         enable_action = menu.addAction(t("context_enable"))
         disable_action = menu.addAction(t("context_disable"))
@@ -369,6 +425,7 @@ class FileListView(QtWidgets.QTableView):
         if not selected_ids:
             print_selected_action.setEnabled(False)
             printer_selected_action.setEnabled(False)
+            job_settings_action.setEnabled(False)
             sheet_action.setEnabled(False)
             enable_action.setEnabled(False)
             disable_action.setEnabled(False)
@@ -380,6 +437,8 @@ class FileListView(QtWidgets.QTableView):
             self.print_selected_requested.emit(selected_ids)
         elif action == printer_selected_action:
             self.printer_selected_requested.emit(selected_ids)
+        elif action == job_settings_action:
+            self.job_settings_requested.emit(selected_ids)
         if action == sheet_action and excel_job is not None:
             self.excel_sheets_requested.emit(excel_job.id)
         if action == enable_action:
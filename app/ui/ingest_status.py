@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from PySide6 import QtCore, QtWidgets
+
+from app.i18n import t
+
+
+class IngestStatusWidget(QtWidgets.QWidget):
+    cancel_requested = QtCore.Signal()
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.count_label = QtWidgets.QLabel()
+        self.cancel_button = QtWidgets.QPushButton()
+        self.cancel_button.setFlat(True)
+        self.cancel_button.clicked.connect(self.cancel_requested)
+        layout.addWidget(self.count_label)
+        layout.addWidget(self.cancel_button)
+
+        self._scanned = 0
+        self._added = 0
+        self.retranslate()
+        self.hide()
+
+    def retranslate(self) -> None:
+        self.cancel_button.setText(t("ingest_cancel"))
+        self._refresh_label()
+
+    def start(self) -> None:
+        self._scanned = 0
+        self._added = 0
+        self.cancel_button.setEnabled(True)
+        self._refresh_label()
+        self.show()
+
+    def set_counts(self, scanned: int, added: int) -> None:
+        self._scanned = scanned
+        self._added = added
+        self._refresh_label()
+
+    def finish(self) -> None:
+        self.hide()
+
+    def _refresh_label(self) -> None:
+        self.count_label.setText(t("ingest_progress_fmt", scanned=self._scanned, added=self._added))
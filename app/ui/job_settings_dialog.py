@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from PySide6 import QtWidgets
+
+from app.i18n import t
+from app.model.print_job import DuplexMode, PrintJob
+
+
+class JobSettingsDialog(QtWidgets.QDialog):
+    """Per-job copies/duplex; "inherit" clears the override so the global setting applies."""
+
+    def __init__(self, job: PrintJob | None = None, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+
+        layout = QtWidgets.QFormLayout(self)
+        self.copies_label = QtWidgets.QLabel()
+        self.copies_spin = QtWidgets.QSpinBox()
+        self.copies_spin.setMinimum(0)
+        self.copies_spin.setMaximum(999)
+        layout.addRow(self.copies_label, self.copies_spin)
+
+        self.duplex_label = QtWidgets.QLabel()
+        self.duplex_combo = QtWidgets.QComboBox()
+        layout.addRow(self.duplex_label, self.duplex_combo)
+
+        button_box = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel
+        )
+        layout.addRow(button_box)
+
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+
+        self.retranslate()
+        if job is not None:
+            self.copies_spin.setValue(job.copies or 0)
+            index = self.duplex_combo.findData(job.duplex.value if job.duplex else None)
+            self.duplex_combo.setCurrentIndex(max(index, 0))
+
+    def retranslate(self) -> None:
+        self.setWindowTitle(t("job_settings_title"))
+        self.copies_label.setText(t("settings_copies"))
+        self.duplex_label.setText(t("settings_duplex"))
+        self.copies_spin.setSpecialValueText(t("job_settings_inherit"))
+        current = self.duplex_combo.currentData()
+        self.duplex_combo.clear()
+        self.duplex_combo.addItem(t("job_settings_inherit"), None)
+        self.duplex_combo.addItem(t("duplex_off"), DuplexMode.OFF.value)
+        self.duplex_combo.addItem(t("duplex_long"), DuplexMode.LONG_EDGE.value)
+        self.duplex_combo.addItem(t("duplex_short"), DuplexMode.SHORT_EDGE.value)
+        self.duplex_combo.setCurrentIndex(max(self.duplex_combo.findData(current), 0))
+
+    def overrides(self) -> dict:
+        duplex = self.duplex_combo.currentData()
+        return {
+            "copies": self.copies_spin.value() or None,
+            "duplex": DuplexMode(duplex) if duplex else None,
+        }
+
+    @staticmethod
+    def get_overrides(parent: QtWidgets.QWidget | None = None, job: PrintJob | None = None):
+        dialog = JobSettingsDialog(job=job, parent=parent)
+        result = dialog.exec()
+        return dialog.overrides(), result == QtWidgets.QDialog.Accepted
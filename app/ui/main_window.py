@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import logging
+
 from PySide6 import QtCore, QtGui, QtWidgets
 
 try:
@@ -7,31 +9,38 @@ try:
 except Exception:  # pragma: no cover - optional on non-Windows
     QWinTaskbarButton = None
 
-from app.app_context import AppContext
+from app.app_context import AppContext, PRINTER_SETTING_KEYS
 from app.controller.job_manager import JobManager
 from app.controller.job_executor import JobExecutor
+from app.controller.resource_governor import resource_governor
 from app.controller.update_manager import UpdateManager
-from app.model.print_job import DuplexMode, JobStatus, FileType
-from app.backend.printer_utils import (
-    list_printers,
-    get_default_printer_name,
-    open_printer_properties,
-    list_paper_sizes,
-)
+from app.model.print_job import PRIORITY_INTERACTIVE, DuplexMode, JobStatus, FileType
+from app.backend.printer_snapshot import PrinterDiscovery, load_snapshot, save_snapshot
+from app.backend.printer_utils import printer_cache, open_printer_properties
+from app.backend.printer_capabilities import capability_registry
 from app.ui.file_list_view import FileListView
 from app.ui.settings_panel import SettingsPanel
 from app.ui.printer_selector import PrinterSelectorDialog
+from app.ui.job_settings_dialog import JobSettingsDialog
 from app.ui.progress_dialog import ProgressDialog
 from app.ui.about_dialog import AboutDialog
 from app.ui.log_summary_dialog import LogSummaryDialog
+from app.ui.autotune_report_dialog import AutotuneReportDialog
+from app.ui.failure_panel import FailurePanel
 from app.ui.theme import apply_theme
 from app.ui.excel_sheet_selector import ExcelSheetSelectorDialog
 from app.ui.excel_orientation_dialog import ExcelOrientationDialog
 from app.controller.excel_orientation_analyzer import ExcelOrientationAnalyzer
+from app.controller.file_ingestor import FileIngestor
+from app.ui.ingest_status import IngestStatusWidget
 from app.i18n import t, set_language, resolve_language
 
 
 class MainWindow(QtWidgets.QMainWindow):
+    LOG_SUMMARY_DIALOG_LIMIT = 200
+    PRINTER_POLL_INTERVAL_MS = 30000
+    MEMORY_STATUS_INTERVAL_MS = 1000
+
     def __init__(self, context: AppContext, job_manager: JobManager) -> None:
         super().__init__()
         self._context = context
@@ -42,9 +51,18 @@ class MainWindow(QtWidgets.QMainWindow):
         self._orientation_analyzer: ExcelOrientationAnalyzer | None = None
         self._orientation_progress: QtWidgets.QProgressDialog | None = None
         self._pending_jobs: list = []
+        self._ingestor: FileIngestor | None = None
+        self._ingest_queue: list[list[str]] = []
         self._taskbar_button = None
         self._taskbar_progress = None
         self._update_manager = UpdateManager(context, self)
+        self._printer_poll_timer = QtCore.QTimer(self)
+        self._printer_poll_timer.setInterval(self.PRINTER_POLL_INTERVAL_MS)
+        self._memory_status_timer = QtCore.QTimer(self)
+        self._memory_status_timer.setInterval(self.MEMORY_STATUS_INTERVAL_MS)
+        self._discovery: PrinterDiscovery | None = None
+        self._initial_discovery_done = False
+        printer_cache().seed(load_snapshot(context.printer_snapshot_path) or {})
 
         self.resize(1024, 768)
 
@@ -57,12 +75,18 @@ class MainWindow(QtWidgets.QMainWindow):
         self._refresh_rules()
         self._update_status()
         self._apply_language()
+        self._prefetch_capabilities()
 
+        self._start_discovery()
+        self._printer_poll_timer.start()
+        self._memory_status_timer.start()
         QtCore.QTimer.singleShot(600, self._update_manager.check_on_startup)
+        QtCore.QTimer.singleShot(0, self._offer_resume)
 
     def _build_menu(self) -> None:
         self.menu_bar = self.menuBar()
         self.file_menu = self.menu_bar.addMenu("")
+        self.view_menu = self.menu_bar.addMenu("")
         self.help_menu = self.menu_bar.addMenu("")
 
         self.add_files_action = QtGui.QAction(self)
@@ -73,6 +97,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.about_action = QtGui.QAction(self)
         self.log_summary_action = QtGui.QAction(self)
+        self.autotune_report_action = QtGui.QAction(self)
         self.check_updates_action = QtGui.QAction(self)
 
         self.add_files_action.triggered.connect(self._on_add_files)
@@ -83,6 +108,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.about_action.triggered.connect(self._on_about)
         self.log_summary_action.triggered.connect(self._on_log_summary)
+        self.autotune_report_action.triggered.connect(self._on_autotune_report)
         self.check_updates_action.triggered.connect(self._on_check_updates)
 
         self.file_menu.addAction(self.add_files_action)
@@ -94,6 +120,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.help_menu.addAction(self.about_action)
         self.help_menu.addAction(self.log_summary_action)
+        self.help_menu.addAction(self.autotune_report_action)
         self.help_menu.addAction(self.check_updates_action)
 
     def _build_layout(self) -> None:
@@ -125,12 +152,26 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.setCentralWidget(central)
 
+        self.ingest_status = IngestStatusWidget()
+        self.statusBar().addPermanentWidget(self.ingest_status)
+        self.memory_status = QtWidgets.QLabel()
+        self.memory_status.hide()
+        self.statusBar().addPermanentWidget(self.memory_status)
+
+        self.failure_panel = FailurePanel(str(self._context.log_path), self)
+        self.addDockWidget(QtCore.Qt.BottomDockWidgetArea, self.failure_panel)
+        self.failure_panel.hide()
+        self.view_menu.addAction(self.failure_panel.toggleViewAction())
+
     def _bind_signals(self) -> None:
-        self.file_list.files_dropped.connect(self._job_manager.add_files)
+        self.file_list.files_dropped.connect(self._start_ingest)
+        self.ingest_status.cancel_requested.connect(self._on_ingest_cancel)
+        self.failure_panel.retry_requested.connect(self._on_retry_jobs)
         self.file_list.printer_requested.connect(self._on_job_printer_select)
         self.file_list.excel_sheets_requested.connect(self._on_excel_sheets_select)
         self.file_list.print_selected_requested.connect(self._on_print_selected)
         self.file_list.printer_selected_requested.connect(self._on_printer_selected)
+        self.file_list.job_settings_requested.connect(self._on_job_settings_requested)
 
         self.settings_panel.use_default_changed.connect(self._on_use_default_changed)
         self.settings_panel.select_printer_clicked.connect(self._on_global_printer_select)
@@ -138,6 +179,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.settings_panel.copies_changed.connect(self._on_copies_changed)
         self.settings_panel.duplex_changed.connect(self._on_duplex_changed)
         self.settings_panel.excel_orientation_mode_changed.connect(self._on_excel_orientation_mode_changed)
+        self.settings_panel.schedule_policy_changed.connect(self._on_schedule_policy_changed)
+        self.settings_panel.keep_folder_order_changed.connect(self._on_keep_folder_order_changed)
         self.settings_panel.rule_printer_changed.connect(self._on_rule_printer_changed)
         self.settings_panel.rule_add_requested.connect(self._on_rule_add)
         self.settings_panel.rule_remove_requested.connect(self._on_rule_remove)
@@ -151,14 +194,24 @@ class MainWindow(QtWidgets.QMainWindow):
         self.retry_button.clicked.connect(self._on_retry_failed)
 
         self._job_manager.jobs_changed.connect(self._update_status)
+        self._job_manager.jobs_appended.connect(self._update_status)
+        self._job_manager.jobs_appended.connect(self._on_jobs_appended)
+        self._job_manager.jobs_withdrawn.connect(self._on_jobs_withdrawn)
+        self._job_manager.jobs_edited.connect(self._on_jobs_edited)
+        self._job_manager.jobs_removed.connect(self.failure_panel.remove_jobs)
         self._job_manager.job_updated.connect(self._update_status)
+        self._job_manager.jobs_updated.connect(self._update_status)
 
         self._context.rules_changed.connect(self._refresh_rules)
-        self._context.settings_changed.connect(self._refresh_settings)
+        printer_cache().printers_changed.connect(self._on_printers_changed)
+        self._printer_poll_timer.timeout.connect(self._start_discovery)
+        self._memory_status_timer.timeout.connect(self._refresh_memory_status)
+        self._context.settings_changed.connect(self._on_settings_changed)
 
     def _apply_language(self) -> None:
         self.setWindowTitle(t("app_title"))
         self.file_menu.setTitle(t("menu_file"))
+        self.view_menu.setTitle(t("menu_view"))
         self.help_menu.setTitle(t("menu_help"))
 
         self.add_files_action.setText(t("action_add_files"))
@@ -169,6 +222,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.about_action.setText(t("action_about"))
         self.log_summary_action.setText(t("action_log_summary"))
+        self.autotune_report_action.setText(t("action_autotune_report"))
         self.check_updates_action.setText(t("action_check_updates"))
 
         self.start_button.setText(t("button_start_printing"))
@@ -176,6 +230,9 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.settings_panel.retranslate()
         self.file_list.retranslate()
+        self.ingest_status.retranslate()
+        self._refresh_memory_status()
+        self.failure_panel.retranslate()
         self._refresh_rules()
         self._refresh_paper_sizes()
         if self._progress_dialog:
@@ -197,31 +254,77 @@ class MainWindow(QtWidgets.QMainWindow):
             update_check_enabled=settings.update_check_enabled,
             auto_update_enabled=settings.auto_update_enabled,
         )
+        self.settings_panel.set_schedule(settings.schedule_policy, settings.schedule_keep_folder_order)
         self._refresh_paper_sizes()
         self._refresh_rules()
 
+    def _on_settings_changed(self, keys: set) -> None:
+        # Widgets in the settings panel already show the value the user picked, so only
+        # keys with side effects elsewhere are handled here.
+        if keys & PRINTER_SETTING_KEYS:
+            self._refresh_settings()
+            self._prefetch_capabilities()
+        if "theme_mode" in keys:
+            app = QtWidgets.QApplication.instance()
+            if app:
+                apply_theme(app, self._context.settings.theme_mode)
+        if "language_mode" in keys:
+            set_language(resolve_language(self._context.settings.language_mode))
+            self._apply_language()
+
     def _refresh_rules(self) -> None:
-        self.settings_panel.set_printers(self._printers)
+        # Per-extension rules may also target a printer pool.
+        self.settings_panel.set_printers(self._printers + self._job_manager.pool_targets())
         auto_label = self._get_effective_printer_name()
         self.settings_panel.set_rules(self._context.rules, auto_label)
 
     def _update_status(self, *_args) -> None:
         total = self._job_manager.job_count()
-        failed = sum(1 for job in self._job_manager.jobs() if job.status == JobStatus.FAILED)
-        completed = sum(1 for job in self._job_manager.jobs() if job.status == JobStatus.SUCCESS)
+        counts = self._job_manager.status_counts()
+        failed = counts[JobStatus.FAILED]
+        completed = counts[JobStatus.SUCCESS]
         self.statusBar().showMessage(t("status_jobs_fmt", total=total, completed=completed, failed=failed))
-        self.retry_button.setEnabled(failed > 0 and not (self._executor and self._executor.isRunning()))
+        self.retry_button.setEnabled(failed > 0)
 
     def _on_add_files(self) -> None:
         filter_text = "印刷できるファイル (*.pdf *.doc *.docx *.xls *.xlsx *.xlsm *.ppt *.pptx)"
         files, _ = QtWidgets.QFileDialog.getOpenFileNames(self, t("action_add_files"), "", filter_text)
         if files:
-            self._job_manager.add_files(files)
+            self._start_ingest(files)
 
     def _on_add_folder(self) -> None:
         folder = QtWidgets.QFileDialog.getExistingDirectory(self, t("action_add_folder"))
         if folder:
-            self._job_manager.add_folder(folder, recursive=True)
+            self._start_ingest([folder])
+
+    def _start_ingest(self, paths: list[str]) -> None:
+        if not paths:
+            return
+        if self._ingestor and self._ingestor.isRunning():
+            self._ingest_queue.append(list(paths))
+            return
+        self._ingestor = self._job_manager.create_ingestor(paths)
+        self._ingestor.chunk_ready.connect(self._job_manager.add_jobs)
+        self._ingestor.progress.connect(self.ingest_status.set_counts)
+        self._ingestor.finished_ingest.connect(self._on_ingest_finished)
+        self.ingest_status.start()
+        self._ingestor.start()
+
+    def _on_ingest_cancel(self) -> None:
+        self._ingest_queue.clear()
+        if self._ingestor:
+            self._ingestor.request_cancel()
+            self.ingest_status.cancel_button.setEnabled(False)
+
+    def _on_ingest_finished(self, _cancelled: bool) -> None:
+        if self._ingestor:
+            self._ingestor.wait()
+            self._ingestor.deleteLater()
+        self._ingestor = None
+        if self._ingest_queue:
+            self._start_ingest(self._ingest_queue.pop(0))
+            return
+        self.ingest_status.finish()
 
     def _on_about(self) -> None:
         dialog = AboutDialog(self)
@@ -261,20 +364,14 @@ class MainWindow(QtWidgets.QMainWindow):
         selected, ok = PrinterSelectorDialog.get_printer(self, current)
         if ok:
             self._context.update_setting(selected_printer=selected)
-            if not self._context.settings.use_default_printer:
-                self._job_manager.apply_rules()
-            self._refresh_paper_sizes()
 
     def _on_use_default_changed(self, use_default: bool) -> None:
         self._context.update_setting(use_default_printer=use_default)
         if not use_default and not self._context.settings.selected_printer:
             self._on_global_printer_select()
-        self._job_manager.apply_rules()
-        self._refresh_paper_sizes()
 
     def _on_copies_changed(self, value: int) -> None:
         self._context.update_setting(copies=value)
-        self._job_manager.apply_settings_to_jobs()
 
     def _on_duplex_changed(self, value: str) -> None:
         try:
@@ -282,25 +379,24 @@ class MainWindow(QtWidgets.QMainWindow):
         except ValueError:
             duplex = DuplexMode.OFF
         self._context.update_setting(duplex=duplex)
-        self._job_manager.apply_settings_to_jobs()
 
     def _on_paper_size_changed(self, value: str) -> None:
         self._context.update_setting(paper_size=value)
-        self._job_manager.apply_settings_to_jobs()
 
     def _on_excel_orientation_mode_changed(self, mode: str) -> None:
         self._context.update_setting(excel_orientation_mode=mode)
 
+    def _on_schedule_policy_changed(self, policy: str) -> None:
+        self._context.update_setting(schedule_policy=policy)
+
+    def _on_keep_folder_order_changed(self, enabled: bool) -> None:
+        self._context.update_setting(schedule_keep_folder_order=enabled)
+
     def _on_theme_changed(self, mode: str) -> None:
         self._context.update_setting(theme_mode=mode)
-        app = QtWidgets.QApplication.instance()
-        if app:
-            apply_theme(app, mode)
 
     def _on_language_changed(self, mode: str) -> None:
         self._context.update_setting(language_mode=mode)
-        set_language(resolve_language(mode))
-        self._apply_language()
 
     def _on_update_check_changed(self, enabled: bool) -> None:
         self._context.update_setting(update_check_enabled=enabled)
@@ -342,42 +438,50 @@ class MainWindow(QtWidgets.QMainWindow):
         self._job_manager.apply_rules(force=True)
 
     def _on_start_printing(self) -> None:
-        if self._executor and self._executor.isRunning():
-            return
         if self._job_manager.job_count() == 0:
             QtWidgets.QMessageBox.information(self, t("title_print"), t("msg_no_files"))
             return
-        enabled_jobs = self._job_manager.get_enabled_jobs()
-        if not enabled_jobs:
+        if self._job_manager.enabled_job_count() == 0:
             QtWidgets.QMessageBox.information(self, t("title_print"), t("msg_no_checked"))
             return
+        if self._is_printing():
+            # Only queue what has not been handed to the executor yet; running jobs keep their status.
+            self._start_executor(None, waiting_only=True)
+            return
 
         if self._context.settings.excel_orientation_mode == "ask":
+            enabled_jobs = self._job_manager.get_enabled_jobs()
             excel_jobs = [job for job in enabled_jobs if job.file_type == FileType.EXCEL]
             if excel_jobs:
                 self._pending_jobs = enabled_jobs
                 self._start_excel_orientation_analysis(excel_jobs)
                 return
 
-        self._lock_ui(True)
         self._job_manager.reset_statuses()
-        self._start_executor(enabled_jobs)
+        self.failure_panel.clear()
+        self._start_executor(None)
 
     def _on_print_selected(self, job_ids: list[str]) -> None:
-        if self._executor and self._executor.isRunning():
-            return
-        jobs = [job for job in self._job_manager.jobs() if job.id in set(job_ids)]
+        jobs = self._job_manager.get_jobs_by_ids(job_ids)
         if not jobs:
             QtWidgets.QMessageBox.information(self, t("title_print"), t("msg_no_selected_rows"))
             return
+        # Rows the user picked by hand go ahead of bulk jobs under the priority policies.
+        self._job_manager.set_jobs_priority(job_ids, PRIORITY_INTERACTIVE)
+        if self._executor:
+            self._executor.reprioritize({job_id: PRIORITY_INTERACTIVE for job_id in job_ids})
+            jobs = [job for job in jobs if not self._executor.is_active(job.id)]
+            job_ids = [job.id for job in jobs]
+            if not jobs:
+                return
         if self._context.settings.excel_orientation_mode == "ask":
             excel_jobs = [job for job in jobs if job.file_type == FileType.EXCEL]
             if excel_jobs:
                 self._pending_jobs = jobs
                 self._start_excel_orientation_analysis(excel_jobs)
                 return
-        self._lock_ui(True)
         self._job_manager.reset_statuses_for(job_ids)
+        self.failure_panel.remove_jobs(job_ids)
         self._start_executor(jobs)
 
     def _on_printer_selected(self, job_ids: list[str]) -> None:
@@ -387,77 +491,150 @@ class MainWindow(QtWidgets.QMainWindow):
         if ok and selected:
             self._job_manager.set_jobs_printer(job_ids, selected)
 
-    def _on_retry_failed(self) -> None:
-        if self._executor and self._executor.isRunning():
+    def _on_job_settings_requested(self, job_ids: list[str]) -> None:
+        jobs = self._job_manager.get_jobs_by_ids(job_ids)
+        if not jobs:
             return
+        overrides, ok = JobSettingsDialog.get_overrides(self, jobs[0])
+        if ok:
+            self._job_manager.set_jobs_overrides([job.id for job in jobs], **overrides)
+
+    def _on_retry_failed(self) -> None:
         failed_jobs = self._job_manager.get_failed_jobs()
         if not failed_jobs:
             QtWidgets.QMessageBox.information(self, t("title_retry"), t("msg_no_failed"))
             return
-        self._lock_ui(True)
         self._job_manager.reset_failed_jobs()
+        self.failure_panel.remove_jobs([job.id for job in failed_jobs])
         self._start_executor(failed_jobs)
 
-    def _start_executor(self, jobs) -> None:
-        self._executor = JobExecutor(self._context, self._job_manager, jobs)
-        self._executor.job_status.connect(self._job_manager.set_job_status)
-        self._executor.progress.connect(self._on_progress)
-        self._executor.job_failed.connect(self._on_job_failed)
-        self._executor.finished_all.connect(self._on_finished)
+    def _on_retry_jobs(self, job_ids: list[str]) -> None:
+        jobs = self._job_manager.get_jobs_by_ids(job_ids)
+        if self._executor:
+            jobs = [job for job in jobs if not self._executor.is_active(job.id)]
+        if not jobs:
+            return
+        self._job_manager.reset_statuses_for([job.id for job in jobs])
+        self._job_manager.set_jobs_priority([job.id for job in jobs], PRIORITY_INTERACTIVE)
+        self.failure_panel.remove_jobs(job_ids)
+        self._start_executor(jobs)
+
+    def _start_executor(self, jobs, waiting_only: bool = False) -> None:
+        executor = self._ensure_executor()
+        if jobs is None:
+            # The executor reads the enabled jobs from the store itself, so a large batch
+            # is never listed on the GUI thread.
+            added = executor.stream(
+                self._job_manager.iter_jobs(enabled_only=True, waiting_only=waiting_only),
+                self._job_manager.enabled_job_count(waiting_only=waiting_only),
+            )
+        else:
+            added = executor.submit(jobs)
+        if not added:
+            return
+        total = executor.total()
+        if self._progress_dialog is None:
+            self._job_manager.mark_run(True)
+            self._progress_dialog = ProgressDialog(self)
+            self._progress_dialog.cancel_requested.connect(executor.request_cancel)
+            self._progress_dialog.show()
+        self._progress_dialog.set_total(total)
+        self._set_taskbar_total(total)
+
+    def _ensure_executor(self) -> JobExecutor:
+        if self._executor is None:
+            self._executor = JobExecutor(self._context, self._job_manager)
+            self._executor.updates.flushed.connect(self._on_status_batch)
+            self._executor.updates.progress.connect(self._on_progress)
+            self._executor.finished_all.connect(self._on_finished)
+            self._executor.updates.start()
+            self._executor.start()
+        return self._executor
+
+    def _is_printing(self) -> bool:
+        return self._executor is not None and self._executor.is_busy()
+
+    def _on_jobs_appended(self, count: int) -> None:
+        # Files dropped while printing join the running queue.
+        if not self._is_printing():
+            return
+        total = self._job_manager.job_count()
+        jobs = [self._job_manager.get_job(row) for row in range(max(0, total - count), total)]
+        self._start_executor([job for job in jobs if job and job.enabled])
+
+    def _offer_resume(self) -> None:
+        snapshot = self._job_manager.recovered_jobs()
+        if not snapshot.jobs:
+            return
+        resume = False
+        if snapshot.running:
+            done = sum(1 for job in snapshot.jobs if job.status == JobStatus.SUCCESS)
+            result = QtWidgets.QMessageBox.question(
+                self,
+                t("title_resume"),
+                t("msg_resume_fmt", done=done, total=len(snapshot.jobs)),
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+            )
+            resume = result == QtWidgets.QMessageBox.Yes
+        jobs = self._job_manager.restore_recovered()
+        for job in self._job_manager.get_failed_jobs():
+            self._on_job_failed(job.id)
+        if resume:
+            self._start_executor(jobs)
 
-        self._progress_dialog = ProgressDialog(self)
-        self._progress_dialog.cancel_requested.connect(self._executor.request_cancel)
-        self._progress_dialog.set_total(len(jobs))
-        self._progress_dialog.show()
-        self._set_taskbar_total(len(jobs))
+    def _on_jobs_withdrawn(self, job_ids: list) -> None:
+        if self._executor:
+            self._executor.withdraw(job_ids)
 
-        self._executor.start()
+    def _on_jobs_edited(self, job_ids: list) -> None:
+        if not self._executor:
+            return
+        queued = [job_id for job_id in job_ids if self._executor.is_active(job_id)]
+        if queued:
+            self._executor.update(self._job_manager.get_jobs_by_ids(queued))
 
     def _on_progress(self, completed: int, total: int, current: str) -> None:
         if self._progress_dialog:
             self._progress_dialog.update_progress(completed, total, current)
         self._update_taskbar_progress(completed, total)
 
+    def _on_status_batch(self, updates: list) -> None:
+        self._job_manager.apply_status_updates(updates)
+        for update in updates:
+            if update.status == JobStatus.FAILED:
+                self._on_job_failed(update.job_id)
+
     def _on_job_failed(self, job_id: str) -> None:
         job = self._job_manager.find_job_by_id(job_id)
-        file_name = job.file_name if job else "-"
-        summary = job.summary if job and job.summary else t("msg_print_failed")
-        message = job.message if job and job.message else ""
-        dialog = QtWidgets.QMessageBox(self)
-        dialog.setIcon(QtWidgets.QMessageBox.Warning)
-        dialog.setWindowTitle(t("title_print_failed"))
-        if message:
-            dialog.setText(f"{file_name}\n{summary}\n\n{message}")
-        else:
-            dialog.setText(f"{file_name}\n{summary}")
-        log_button = dialog.addButton(t("btn_open_log"), QtWidgets.QMessageBox.ActionRole)
-        dialog.addButton(QtWidgets.QMessageBox.Ok)
-        dialog.exec()
-        if dialog.clickedButton() == log_button:
-            QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(str(self._context.log_path)))
+        if not job:
+            return
+        self.failure_panel.add_failure(
+            job.id,
+            job.file_name,
+            job.summary or t("msg_print_failed"),
+            job.printer_name or t("label_auto"),
+            job.message,
+        )
+        if not self.failure_panel.isVisible():
+            self.failure_panel.show()
 
     def _on_finished(self, cancelled: bool) -> None:
+        if self._executor:
+            # Deliver the last statuses of the batch before reporting it as finished.
+            self._executor.updates.flush()
+        if self._is_printing():
+            # More work arrived after the executor went idle; keep the dialog for it.
+            return
+        self._job_manager.mark_run(False)
         if self._progress_dialog:
             self._progress_dialog.set_finished(cancelled)
             QtCore.QTimer.singleShot(800, self._progress_dialog.accept)
             self._progress_dialog = None
         self._clear_taskbar_progress()
-        self._lock_ui(False)
-        self._executor = None
         self._update_status()
 
-    def _lock_ui(self, locked: bool) -> None:
-        self.file_list.setEnabled(not locked)
-        self.settings_panel.setEnabled(not locked)
-        self.start_button.setEnabled(not locked)
-        self.retry_button.setEnabled(not locked)
-        self.menuBar().setEnabled(not locked)
-
     def _get_default_printer_name(self) -> str:
-        try:
-            return get_default_printer_name()
-        except Exception:
-            return ""
+        return printer_cache().default_printer()
 
     def _get_effective_printer_name(self) -> str:
         settings = self._context.settings
@@ -467,10 +644,35 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _load_printers(self) -> None:
         try:
-            self._printers = list_printers()
+            self._printers = printer_cache().printers()
         except Exception:
             self._printers = []
 
+    def _on_printers_changed(self) -> None:
+        capability_registry().invalidate()
+        self._load_printers()
+        self._refresh_settings()
+        self._prefetch_capabilities()
+
+    def _start_discovery(self) -> None:
+        if self._discovery and self._discovery.isRunning():
+            return
+        printer_names = [] if self._initial_discovery_done else [self._context.settings.selected_printer]
+        self._discovery = PrinterDiscovery(printer_cache(), printer_names, self)
+        self._discovery.discovered.connect(self._on_discovered)
+        self._discovery.start()
+
+    def _on_discovered(self, changed: bool) -> None:
+        initial = not self._initial_discovery_done
+        self._initial_discovery_done = True
+        if initial or changed:
+            self._refresh_paper_sizes()
+            save_snapshot(self._context.printer_snapshot_path, printer_cache())
+
+    def _prefetch_capabilities(self) -> None:
+        names = {self._get_effective_printer_name()} | self._job_manager.rule_printers()
+        capability_registry().prefetch(name for name in names if name and name != "-")
+
     def _refresh_paper_sizes(self) -> None:
         settings = self._context.settings
         printer_name = (
@@ -478,7 +680,11 @@ class MainWindow(QtWidgets.QMainWindow):
             if settings.use_default_printer
             else settings.selected_printer
         )
-        sizes = list_paper_sizes(printer_name) if printer_name else []
+        if self._initial_discovery_done:
+            sizes = printer_cache().paper_sizes(printer_name)
+        else:
+            # Until the first background discovery completes, only show what the snapshot knows.
+            sizes = printer_cache().peek_paper_sizes(printer_name) or []
         if sizes:
             enabled = True
             tooltip = ""
@@ -488,14 +694,30 @@ class MainWindow(QtWidgets.QMainWindow):
         self.settings_panel.set_paper_sizes(sizes, settings.paper_size, enabled, tooltip)
 
     def _on_log_summary(self) -> None:
+        failed_jobs = self._job_manager.get_failed_jobs()
+        if len(failed_jobs) > self.LOG_SUMMARY_DIALOG_LIMIT:
+            if self.failure_panel.failure_count() != len(failed_jobs):
+                self.failure_panel.clear()
+                for job in failed_jobs:
+                    self._on_job_failed(job.id)
+            self.failure_panel.show()
+            self.failure_panel.raise_()
+            return
         items = []
-        for job in self._job_manager.get_failed_jobs():
+        for job in failed_jobs:
             summary = job.summary or t("msg_print_failed")
             detail = job.message or ""
             items.append((job.file_name, summary, detail))
         dialog = LogSummaryDialog(str(self._context.log_path), items, self)
         dialog.exec()
 
+    def _on_autotune_report(self) -> None:
+        tuner = self._job_manager.autotuner
+        dialog = AutotuneReportDialog(
+            tuner.changes(), tuner.current(), self._context.settings.autotune_enabled, self
+        )
+        dialog.exec()
+
     def _start_excel_orientation_analysis(self, jobs) -> None:
         if self._orientation_analyzer and self._orientation_analyzer.isRunning():
             return
@@ -525,11 +747,8 @@ class MainWindow(QtWidgets.QMainWindow):
             if not ok:
                 self._pending_jobs = []
                 return
-            pending_ids = {job.id for job in self._pending_jobs}
-            for job in self._job_manager.jobs():
-                if job.id in pending_ids and job.file_type == FileType.EXCEL:
-                    job.excel_auto_orientation = job.id in selected_ids
-        self._lock_ui(True)
+            pending_ids = [job.id for job in self._pending_jobs]
+            self._job_manager.set_excel_auto_orientation(pending_ids, selected_ids)
         pending_ids = [job.id for job in self._pending_jobs]
         self._job_manager.reset_statuses_for(pending_ids)
         jobs = self._pending_jobs
@@ -541,7 +760,6 @@ class MainWindow(QtWidgets.QMainWindow):
             self._orientation_progress.close()
             self._orientation_progress = None
         QtWidgets.QMessageBox.warning(self, t("title_excel"), message)
-        self._lock_ui(True)
         pending_ids = [job.id for job in self._pending_jobs]
         self._job_manager.reset_statuses_for(pending_ids)
         jobs = self._pending_jobs
@@ -549,7 +767,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self._start_executor(jobs)
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
-        if self._executor and self._executor.isRunning():
+        if self._is_printing():
             QtWidgets.QMessageBox.information(
                 self,
                 t("title_print"),
@@ -557,8 +775,34 @@ class MainWindow(QtWidgets.QMainWindow):
             )
             event.ignore()
             return
+        self._ingest_queue.clear()
+        if self._ingestor and self._ingestor.isRunning():
+            self._ingestor.request_cancel()
+            self._ingestor.wait()
+        if self._executor:
+            self._executor.stop()
+            self._executor.updates.stop()
+        self._printer_poll_timer.stop()
+        self._memory_status_timer.stop()
+        if self._discovery and self._discovery.isRunning():
+            self._discovery.wait()
+        save_snapshot(self._context.printer_snapshot_path, printer_cache())
+        self._job_manager.close()
+        logging.getLogger(__name__).info("Printer cache stats: %s", printer_cache().stats())
+        logging.getLogger(__name__).info("Memory governor stats: %s", resource_governor().snapshot())
         super().closeEvent(event)
 
+    def _refresh_memory_status(self) -> None:
+        usage = resource_governor().snapshot()
+        if not usage["active"] and not usage["waiting"]:
+            self.memory_status.hide()
+            return
+        text = t("status_memory_fmt", used=usage["reserved_mb"], budget=usage["budget_mb"])
+        if usage["waiting"]:
+            text += t("status_memory_waiting_fmt", waiting=usage["waiting"])
+        self.memory_status.setText(text)
+        self.memory_status.show()
+
     def _set_taskbar_total(self, total: int) -> None:
         if not QWinTaskbarButton:
             return
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from PySide6 import QtCore, QtWidgets
 
-from app.backend.printer_utils import list_printers
+from app.backend.printer_utils import printer_cache
 from app.i18n import t
 
 
@@ -31,7 +31,7 @@ class PrinterSelectorDialog(QtWidgets.QDialog):
 
     def _load_printers(self, current_printer: str) -> None:
         try:
-            printers = list_printers()
+            printers = printer_cache().printers()
         except Exception as exc:
             QtWidgets.QMessageBox.warning(self, t("title_printer"), str(exc))
             printers = []
@@ -10,7 +10,8 @@ class ProgressDialog(QtWidgets.QDialog):
 
     def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
         super().__init__(parent)
-        self.setModal(True)
+        # Non-modal so jobs can be added or edited while printing.
+        self.setModal(False)
         self.resize(420, 160)
 
         layout = QtWidgets.QVBoxLayout(self)
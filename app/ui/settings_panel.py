@@ -15,6 +15,8 @@ class SettingsPanel(QtWidgets.QWidget):
     copies_changed = QtCore.Signal(int)
     duplex_changed = QtCore.Signal(str)
     excel_orientation_mode_changed = QtCore.Signal(str)
+    schedule_policy_changed = QtCore.Signal(str)
+    keep_folder_order_changed = QtCore.Signal(bool)
     rule_printer_changed = QtCore.Signal(str, str)
     rule_add_requested = QtCore.Signal(str)
     rule_remove_requested = QtCore.Signal(list)
@@ -73,10 +75,20 @@ class SettingsPanel(QtWidgets.QWidget):
         excel_layout.addWidget(self.excel_orientation_combo)
         excel_layout.addStretch(1)
 
+        schedule_layout = QtWidgets.QHBoxLayout()
+        self.schedule_label = QtWidgets.QLabel()
+        self.schedule_combo = QtWidgets.QComboBox()
+        schedule_layout.addWidget(self.schedule_label)
+        schedule_layout.addWidget(self.schedule_combo)
+        schedule_layout.addStretch(1)
+        self.keep_folder_order_box = QtWidgets.QCheckBox()
+
         printer_layout.addLayout(copies_layout)
         printer_layout.addLayout(duplex_layout)
         printer_layout.addLayout(paper_layout)
         printer_layout.addLayout(excel_layout)
+        printer_layout.addLayout(schedule_layout)
+        printer_layout.addWidget(self.keep_folder_order_box)
 
         self.rules_group = QtWidgets.QGroupBox()
         rules_layout = QtWidgets.QVBoxLayout(self.rules_group)
@@ -140,6 +152,8 @@ class SettingsPanel(QtWidgets.QWidget):
         self.duplex_combo.currentIndexChanged.connect(self._on_duplex_changed)
         self.paper_combo.currentIndexChanged.connect(self._on_paper_changed)
         self.excel_orientation_combo.currentIndexChanged.connect(self._on_excel_orientation_changed)
+        self.schedule_combo.currentIndexChanged.connect(self._on_schedule_changed)
+        self.keep_folder_order_box.toggled.connect(self.keep_folder_order_changed)
         self.theme_combo.currentIndexChanged.connect(self._on_theme_changed)
         self.language_combo.currentIndexChanged.connect(self.on_language_changed)
         self.update_check_box.toggled.connect(self.update_check_changed)
@@ -166,6 +180,8 @@ class SettingsPanel(QtWidgets.QWidget):
         self.duplex_label.setText(t("settings_duplex"))
         self.paper_label.setText(t("settings_paper_size"))
         self.excel_label.setText(t("settings_excel_orientation"))
+        self.schedule_label.setText(t("settings_schedule"))
+        self.keep_folder_order_box.setText(t("settings_keep_folder_order"))
         self.theme_label.setText(t("settings_theme"))
         self.language_label.setText(t("settings_language"))
         self.update_check_box.setText(t("settings_update_check"))
@@ -173,6 +189,7 @@ class SettingsPanel(QtWidgets.QWidget):
 
         self._refresh_duplex_items()
         self._refresh_excel_orientation_items()
+        self._refresh_schedule_items()
         self._refresh_theme_items()
         self._refresh_language_items()
 
@@ -204,6 +221,26 @@ class SettingsPanel(QtWidgets.QWidget):
             if index >= 0:
                 self.excel_orientation_combo.setCurrentIndex(index)
 
+    def _refresh_schedule_items(self) -> None:
+        current = self.schedule_combo.currentData()
+        with QtCore.QSignalBlocker(self.schedule_combo):
+            self.schedule_combo.clear()
+            self.schedule_combo.addItem(t("schedule_fifo"), "fifo")
+            self.schedule_combo.addItem(t("schedule_priority"), "priority")
+            self.schedule_combo.addItem(t("schedule_sjf"), "sjf")
+            self.schedule_combo.addItem(t("schedule_grouped"), "grouped")
+            if current:
+                index = self.schedule_combo.findData(current)
+                if index >= 0:
+                    self.schedule_combo.setCurrentIndex(index)
+
+    def set_schedule(self, policy: str, keep_folder_order: bool) -> None:
+        with QtCore.QSignalBlocker(self.schedule_combo), QtCore.QSignalBlocker(self.keep_folder_order_box):
+            index = self.schedule_combo.findData(policy)
+            if index >= 0:
+                self.schedule_combo.setCurrentIndex(index)
+            self.keep_folder_order_box.setChecked(keep_folder_order)
+
     def _refresh_theme_items(self) -> None:
         current = self.theme_combo.currentData()
         with QtCore.QSignalBlocker(self.theme_combo):
@@ -353,6 +390,10 @@ class SettingsPanel(QtWidgets.QWidget):
         mode = str(self.excel_orientation_combo.currentData() or "auto")
         self.excel_orientation_mode_changed.emit(mode)
 
+    def _on_schedule_changed(self) -> None:
+        policy = str(self.schedule_combo.currentData() or "fifo")
+        self.schedule_policy_changed.emit(policy)
+
     def _on_rule_double_clicked(self, index: QtCore.QModelIndex) -> None:
         if index.column() != 1:
             return
@@ -0,0 +1,129 @@
+"""Micro-benchmark for the compiled routing rules.
+
+Usage: python scripts/bench_rules.py [--paths 100000] [--rules 60]
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.controller.rule_compiler import RoutingRule, compile_rules  # noqa: E402
+
+EXTENSIONS = [".pdf", ".docx", ".xlsx", ".pptx", ".doc", ".xls"]
+
+
+def build_rules(count: int, rng: random.Random, with_names: bool = True) -> list[dict]:
+    rules = []
+    for index in range(count):
+        kind = index % 4
+        if not with_names and kind in (1, 2):
+            kind = 0 if kind == 1 else 3
+        if kind == 0:
+            rules.append({"path_prefix": f"C:\\Share\\Dept{index}", "printer": f"P{index}"})
+        elif kind == 1:
+            rules.append({"pattern": f"*_{index}_*", "copies": 2})
+        elif kind == 2:
+            rules.append({"regex": rf"^INV-{index}\d+", "printer": f"Invoice{index}", "duplex": "long_edge"})
+        else:
+            rules.append({"extensions": [rng.choice(EXTENSIONS)], "path_prefix": f"D:\\Proj{index}", "quality": "draft"})
+    return rules
+
+
+def build_paths(count: int, rule_count: int, rng: random.Random) -> list[str]:
+    directories = [f"C:\\Share\\Dept{rng.randrange(rule_count)}\\{year}" for year in range(2018, 2026)]
+    directories += [f"D:\\Proj{rng.randrange(rule_count)}\\docs" for _ in range(40)]
+    directories += [f"E:\\Scans\\{index}" for index in range(200)]
+    paths = []
+    for index in range(count):
+        name_kind = index % 3
+        if name_kind == 0:
+            name = f"INV-{rng.randrange(rule_count)}{index}"
+        elif name_kind == 1:
+            name = f"report_{rng.randrange(rule_count)}_{index}"
+        else:
+            name = f"file{index}"
+        paths.append(f"{rng.choice(directories)}\\{name}{rng.choice(EXTENSIONS)}")
+    return paths
+
+
+def naive_resolve(rules: list[RoutingRule], path: str) -> tuple:
+    directory, _, name = path.rpartition("\\")
+    ext = Path(name).suffix.lower()
+    result = {}
+    for rule in rules:
+        if rule.extensions and ext not in rule.extensions:
+            continue
+        if rule.path_prefix:
+            prefix = rule.path_prefix.casefold().rstrip("\\")
+            folded = directory.casefold()
+            if folded != prefix and not folded.startswith(prefix + "\\"):
+                continue
+        if rule.pattern and not fnmatch.fnmatch(name.lower(), rule.pattern.lower()):
+            continue
+        if rule.regex and not re.search(rule.regex, name, re.IGNORECASE):
+            continue
+        for field_name in ("printer", "copies", "duplex", "paper_size", "quality"):
+            value = getattr(rule, field_name)
+            if field_name not in result and value not in (None, ""):
+                result[field_name] = value
+    return tuple(result.get(name) for name in ("printer", "copies", "duplex", "paper_size", "quality"))
+
+
+def run(label: str, rule_dicts: list[dict], paths: list[str]) -> int:
+    started = time.perf_counter()
+    compiled = compile_rules(rule_dicts, {".pdf": {"printer": "PdfPrinter"}}, version=1)
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    cold = [compiled.resolve(path) for path in paths]
+    cold_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for path in paths:
+        compiled.resolve(path)
+    warm_ms = (time.perf_counter() - started) * 1000
+
+    sample = paths[: min(len(paths), 10_000)]
+    started = time.perf_counter()
+    naive = [naive_resolve(compiled.rules, path) for path in sample]
+    naive_ms = (time.perf_counter() - started) * 1000 * len(paths) / len(sample)
+
+    mismatches = sum(
+        1
+        for result, expected in zip(cold, naive)
+        if (result.printer or None, result.copies, result.duplex, result.paper_size, result.quality) != expected
+    )
+
+    print(f"[{label}] rules={len(compiled.rules)} paths={len(paths)}")
+    print(f"compile:        {compile_ms:8.2f} ms")
+    print(f"resolve (cold): {cold_ms:8.2f} ms")
+    print(f"resolve (warm): {warm_ms:8.2f} ms")
+    print(f"linear scan:    {naive_ms:8.2f} ms (extrapolated from {len(sample)} paths)")
+    print(f"mismatches:     {mismatches}")
+    print()
+    return mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paths", type=int, default=100_000)
+    parser.add_argument("--rules", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    paths = build_paths(args.paths, args.rules, rng)
+    mismatches = run("folder/extension", build_rules(args.rules, random.Random(args.seed), with_names=False), paths)
+    mismatches += run("with name patterns", build_rules(args.rules, random.Random(args.seed)), paths)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
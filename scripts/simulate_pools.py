@@ -0,0 +1,92 @@
+"""Simulates printer pool dispatch against fake printers and reports the makespan.
+
+Usage: python scripts/simulate_pools.py [--jobs 300] [--seed 1]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.controller.printer_pool import PoolDispatcher  # noqa: E402
+
+SPOOL_SECONDS_PER_JOB = 0.8
+SPOOL_SECONDS_PER_PAGE = 0.02
+
+
+@dataclass
+class FakePrinter:
+    name: str
+    pages_per_minute: float
+    free_at: float = 0.0
+    # (submitted_at, completes_at, pages, sequence)
+    jobs: list[tuple[float, float, int, int]] = field(default_factory=list)
+
+    def submit(self, now: float, pages: int, sequence: int) -> float:
+        start = max(self.free_at, now)
+        self.free_at = start + pages * 60.0 / self.pages_per_minute
+        self.jobs.append((now, self.free_at, pages, sequence))
+        return self.free_at
+
+    def queue_depth(self, now: float) -> int:
+        return sum(1 for _, completes_at, _, _ in self.jobs if completes_at > now)
+
+
+def simulate(strategy: str, printers: list[FakePrinter], pages: list[int]) -> tuple[float, dict[str, int]]:
+    by_name = {printer.name: printer for printer in printers}
+    clock = [0.0]
+    dispatcher = PoolDispatcher(
+        {"pool": [printer.name for printer in printers]},
+        queue_depth=lambda name: by_name[name].queue_depth(clock[0]),
+        clock=lambda: clock[0],
+    )
+    reported: set[tuple[str, int]] = set()
+    makespan = 0.0
+    for sequence, job_pages in enumerate(pages):
+        clock[0] += SPOOL_SECONDS_PER_JOB + SPOOL_SECONDS_PER_PAGE * job_pages
+        # Feed finished jobs back as throughput measurements, as spooler tracking would.
+        for printer in printers:
+            for submitted_at, completes_at, done_pages, done_sequence in printer.jobs:
+                if completes_at <= clock[0] and (printer.name, done_sequence) not in reported:
+                    reported.add((printer.name, done_sequence))
+                    busy = done_pages * 60.0 / printer.pages_per_minute
+                    dispatcher.record_throughput(printer.name, done_pages, busy)
+        if strategy == "single":
+            target = printers[0]
+        elif strategy == "round-robin":
+            target = printers[sequence % len(printers)]
+        else:
+            target = by_name[dispatcher.dispatch("pool", job_pages)]
+        makespan = max(makespan, target.submit(clock[0], job_pages, sequence))
+    for printer in printers:
+        sequences = [sequence for _, _, _, sequence in sorted(printer.jobs, key=lambda item: item[1])]
+        assert sequences == sorted(sequences), f"{printer.name} printed out of order"
+    return makespan, {printer.name: sum(job[2] for job in printer.jobs) for printer in printers}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pages = [max(1, int(rng.lognormvariate(1.6, 0.9))) for _ in range(args.jobs)]
+    fleet = [("MFP-A", 45.0), ("MFP-B", 45.0), ("MFP-C", 25.0)]
+    print(f"jobs={len(pages)} pages={sum(pages)} printers={', '.join(f'{n} ({p:.0f} ppm)' for n, p in fleet)}")
+    baseline = None
+    for strategy in ("single", "round-robin", "lowest-backlog"):
+        printers = [FakePrinter(name, ppm) for name, ppm in fleet]
+        makespan, distribution = simulate(strategy, printers, pages)
+        baseline = baseline or makespan
+        shares = " ".join(f"{name}={count}" for name, count in distribution.items())
+        print(f"{strategy:>15}: makespan {makespan / 60:6.1f} min ({baseline / makespan:4.2f}x)  pages {shares}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())